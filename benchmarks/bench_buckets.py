@@ -0,0 +1,42 @@
+"""Length-bucketed batches with a token budget (max_tokens) for stanza
+    and flair on a corpus with mixed sentence lengths
+
+Requires the LPC test data (see nlptasks.testdata), stanza and flair.
+
+Usage:
+------
+    python -m benchmarks.bench_buckets
+"""
+import time
+import numpy as np
+import nlptasks as nt
+import nlptasks.pos
+from nlptasks.testdata import load_lpc_deu_news_2015_100K_sents
+
+
+def mixed_lengths(sequences, n: int, seed: int = 42):
+    """Mix very short sentences (3 tokens) and long ones (up to 150)"""
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(n):
+        seq = sequences[i]
+        if rng.random() < 0.5:
+            out.append(seq[:3])
+        else:
+            out.append((seq * 10)[:int(rng.integers(50, 150))])
+    return out
+
+
+if __name__ == '__main__':
+    sequences = [s.split() for s in load_lpc_deu_news_2015_100K_sents()]
+    data = mixed_lengths(sequences, 2000)
+    print(f"{len(data)} sentences, {sum(len(s) for s in data)} tokens [s]")
+
+    for name in ("stanza-de", "flair-de"):
+        model = nt.pos.get_model(name)
+        fn = nt.pos.factory(name)
+        for max_tokens in (None, 2048, 8192):
+            t = time.perf_counter()
+            fn(data, model=model, max_tokens=max_tokens)
+            t = time.perf_counter() - t
+            print(f"  {name}, max_tokens={max_tokens}: {t:.2f}")
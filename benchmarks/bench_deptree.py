@@ -0,0 +1,58 @@
+"""Hash engines of the deptree shingles (CPU time and memory)
+
+Requires treesimi. The shingles are generated from random trees, i.e. no
+  dependency parser is needed.
+
+Usage:
+------
+    python -m benchmarks.bench_deptree
+"""
+import sys
+import time
+import tracemalloc
+import numpy as np
+import treesimi as ts
+import nlptasks as nt
+import nlptasks.deptree
+
+
+RELATIONS = ['nk', 'sb', 'oa', 'da', 'mo', 'cj', 'cd', 'punct', 'ag', 'op']
+
+
+def random_trees(n: int, seqlen: int = 20, seed: int = 42):
+    """Adjacency lists (node ID, parent ID, relation) of random trees"""
+    rng = np.random.default_rng(seed)
+    trees = []
+    for _ in range(n):
+        tree = [(1, 0, 'root')]
+        for i in range(2, seqlen + 1):
+            tree.append((i, int(rng.integers(1, i)),
+                         RELATIONS[rng.integers(len(RELATIONS))]))
+        trees.append(tree)
+    return trees
+
+
+def vocab_nbytes(VOCAB) -> int:
+    """The VOCAB list, its digests and its token-to-ID dict"""
+    digests = sum(sys.getsizeof(d) for d in VOCAB)
+    return sys.getsizeof(VOCAB) + digests + sys.getsizeof(VOCAB._token2id)
+
+
+if __name__ == '__main__':
+    nested = [ts.remove_node_ids(ts.adjac_to_nested_with_attr(tree))
+              for tree in random_trees(5000)]
+    shingled = [ts.shingleset(tree) for tree in nested]
+    n = sum(len(s) for s in shingled)
+
+    print(f"{n} shingles: hashing+encoding [s], VOCAB [MB], "
+          "peak memory of hashing+encoding [MB]")
+    for engine in nt.deptree.HASH_ENGINES:
+        tracemalloc.start()
+        t = time.perf_counter()
+        hashed = nt.deptree.hash_shingles(shingled, hash_engine=engine)
+        _, VOCAB = nt.deptree._encode(hashed)
+        t = time.perf_counter() - t
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {engine}: {t:.2f} {vocab_nbytes(VOCAB) / 2**20:.1f} "
+              f"{peak / 2**20:.1f}")
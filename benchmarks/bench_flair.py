@@ -0,0 +1,32 @@
+"""Throughput of the flair functions with and without mini-batches
+
+Usage:
+------
+    python -m benchmarks.bench_flair
+"""
+import time
+import numpy as np
+import nlptasks as nt
+import nlptasks.pos
+
+
+def throughput(sequences, model, mini_batch_size: int) -> float:
+    """Sentences per second of nt.pos.flair_de"""
+    t = time.perf_counter()
+    nt.pos.flair_de(sequences, model=model, mini_batch_size=mini_batch_size)
+    return len(sequences) / (time.perf_counter() - t)
+
+
+if __name__ == '__main__':
+    # LPC-like sentence lengths, i.e. 3 to 60 tokens
+    rng = np.random.default_rng(42)
+    words = ["Die", "Kuh", "ist", "bunt", "und", "die", "Bäuerin",
+             "mäht", "Wiese", "."]
+    lengths = rng.integers(3, 60, size=2000)
+    sequences = [rng.choice(words, size=n).tolist() for n in lengths]
+
+    model = nt.pos.get_model("flair-de")
+    print(f"PoS-tagging {len(sequences)} sentences [sents/s]")
+    for mini_batch_size in (1, 32, 128):
+        sps = throughput(sequences, model, mini_batch_size)
+        print(f"  mini_batch_size={mini_batch_size}: {sps:.1f}")
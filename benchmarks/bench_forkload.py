@@ -0,0 +1,33 @@
+"""Memory of parallel workers: load per worker vs. fork after load
+
+Sums the peak PSS of all workers (see nlptasks.parallel.memory_usage).
+  Requires Linux, the LPC test data (see nlptasks.testdata) and spaCy.
+
+Usage:
+------
+    python -m benchmarks.bench_forkload
+"""
+import time
+import nlptasks as nt
+import nlptasks.parallel
+from nlptasks.testdata import load_lpc_deu_news_2015_100K_sents
+
+
+if __name__ == '__main__':
+    sequences = [s.split() for s in load_lpc_deu_news_2015_100K_sents()]
+    sequences = sequences[:8000]
+    n_jobs = 4
+
+    print(f"pos spacy-de, {len(sequences)} sentences, {n_jobs} workers")
+    for fork_after_load in (False, True):
+        report = {}
+        t = time.perf_counter()
+        nt.parallel.run(sequences, 'pos', 'spacy-de', n_jobs=n_jobs,
+                        chunksize=500, fork_after_load=fork_after_load,
+                        memory_report=report)
+        t = time.perf_counter() - t
+        pss = sum(u['pss'] for u in report['workers'].values())
+        shared = max(u['shared'] for u in report['workers'].values())
+        print(f"  fork_after_load={fork_after_load}: {t:.1f}s, "
+              f"workers' PSS {pss / 2**20:.0f} MB, "
+              f"shared per worker {shared / 2**20:.0f} MB")
@@ -0,0 +1,36 @@
+"""Import time of each nlptasks module measured with `python -X importtime`
+
+Usage:
+------
+    python -m benchmarks.bench_importtime
+"""
+import subprocess
+import sys
+
+
+MODULES = ["sbd", "token", "lemma", "pos", "pos2", "ner", "ner2",
+           "dephead", "depchild", "deptree", "meta", "padding", "vocab"]
+
+
+def importtime(module: str) -> (int, list):
+    """Cumulative import time [us] of a module and the slowest imports"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True, stderr=subprocess.PIPE, universal_newlines=True)
+    rows = []
+    for line in proc.stderr.split("\n"):
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selftime, cumulative, name = line[12:].split("|")
+        rows.append((int(selftime), int(cumulative), name.strip()))
+    total = [c for _, c, name in rows if name == module][0]
+    slowest = sorted(rows, reverse=True)[:3]
+    return total, slowest
+
+
+if __name__ == '__main__':
+    print(f"{'module':<20} {'cumulative [ms]':>16}  slowest imports")
+    for module in MODULES:
+        total, slowest = importtime(f"nlptasks.{module}")
+        names = ", ".join(f"{name} ({t / 1000:.1f})" for t, _, name in slowest)
+        print(f"nlptasks.{module:<11} {total / 1000:>16.1f}  {names}")
@@ -0,0 +1,57 @@
+"""Speed-up of the LRU memoization (memo_size) for duplicate sentences
+
+Requires the LPC test data (see nlptasks.testdata), SoMaJo and SoMeWeTa.
+
+Usage:
+------
+    python -m benchmarks.bench_memo
+"""
+import time
+import numpy as np
+import nlptasks as nt
+import nlptasks.pos
+import nlptasks.sbd
+from nlptasks.testdata import load_lpc_deu_news_2015_100K_sents
+
+
+def duplicated(sentences, ratio: float, n: int, seed: int = 42):
+    """Sample n sentences whereas `ratio` of them are duplicates"""
+    rng = np.random.default_rng(seed)
+    n_unique = max(1, int(n * (1.0 - ratio)))
+    unique = sentences[:n_unique]
+    idx = np.concatenate([np.arange(n_unique),
+                          rng.integers(0, n_unique, size=n - n_unique)])
+    rng.shuffle(idx)
+    return [unique[i] for i in idx]
+
+
+def best_time(fn, data, repeat: int = 3, **kwargs) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(data, **kwargs)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+if __name__ == '__main__':
+    sentences = load_lpc_deu_news_2015_100K_sents()
+    sbd_model = nt.sbd.get_model("somajo-de")
+    pos_model = nt.pos.get_model("someweta-web-de")
+    n = 5000
+
+    print(f"{n} sentences [s]: memo_size=0 vs. memo_size={n}")
+    for k, ratio in enumerate((0.0, 0.5, 0.9)):
+        # other sentences for each ratio, i.e. no hits of previous runs
+        docs = duplicated(sentences[k * n:], ratio, n)
+        t0 = best_time(nt.sbd.somajo_de, docs, model=sbd_model)
+        t1 = best_time(nt.sbd.somajo_de, docs, repeat=1,
+                       model=sbd_model, memo_size=n)
+        print(f"  sbd.somajo_de, {ratio:.0%} duplicates: {t0:.2f} {t1:.2f}")
+
+        seqs = [s.split() for s in docs]
+        t0 = best_time(nt.pos.someweta_web_de, seqs, model=pos_model)
+        t1 = best_time(nt.pos.someweta_web_de, seqs, repeat=1,
+                       model=pos_model, memo_size=n)
+        print(f"  pos.someweta_web_de, {ratio:.0%} duplicates: "
+              f"{t0:.2f} {t1:.2f}")
@@ -0,0 +1,54 @@
+"""Compare nlptasks.padding.pad_sequences with the keras implementation
+
+Usage:
+------
+    python -m benchmarks.bench_padding
+"""
+import subprocess
+import sys
+import time
+import numpy as np
+
+
+def startup_time(stmt: str, repeat: int = 3) -> float:
+    """Best wall time of a fresh python process that runs `stmt`"""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, "-c", stmt], check=True)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def throughput(fn, sequences, repeat: int = 5) -> float:
+    """Best time to pad all sequences"""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(sequences, maxlen=64, value=0, padding='pre', truncating='pre')
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+if __name__ == '__main__':
+    # LPC-like sentence lengths, i.e. 3 to 150 tokens
+    rng = np.random.default_rng(42)
+    lengths = rng.integers(3, 150, size=100000)
+    sequences = [rng.integers(0, 55, size=n).tolist() for n in lengths]
+
+    print("startup time [s]")
+    print(f"  nlptasks.padding: {startup_time('import nlptasks.padding'):.3f}")
+    try:
+        import tensorflow.keras as keras
+        tf_time = startup_time('import tensorflow.keras')
+        print(f"  tensorflow.keras: {tf_time:.3f}")
+    except ImportError:
+        keras = None
+        print("  tensorflow.keras: not installed")
+
+    from nlptasks.padding import pad_sequences
+    print(f"padding {len(sequences)} sequences [s]")
+    print(f"  nlptasks.padding: {throughput(pad_sequences, sequences):.3f}")
+    if keras is not None:
+        fn = keras.preprocessing.sequence.pad_sequences
+        print(f"  tensorflow.keras: {throughput(fn, sequences):.3f}")
@@ -0,0 +1,64 @@
+"""Row lookup of UPOS tags and UD features in pos2 (list.index vs. dict)
+
+Converts synthetic stanza-like annotations, i.e. no NLP backend required.
+
+Usage:
+------
+    python -m benchmarks.bench_scheme
+"""
+from types import SimpleNamespace
+import time
+import numpy as np
+import nlptasks as nt
+import nlptasks.pos2
+
+
+def synthetic(n: int, seqlen: int = 20, n_feats: int = 5, seed: int = 42):
+    """Sentences with random UPOS tags and `n_feats` features per word"""
+    rng = np.random.default_rng(seed)
+    upos = nt.pos2.UPOS_TAGSET
+    feats = nt.pos2.UD2_FEATS
+    sentences = []
+    for _ in range(n):
+        words = [SimpleNamespace(
+            upos=upos[rng.integers(len(upos))],
+            feats="|".join(feats[j] for j in sorted(
+                rng.choice(len(feats), n_feats, replace=False))))
+            for _ in range(seqlen)]
+        sentences.append(SimpleNamespace(words=words))
+    return sentences
+
+
+def from_stanza_listindex(sentences):
+    """The previous implementation with `list.index` per feature"""
+    SCHEME = nt.pos2.UPOS_TAGSET + nt.pos2.UD2_FEATS
+    maskseqs = []
+    for sent in sentences:
+        pairs = []
+        for colidx, t in enumerate(sent.words):
+            pairs.append((SCHEME.index(t.upos), colidx))
+            if t.feats:
+                for tag in t.feats.split("|"):
+                    pairs.append((SCHEME.index(tag), colidx))
+        maskseqs.append(pairs)
+    return maskseqs
+
+
+def best_time(fn, data, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+if __name__ == '__main__':
+    sentences = synthetic(2000)
+    assert nt.pos2._from_stanza(sentences)[0] == \
+        from_stanza_listindex(sentences)
+
+    t0 = best_time(from_stanza_listindex, sentences)
+    t1 = best_time(nt.pos2._from_stanza, sentences)
+    print(f"{len(sentences)} sentences [s]: list.index vs. SCHEME_INDEX")
+    print(f"  pos2._from_stanza: {t0:.3f} {t1:.3f} ({t0 / t1:.1f}x)")
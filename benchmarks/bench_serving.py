@@ -0,0 +1,55 @@
+"""Latency and throughput of the asyncio Annotator (micro-batching)
+
+A local load generator runs `n_clients` concurrent clients that submit
+  one sentence after another. Requires the LPC test data (see
+  nlptasks.testdata) and flair.
+
+Usage:
+------
+    python -m benchmarks.bench_serving
+"""
+import asyncio
+import time
+import numpy as np
+import nlptasks as nt
+import nlptasks.pos
+import nlptasks.serving
+from nlptasks.testdata import load_lpc_deu_news_2015_100K_sents
+
+
+async def client(annotator, sentences, latencies):
+    for tokens in sentences:
+        t = time.perf_counter()
+        await annotator.submit(tokens)
+        latencies.append(time.perf_counter() - t)
+
+
+async def load(model, sentences, n_clients: int, **kwargs):
+    latencies = []
+    annotator = nt.serving.Annotator('pos', 'flair-de', model=model, **kwargs)
+    async with annotator:
+        t = time.perf_counter()
+        await asyncio.gather(*[
+            client(annotator, sentences[k::n_clients], latencies)
+            for k in range(n_clients)])
+        t = time.perf_counter() - t
+    return t, np.array(latencies), annotator.n_requests / annotator.n_batches
+
+
+if __name__ == '__main__':
+    sentences = [s.split() for s in load_lpc_deu_news_2015_100K_sents()]
+    sentences = sentences[:2000]
+    model = nt.pos.get_model('flair-de')
+    loop = asyncio.new_event_loop()
+
+    print(f"pos flair-de, {len(sentences)} requests")
+    for n_clients in (1, 16, 64):
+        for max_batch_size in (1, 32):
+            t, lat, avg = loop.run_until_complete(load(
+                model, sentences, n_clients, max_batch_size=max_batch_size,
+                max_wait=0.005))
+            print(f"  clients={n_clients}, max_batch_size={max_batch_size}: "
+                  f"{len(sentences) / t:.0f} req/s, "
+                  f"p50 {np.percentile(lat, 50) * 1000:.0f} ms, "
+                  f"p95 {np.percentile(lat, 95) * 1000:.0f} ms, "
+                  f"avg. batch {avg:.1f}")
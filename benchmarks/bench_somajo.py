@@ -0,0 +1,43 @@
+"""Time and memory allocations of the SoMaJo sentence reconstruction
+    (joining tokens) versus slicing with SoMaJo's character offsets
+
+Requires the LPC test data (see nlptasks.testdata) and SoMaJo.
+
+Usage:
+------
+    python -m benchmarks.bench_somajo
+"""
+import time
+import tracemalloc
+import nlptasks as nt
+import nlptasks.models
+import nlptasks.sbd
+from nlptasks.testdata import load_lpc_deu_news_2015_100K_sents
+
+
+def measure(docs, model, slicing: bool) -> (float, float):
+    """Wall time [s] and peak of allocated memory [MB]"""
+    tracemalloc.start()
+    t = time.perf_counter()
+    nt.sbd.somajo_de(docs, model=model, slicing=slicing)
+    elapsed = time.perf_counter() - t
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+if __name__ == '__main__':
+    # documents with 20 sentences each
+    sentences = load_lpc_deu_news_2015_100K_sents()[:20000]
+    docs = [" ".join(sentences[i:i + 20])
+            for i in range(0, len(sentences), 20)]
+    # the same tokenizer settings for both modes
+    model = nt.models.load(
+        "somajo", language="de_CMC", split_camel_case=True,
+        character_offsets=True)
+
+    print(f"SBD of {len(docs)} documents: time [s], peak memory [MB]")
+    for slicing in (False, True):
+        elapsed, peak = measure(docs, model, slicing)
+        mode = "slicing" if slicing else "joining tokens"
+        print(f"  {mode}: {elapsed:.2f}, {peak:.1f}")
@@ -0,0 +1,29 @@
+"""Scaling of SoMeWeTa PoS tagging with forked worker processes (n_jobs)
+
+Requires the LPC test data (see nlptasks.testdata) and SoMeWeTa.
+
+Usage:
+------
+    python -m benchmarks.bench_someweta
+"""
+import time
+import nlptasks as nt
+import nlptasks.pos
+from nlptasks.testdata import load_lpc_deu_news_2015_100K_sents
+
+
+if __name__ == '__main__':
+    sequences = [s.split() for s in load_lpc_deu_news_2015_100K_sents()]
+    sequences = sequences[:20000]
+
+    for name in ("someweta-de", "someweta-web-de"):
+        model = nt.pos.get_model(name)
+        fn = nt.pos.factory(name)
+        print(f"{name}, {len(sequences)} sentences [s]:")
+        t1 = None
+        for n_jobs in (1, 2, 4, 8):
+            t = time.perf_counter()
+            fn(sequences, model=model, n_jobs=n_jobs)
+            t = time.perf_counter() - t
+            t1 = t1 or t
+            print(f"  n_jobs={n_jobs}: {t:.2f} (speed-up {t1 / t:.1f}x)")
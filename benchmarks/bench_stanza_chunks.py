@@ -0,0 +1,36 @@
+"""Peak memory of stanza PoS tagging with and without max_tokens_per_call
+
+Each setting runs in a fresh process, and reports its peak RSS. Requires
+  the LPC test data (see nlptasks.testdata), stanza, and Linux/macOS.
+
+Usage:
+------
+    python -m benchmarks.bench_stanza_chunks
+"""
+import multiprocessing as mp
+import resource
+import time
+import nlptasks as nt
+import nlptasks.pos
+from nlptasks.testdata import load_lpc_deu_news_2015_100K_sents
+
+
+def run(n: int, max_tokens_per_call):
+    sequences = [s.split() for s in load_lpc_deu_news_2015_100K_sents()]
+    model = nt.pos.get_model("stanza-de")
+    t = time.perf_counter()
+    nt.pos.stanza_de(sequences[:n], model=model,
+                     max_tokens_per_call=max_tokens_per_call)
+    t = time.perf_counter() - t
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+    print(f"  n={n}, max_tokens_per_call={max_tokens_per_call}: "
+          f"{t:.1f}s, peak RSS {peak:.0f} MB")
+
+
+if __name__ == '__main__':
+    ctx = mp.get_context("spawn")
+    for n in (5000, 20000):
+        for max_tokens_per_call in (None, 20000):
+            p = ctx.Process(target=run, args=(n, max_tokens_per_call))
+            p.start()
+            p.join()
@@ -0,0 +1,559 @@
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+from .vocab import Vocab, VocabBuilder
+import contextlib
+import copy
+import functools
+import gc
+import itertools
+import multiprocessing as mp
+import numpy as np
+import os
+import threading
+
+
+class PretokenizedTokenizer(object):
+    """spaCy tokenizer that turns a list of tokens into a Doc object"""
+    def __init__(self, vocab):
+        self.vocab = vocab
+
+    def __call__(self, words: List[str]):
+        import spacy
+        return spacy.tokens.doc.Doc(self.vocab, words=words)
+
+    def pipe(self, texts, batch_size: int = 1000):
+        for words in texts:
+            yield self(words)
+
+
+def spacy_pipe(model,
+               data: Union[List[str], List[List[str]]],
+               pipes: List[str],
+               batch_size: int = 1000,
+               n_process: int = 1,
+               pretokenized: bool = True) -> list:
+    """Run some pipes of a spaCy model over many documents in batches
+
+    Parameters:
+    -----------
+    model
+        spaCy Language object
+
+    data : Union[List[str], List[List[str]]]
+        List of token sequences (pretokenized=True), or list of strings.
+
+    pipes : List[str]
+        The pipes to run, e.g. ['tagger'], ['parser']. All other pipes
+          are disabled. If `pipes=[]` only the tokenizer is used.
+
+    batch_size : int = 1000
+        Number of documents per batch
+
+    n_process : int = 1
+        Number of worker processes (see spacy.language.Language.pipe).
+          For `n_process=1` the pipes are chained in this process.
+
+    pretokenized : bool = True
+        Flag if `data` contains token sequences.
+
+    Returns:
+    --------
+    list
+        List of spaCy Doc objects
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.batching
+        model = nt.pos.get_model('spacy-de')
+        docs = nt.batching.spacy_pipe(
+            model, sequences, ['tagger'], batch_size=256, n_process=2)
+    """
+    # (1) chain the pipes' batch methods in this process
+    if n_process == 1:
+        if pretokenized:
+            docs = PretokenizedTokenizer(model.vocab).pipe(data)
+        else:
+            docs = model.tokenizer.pipe(data, batch_size=batch_size)
+        for name in model.pipe_names:
+            if name in pipes:
+                docs = model.get_pipe(name).pipe(docs, batch_size=batch_size)
+        return list(docs)
+
+    # (2) let spaCy distribute the batches to worker processes
+    disable = [name for name in model.pipe_names if name not in pipes]
+    if not pretokenized:
+        return list(model.pipe(
+            data, batch_size=batch_size, n_process=n_process,
+            disable=disable))
+    # spaCy's workers tokenize with `make_doc`, i.e. swap the tokenizer of
+    # a shallow copy. The model itself is shared, e.g. with other threads.
+    piped = copy.copy(model)
+    piped.tokenizer = PretokenizedTokenizer(model.vocab)
+    return list(piped.pipe(
+        data, batch_size=batch_size, n_process=n_process, disable=disable))
+
+
+def length_batches(lengths: List[int],
+                   max_tokens: int,
+                   max_batch_size: Optional[int] = None) -> List[List[int]]:
+    """Group examples into length-sorted batches with a token budget
+
+    Parameters:
+    -----------
+    lengths : List[int]
+        Number of tokens of each example
+
+    max_tokens : int
+        Token budget of a padded batch, i.e. its longest example times its
+          number of examples. An example longer than `max_tokens` is a
+          batch of its own.
+
+    max_batch_size : Optional[int] = None
+        Maximum number of examples per batch
+
+    Returns:
+    --------
+    List[List[int]]
+        The indices of the examples of each batch. Longest examples first,
+          i.e. the memory peak is in the first batch.
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.batching
+        nt.batching.length_batches([3, 150, 4, 3], max_tokens=12)
+        # [[1], [2, 0, 3]]
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches = []
+    batch = []
+    for i in order:
+        # batch[0] is the longest example of the batch
+        full = max_batch_size is not None and len(batch) >= max_batch_size
+        padded = lengths[batch[0]] * (len(batch) + 1) if batch else 0
+        if batch and (full or padded > max_tokens):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def bucketed(fn: Callable,
+             data: list,
+             max_tokens: int,
+             max_batch_size: Optional[int] = None) -> list:
+    """Call a batch function on length-bucketed batches of `data`
+
+    Parameters:
+    -----------
+    fn : Callable
+        Function that processes a list of token sequences and returns one
+          result per sequence, e.g. a neural tagger
+
+    data : list
+        Token sequences
+
+    max_tokens : int
+        see nlptasks.batching.length_batches
+
+    max_batch_size : Optional[int] = None
+        see nlptasks.batching.length_batches
+
+    Returns:
+    --------
+    list
+        The results of `fn` in the order of `data`
+    """
+    results = [None] * len(data)
+    for batch in length_batches(
+            [len(example) for example in data], max_tokens, max_batch_size):
+        for i, out in zip(batch, fn([data[i] for i in batch])):
+            results[i] = out
+    return results
+
+
+def token_chunks(data: Iterable[List[str]],
+                 max_tokens: int) -> Iterator[List[List[str]]]:
+    """Split token sequences, in order, into chunks of up to `max_tokens`
+        tokens (a longer sequence is a chunk of its own)"""
+    chunk = []
+    n_tokens = 0
+    for sequence in data:
+        if chunk and n_tokens + len(sequence) > max_tokens:
+            yield chunk
+            chunk = []
+            n_tokens = 0
+        chunk.append(sequence)
+        n_tokens += len(sequence)
+    if chunk:
+        yield chunk
+
+
+def concat_outputs(outputs: list):
+    """Merge the outputs of a task function over consecutive chunks
+
+    Lists and numpy arrays are concatenated, and scipy.sparse matrices are
+      stacked. Other parts (e.g. TAGSET, number of classes) are the same
+      for all chunks, i.e. the part of the first chunk is returned.
+    """
+    if not isinstance(outputs[0], tuple):
+        return list(itertools.chain.from_iterable(outputs))
+    merged = []
+    for parts in zip(*outputs):
+        if isinstance(parts[0], Vocab):
+            merged.append(parts[0])  # e.g. TAGSET
+        elif isinstance(parts[0], list):
+            merged.append(list(itertools.chain.from_iterable(parts)))
+        elif isinstance(parts[0], np.ndarray):
+            merged.append(np.concatenate(parts))
+        elif hasattr(parts[0], 'tocsr'):  # e.g. deptree masks
+            import scipy.sparse
+            merged.append(scipy.sparse.vstack(parts, format='csr'))
+        else:
+            merged.append(parts[0])  # e.g. TAGSET
+    return tuple(merged)
+
+
+def stanza_predict(model,
+                   data: List[List[str]],
+                   max_tokens: Optional[int] = None,
+                   max_tokens_per_call: Optional[int] = None,
+                   convert: Optional[Callable] = None):
+    """Annotate token sequences with a (pretokenized) stanza Pipeline
+
+    Parameters:
+    -----------
+    model
+        stanza Pipeline with `tokenize_pretokenized=True`
+
+    data : List[List[str]]
+        List of token sequences
+
+    max_tokens : Optional[int] = None
+        Run the pipeline on length-bucketed batches of up to `max_tokens`
+          padded tokens (see nlptasks.batching.length_batches), i.e. short
+          sentences are not padded to the longest sentences of the corpus.
+          By default, all sequences are passed in one call.
+
+    max_tokens_per_call : Optional[int] = None
+        Split `data` into consecutive chunks of up to `max_tokens_per_call`
+          tokens, and run the pipeline chunk by chunk, i.e. stanza never
+          builds one huge Document. The peak memory does not grow with
+          the corpus size if `convert` is given.
+
+    convert : Optional[Callable] = None
+        Function that converts the stanza Sentence objects of a chunk into
+          the output format, e.g. `nlptasks.pos._from_stanza`. The stanza
+          objects of a chunk can be freed before the next chunk is run.
+          The converted chunks are merged with `concat_outputs`.
+
+    Returns:
+    --------
+    list
+        List of stanza Sentence objects in the order of `data`, or the
+          merged output of `convert`
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.batching
+        model = nt.pos.get_model('stanza-de')
+        sents = nt.batching.stanza_predict(model, sequences, 4096)
+    """
+    def annotate(sequences):
+        if max_tokens is None:
+            sentences = model(sequences).sentences
+        else:
+            sentences = bucketed(
+                lambda batch: model(batch).sentences, sequences, max_tokens)
+        return sentences if convert is None else convert(sentences)
+
+    if max_tokens_per_call is None:
+        return annotate(data)
+    chunks = token_chunks(data, max_tokens_per_call)
+    chunks = itertools.chain([next(chunks, [])], chunks)  # at least one
+    return concat_outputs([annotate(chunk) for chunk in chunks])
+
+
+def flair_predict(model,
+                  data: List[List[str]],
+                  mini_batch_size: int = 32,
+                  max_tokens: Optional[int] = None) -> list:
+    """Predict flair tags for many token sequences in mini-batches
+
+    Parameters:
+    -----------
+    model
+        flair SequenceTagger
+
+    data : List[List[str]]
+        List of token sequences
+
+    mini_batch_size : int = 32
+        Number of sentences per forward pass. The sentences are sorted
+          by length so that each mini-batch contains similarly long
+          sentences, i.e. flair pads less.
+
+    max_tokens : Optional[int] = None
+        Token budget of a padded mini-batch (see length_batches), i.e.
+          mini-batches of short sentences contain more sentences (but not
+          more than `mini_batch_size`).
+
+    Returns:
+    --------
+    list
+        List of tagged flair Sentence objects in the order of `data`
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.batching
+        model = nt.pos.get_model('flair-de')
+        sents = nt.batching.flair_predict(model, sequences, 64)
+    """
+    import flair.data
+    sentences = [flair.data.Sentence(sequence) for sequence in data]
+    # longest sentences first, i.e. the memory peak is in the first batch
+    lengths = [len(sequence) for sequence in data]
+    if max_tokens is None:
+        order = sorted(range(len(data)), key=lambda i: -lengths[i])
+        batches = [order[start:start + mini_batch_size]
+                   for start in range(0, len(order), mini_batch_size)]
+    else:
+        batches = length_batches(lengths, max_tokens, mini_batch_size)
+    for batch in batches:
+        model.predict([sentences[i] for i in batch],
+                      mini_batch_size=len(batch))
+    return sentences
+
+
+@contextlib.contextmanager
+def gc_frozen():
+    """Move all objects to the permanent GC generation while forking,
+        i.e. the workers' GC does not touch (and copy) the parent's pages
+        (Python>=3.7)"""
+    freeze = hasattr(gc, "freeze")
+    if freeze:
+        gc.freeze()
+    try:
+        yield
+    finally:
+        if freeze:
+            gc.unfreeze()
+
+
+# the functions of forked worker processes by call ID, see fork_map
+_FORKED = {}
+_FORK_IDS = itertools.count()
+_FORK_LOCK = threading.Lock()
+
+
+def _forked_call(task: tuple) -> list:
+    call_id, chunk = task
+    return _FORKED[call_id](chunk)
+
+
+def _fork_safe() -> bool:
+    """Flag if this process can fork, i.e. the OS supports it and no other
+        threads are running (see fork_map)"""
+    can_fork = "fork" in mp.get_all_start_methods()
+    return can_fork and threading.active_count() == 1
+
+
+def fork_map(fn: Callable,
+             data: list,
+             n_jobs: Optional[int] = 1,
+             chunksize: Optional[int] = None) -> list:
+    """Apply a batch function to chunks of `data` in forked processes
+
+    Do not use fork_map in a multithreaded process. A forked child only
+      inherits the calling thread, i.e. locks held by other threads (e.g.
+      of a model or of the logging module) can deadlock the workers.
+      Therefore, `fn(data)` runs in this process if other threads are
+      alive, e.g. within nlptasks.serving.Annotator.
+
+    Parameters:
+    -----------
+    fn : Callable
+        Function that processes a list of examples and returns one result
+          per example, e.g. a closure around a loaded model. The workers
+          are forked after `fn` exists, i.e. the model is shared
+          copy-on-write and never pickled.
+
+    data : list
+        Examples, e.g. token sequences
+
+    n_jobs : Optional[int] = 1
+        Number of worker processes (None: os.cpu_count()). `fn(data)` is
+          called in this process if `n_jobs=1`, or if the OS cannot fork,
+          or if this process is a daemonic pool worker itself, or if
+          other threads are running.
+
+    chunksize : Optional[int] = None
+        Number of examples per task (Default: 4 tasks per worker)
+
+    Returns:
+    --------
+    list
+        The same as `fn(data)` in the order of `data`
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs <= 1 or len(data) < 2 or not _fork_safe():
+        return fn(data)
+    if mp.current_process().daemon:  # e.g. within nlptasks.parallel.run
+        return fn(data)
+    if chunksize is None:
+        chunksize = max(1, -(-len(data) // (n_jobs * 4)))
+    chunks = [data[i:i + chunksize] for i in range(0, len(data), chunksize)]
+    # the workers look up `fn` by the ID of this call
+    call_id = next(_FORK_IDS)
+    tasks = [(call_id, chunk) for chunk in chunks]
+    with _FORK_LOCK:
+        _FORKED[call_id] = fn
+        try:
+            with gc_frozen(), mp.get_context("fork").Pool(
+                    min(n_jobs, len(chunks))) as pool:
+                outputs = pool.map(_forked_call, tasks, chunksize=1)
+        finally:
+            _FORKED.pop(call_id, None)
+    return list(itertools.chain.from_iterable(outputs))
+
+
+def stream_chunks(func: Callable,
+                  data: Iterable,
+                  chunksize: int = 1000,
+                  **kwargs) -> Iterator:
+    """Apply a task function to an iterable chunk by chunk
+
+    Parameters:
+    -----------
+    func : Callable
+        Task function, e.g. nlptasks.pos.spacy_de
+
+    data : Iterable
+        Token sequences or documents, e.g. a generator that reads a file
+
+    chunksize : int = 1000
+        Number of examples per call of `func`
+
+    **kwargs
+        Arguments of `func`, e.g. maxlen, model
+
+    Returns:
+    --------
+    Iterator
+        The output of `func` for each chunk, e.g. `(idseqs, TAGSET)`
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.pos
+        for idseqs, TAGSET in nt.batching.stream_chunks(
+                nt.pos.spacy_de, corpus, chunksize=500):
+            pass
+    """
+    iterator = iter(data)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            break
+        yield func(chunk, **kwargs)
+
+
+def build_vocab(func: Callable,
+                data: Iterable,
+                chunksize: int = 1000,
+                min_occurrences: int = 1,
+                sort: bool = True,
+                unk: bool = True,
+                **kwargs) -> Vocab:
+    """Identify the VOCAB of a task function over a stream (first pass)
+
+    Parameters:
+    -----------
+    func : Callable
+        Task function that returns `(idseqs, VOCAB)` and accepts the
+          arguments `VOCAB` and `min_occurrences`, e.g. nlptasks.lemma.spacy_de
+
+    data : Iterable
+        Token sequences, e.g. a generator that reads a file
+
+    chunksize : int = 1000
+        Number of examples per call of `func`
+
+    min_occurrences : int = 1
+        The required number of occurences in the whole stream.
+
+    sort : bool = True
+        Flag to sort the VOCAB alphabetically (see nlptasks.vocab.VocabBuilder)
+
+    unk : bool = True
+        Flag to append "[UNK]"
+
+    **kwargs
+        Arguments of `func`, e.g. model
+
+    Returns:
+    --------
+    Vocab
+        The same VOCAB as if `func` was called with the whole stream
+    """
+    builder = VocabBuilder(min_occurrences, sort=sort, unk=unk)
+    for idseqs, VOCAB in stream_chunks(
+            func, data, chunksize, min_occurrences=1, **kwargs):
+        builder.update([VOCAB[i] for i in seq] for seq in idseqs)
+    return builder.build()
+
+
+# arguments that only change the output format, not the VOCAB
+_FORMAT_ARGS = ('maxlen', 'padding', 'truncating', 'output', 'return_mask')
+
+
+def _stream_with_vocab(func: Callable,
+                       vocab: dict,
+                       data: Iterable,
+                       chunksize: int = 1000,
+                       VOCAB: Optional[Union[List[str], Vocab]] = None,
+                       **kwargs) -> Iterator:
+    """Stream with a fixed VOCAB, or identify it in a first pass"""
+    if VOCAB is None:
+        if iter(data) is data:
+            raise Exception(
+                "Two-pass streaming requires a re-iterable `data` (e.g. a "
+                "list or an object with __iter__), or pass a fixed VOCAB")
+        cfg = dict(vocab)
+        cfg['min_occurrences'] = kwargs.pop(
+            'min_occurrences', cfg['min_occurrences'])
+        VOCAB = build_vocab(
+            func, data, chunksize, **cfg,
+            **{k: v for k, v in kwargs.items() if k not in _FORMAT_ARGS})
+    return stream_chunks(func, data, chunksize, VOCAB=VOCAB, **kwargs)
+
+
+def streamable(vocab: Optional[dict] = None):
+    """Decorator to add the arguments `stream` and `chunksize` to a factory
+
+    Parameters:
+    -----------
+    vocab : Optional[dict] = None
+        Settings of nlptasks.batching.build_vocab (i.e. `min_occurrences`,
+          `sort`, `unk`) for task functions that identify a VOCAB. The
+          streaming function then uses a fixed VOCAB (argument `VOCAB`) or
+          runs two passes over `data` to identify it.
+    """
+    def decorator(factory):
+        @functools.wraps(factory)
+        def wrapper(name: str, stream: bool = False, chunksize: int = 1000):
+            func = factory(name)
+            if not stream:
+                return func
+            if vocab is None:
+                return functools.partial(
+                    stream_chunks, func, chunksize=chunksize)
+            return functools.partial(
+                _stream_with_vocab, func, vocab, chunksize=chunksize)
+        return wrapper
+    return decorator
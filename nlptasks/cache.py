@@ -0,0 +1,309 @@
+from typing import Callable, Dict, List, Optional
+from .padding import pad_idseqs, maskseqs_to_coo
+from .vocab import Vocab
+import hashlib
+import importlib
+import itertools
+import json
+import numpy as np
+import pickle
+import sqlite3
+import threading
+import time
+
+
+# modules that return ID sequences, i.e. padding is applied after caching
+ID_TASKS = ('pos', 'ner', 'lemma')
+
+# modules that return sparse mask sequences, i.e. COO is built after caching
+SPARSE_TASKS = ('pos2', 'ner2', 'dephead', 'depchild')
+
+# modules that identify the VOCAB from the data; default min_occurrences.
+# Their lemmata/subtree hashes are cached, and encoded for each call.
+VOCAB_TASKS = {'lemma': 20, 'deptree': 1}
+
+# arguments that change how, but not what, is annotated, i.e. that are not
+# part of the keys
+EXEC_ARGS = ('batch_size', 'n_process', 'n_jobs', 'mini_batch_size',
+             'max_tokens', 'max_tokens_per_call', 'memo_size')
+
+# SQLite's default limit of host parameters is 999
+_MAX_PARAMS = 900
+
+
+def _identity(data, model=None):
+    return data
+
+
+def _model_identity(module: str, name: str) -> dict:
+    """Default model identity of Cache.wrap"""
+    import nlptasks.meta
+    try:
+        return nlptasks.meta.get(name, module)
+    except Exception:
+        # e.g. no meta information for this task function
+        return {'module': module, 'name': name,
+                'nlptasks': nlptasks.__version__}
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class Cache(object):
+    """Persistent key-value store of annotated examples (SQLite)
+
+    Parameters:
+    -----------
+    path : str
+        SQLite database file, e.g. 'annotations.db'. The file is created
+          if it does not exist. Use ':memory:' for a non-persistent cache.
+
+    max_bytes : Optional[int] = None
+        Evict the least recently used examples if the stored outputs need
+          more than `max_bytes`. No limit by default.
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.cache
+        cache = nt.cache.Cache('annotations.db', max_bytes=2**30)
+        myfn = cache.wrap('pos', 'spacy-de')
+        idseqs, TAGSET = myfn(sequences, maxlen=16)
+        print(cache.stats())
+    """
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # one connection for all threads (e.g. nlptasks.serving), i.e.
+        # every access holds the lock
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS annotations ("
+            "key TEXT PRIMARY KEY, value BLOB, nbytes INTEGER, atime REAL)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS annotations_atime "
+            "ON annotations (atime)")
+        self.conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, object]:
+        """Look up many keys and mark the hits as recently used"""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _MAX_PARAMS):
+                batch = keys[start:start + _MAX_PARAMS]
+                marks = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    "SELECT key, value FROM annotations "
+                    f"WHERE key IN ({marks})", batch).fetchall()
+                found.update((k, pickle.loads(v)) for k, v in rows)
+                self.conn.execute(
+                    f"UPDATE annotations SET atime = ? WHERE key IN ({marks})",
+                    [now] + batch)
+            self.conn.commit()
+        return found
+
+    def put_many(self, items: Dict[str, object]):
+        """Store many key-value pairs and evict old entries if necessary"""
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, blob, len(blob), now))
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO annotations VALUES (?, ?, ?, ?)",
+                rows)
+            self.conn.commit()
+            self._evict()
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            total = self.nbytes()
+            if total <= self.max_bytes:
+                return
+            # least recently used first
+            drop = []
+            for key, nbytes in self.conn.execute(
+                    "SELECT key, nbytes FROM annotations "
+                    "ORDER BY atime, rowid"):
+                if total <= self.max_bytes:
+                    break
+                drop.append((key,))
+                total -= nbytes
+            self.conn.executemany(
+                "DELETE FROM annotations WHERE key = ?", drop)
+            self.conn.commit()
+
+    def nbytes(self) -> int:
+        """Size of all stored outputs in bytes"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COALESCE(SUM(nbytes), 0) FROM annotations"
+            ).fetchone()[0]
+
+    def stats(self) -> dict:
+        """Hit/miss counters of this instance and the size of the cache"""
+        with self._lock:
+            entries = self.conn.execute(
+                "SELECT COUNT(*) FROM annotations").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': entries, 'nbytes': self.nbytes()}
+
+    def clear(self):
+        """Delete all stored outputs"""
+        self.conn.execute("DELETE FROM annotations")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def wrap(self, module: str, name: str,
+             identity: Optional[dict] = None,
+             func: Optional[Callable] = None) -> Callable:
+        """Return a task function that only annotates uncached examples
+
+        Parameters:
+        -----------
+        module : str
+            Task module, e.g. 'sbd', 'token', 'pos', 'lemma', 'deptree'
+
+        name : str
+            Identifier of the task function, see `factory(name)`
+
+        identity : Optional[dict] = None
+            Model identity that is part of each key. By default, the meta
+              information `nlptasks.meta.get(name, module)` is used, i.e.
+              a new package or model version misses the old entries. If
+              there is no meta information, the module, name and nlptasks
+              version are used.
+
+        func : Optional[Callable] = None
+            Task function (Default: `factory(name)` of the module)
+
+        Returns:
+        --------
+        Callable
+            Function with the same arguments and outputs as
+              `factory(name)`. The misses of a call are annotated in one
+              batch.
+        """
+        if func is None:
+            func = importlib.import_module(
+                f"nlptasks.{module}").factory(name)
+        if identity is None:
+            identity = _model_identity(module, name)
+
+        def cached(data, **kwargs):
+            return self._run(func, module, name, identity, list(data), kwargs)
+        return cached
+
+    def _run(self, func: Callable, module: str, name: str, identity: dict,
+             data: list, kwargs: dict):
+        # (1) arguments that are applied to the cached outputs
+        model = kwargs.pop('model', None)
+        fmt = {}
+        if module in ID_TASKS:
+            fmt = {k: kwargs.pop(k) for k in (
+                'maxlen', 'padding', 'truncating', 'output') if k in kwargs}
+        coo = module in SPARSE_TASKS and kwargs.get('output') == 'coo'
+        if coo:
+            kwargs.pop('output')
+        if module in VOCAB_TASKS:
+            VOCAB = kwargs.pop('VOCAB', None)
+            min_occurrences = kwargs.pop(
+                'min_occurrences', VOCAB_TASKS[module])
+            return_mask = kwargs.pop('return_mask', False)
+            kwargs['min_occurrences'] = 1
+        if module == 'sbd':
+            return_offsets = kwargs.pop('return_offsets', False)
+
+        # (2) keys of the examples and of batch-level outputs (e.g. TAGSET)
+        keyargs = {k: v for k, v in kwargs.items() if k not in EXEC_ARGS}
+        prefix = json.dumps(
+            [identity, module, name, keyargs], sort_keys=True, default=str)
+        keys = [_digest(json.dumps([prefix, example], ensure_ascii=False))
+                for example in data]
+        batchkey = _digest(prefix)
+        found = self.get_many(list(set(keys)) + [batchkey])
+        missing = list(dict.fromkeys(k for k in keys if k not in found))
+        n_missing = sum(1 for k in keys if k not in found)
+        self.hits += len(keys) - n_missing
+        self.misses += n_missing
+
+        # (3) annotate the misses
+        if missing or batchkey not in found:
+            idx = {k: i for i, k in enumerate(keys)}
+            examples = [data[idx[k]] for k in missing]
+            new = {batchkey: {'tuple': False}}
+            if module == 'sbd':
+                sents, offsets = func(
+                    examples, model=model, return_offsets=True, **kwargs)
+                # the sentences of each document (in the order of `data`)
+                bounds = np.searchsorted(
+                    offsets[:, 0], np.arange(len(examples) + 1))
+                for d, k in enumerate(missing):
+                    start, end = bounds[d], bounds[d + 1]
+                    new[k] = (sents[start:end], offsets[start:end, 1:])
+            else:
+                out = func(examples, model=model, **kwargs)
+                if module in VOCAB_TASKS:
+                    idseqs, vocab = out
+                    new.update((k, [vocab[i] for i in seq])
+                               for k, seq in zip(missing, idseqs))
+                elif not isinstance(out, tuple):
+                    new.update(zip(missing, out))
+                else:
+                    perex = [p for p in out if not isinstance(p, Vocab)]
+                    new.update(zip(missing, zip(*perex)))
+                    new[batchkey] = {
+                        'tuple': True, 'n': len(perex),
+                        'vocabs': [(j, p) for j, p in enumerate(out)
+                                   if isinstance(p, Vocab)]}
+            self.put_many(new)
+            found.update(new)
+
+        # (4) assemble the outputs in the order of `data`
+        values = [found[k] for k in keys]
+        batch = found[batchkey]
+        if module == 'sbd':
+            sentences = list(itertools.chain.from_iterable(
+                sents for sents, _ in values))
+            if not return_offsets:
+                return sentences
+            offsets = np.zeros((len(sentences), 3), dtype=np.int64)
+            offsets[:, 0] = np.repeat(
+                np.arange(len(values)), [len(sents) for sents, _ in values])
+            if sentences:
+                offsets[:, 1:] = np.concatenate([o for _, o in values])
+            return sentences, offsets
+        if module in VOCAB_TASKS:
+            mod = importlib.import_module(f"nlptasks.{module}")
+            if module == 'lemma':
+                result = mod._encode(
+                    values, VOCAB=VOCAB, min_occurrences=min_occurrences)
+            else:
+                result = mod._encode(
+                    values, VOCAB=VOCAB, min_occurrences=min_occurrences,
+                    return_mask=return_mask)
+        elif not batch['tuple']:
+            result = values
+        else:
+            parts = [list(p) for p in zip(*values)] if values else [
+                [] for _ in range(batch['n'])]
+            for j, vocab in batch['vocabs']:
+                parts.insert(j, vocab)
+            result = tuple(parts)
+
+        # (5) padding and output format of ID sequences
+        if module in ID_TASKS:
+            result = pad_idseqs(_identity)(result, **fmt)
+        if coo:
+            result = (maskseqs_to_coo(result[0]),) + result[1:]
+        return result
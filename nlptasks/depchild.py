@@ -1,11 +1,11 @@
 from .padding import pad_adjacmatrix
 from typing import List, Tuple
 import warnings
-import de_core_news_lg as spacy_model
-import spacy
-import stanza
+from . import models
+from .batching import spacy_pipe, streamable
 
 
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         dependency parsing and transformations of a token's
@@ -16,6 +16,13 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'spacy-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -37,7 +44,7 @@ def depchild_factory(name: str):
     return factory(name)
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the depchild function
         so that it only needs to be done once
 
@@ -46,6 +53,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         import nlptasks as nt
@@ -55,15 +67,15 @@ def get_model(name: str):
         maskseqs, seqlens = fn(sents, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, ['parser'])
     else:
         raise Exception(f"Unknown dependency parser: '{name}'")
 
 
 @pad_adjacmatrix
-def spacy_de(data: List[List[str]], model=None) -> (
+def spacy_de(data: List[List[str]], model=None,
+             batch_size: int = 1000, n_process: int = 1) -> (
         List[List[Tuple[int, int]]], List[List[Tuple[int, int]]], List[int]):
     """Dependency relations with spaCy de_core_news_lg for German
 
@@ -75,6 +87,12 @@ def spacy_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.depchild.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_adjacmatrix
 
@@ -84,6 +102,9 @@ def spacy_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_adjacmatrix
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_adjacmatrix
+
     Returns:
     --------
     maskseqs : List[List[Tuple[int, int]]]
@@ -103,16 +124,20 @@ def spacy_de(data: List[List[str]], model=None) -> (
     """
     # (1) load spacy model
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
+        model = get_model("spacy-de")
 
     # parse dependencies of a pre-tokenized sentencens
-    parser = model.pipeline[0][1]
-    docs = [parser(spacy.tokens.doc.Doc(model.vocab, words=sequence))
-            for sequence in data]
+    docs = spacy_pipe(model, data, ["parser"], batch_size=batch_size,
+                      n_process=n_process)
+    return _from_spacy(docs)
+
+
+def _from_spacy(docs) -> (List[List[Tuple[int, int]]], List[int]):
+    """Extract children relations of parsed spaCy docs"""
+    docs = list(docs)
 
     # (3) Extract all (child, parent)-tuples
-    def get_children_indicies(doc: spacy.tokens.doc.Doc):
+    def get_children_indicies(doc):
         idxpairs = []
         for t in doc:
             idxpairs.extend([(c.i, t.i) for c in t.children])
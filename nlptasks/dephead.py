@@ -1,10 +1,9 @@
 from .padding import pad_merge_adjac_maskseqs
-from .vocab import texttoken_to_index
-from typing import List, Tuple
+from .vocab import Vocab
+from . import models
+from .batching import spacy_pipe, stanza_predict, streamable
+from typing import List, Optional, Tuple
 import warnings
-import de_core_news_lg as spacy_model
-import spacy
-import stanza
 
 
 # https://universaldependencies.org/u/dep/index.html
@@ -30,6 +29,7 @@ TIGER_RELS = [
 ]
 
 
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         dependency parsing
@@ -39,6 +39,13 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'spacy-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -64,7 +71,7 @@ def deprel_factory(name: str):
     return factory(name)
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the deprel function
         so that it only needs to be done once
 
@@ -73,6 +80,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         from nlptasks.deprel import deprel
@@ -81,12 +93,12 @@ def get_model(name: str):
         dc, dp, sl = fn(sents, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, ['parser'])
 
     elif name in ("stanza", "stanza-de"):
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize,mwt,pos,lemma,depparse',
             tokenize_pretokenized=True)
     else:
@@ -94,7 +106,8 @@ def get_model(name: str):
 
 
 @pad_merge_adjac_maskseqs
-def spacy_de(data: List[List[str]], model=None) -> (
+def spacy_de(data: List[List[str]], model=None,
+             batch_size: int = 1000, n_process: int = 1) -> (
         List[List[Tuple[int, int]]], List[List[Tuple[int, int]]], List[int]):
     """Dependency relations with spaCy de_core_news_lg for German
 
@@ -106,6 +119,12 @@ def spacy_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.deprel.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_merge_adjac_maskseqs
 
@@ -115,6 +134,9 @@ def spacy_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_merge_adjac_maskseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_merge_adjac_maskseqs
+
     Returns:
     --------
     maskseqs : List[List[Tuple[int, int]]]
@@ -135,24 +157,29 @@ def spacy_de(data: List[List[str]], model=None) -> (
     """
     # (1) load spacy model
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
+        model = get_model("spacy-de")
 
     # parse dependencies of a pre-tokenized sentencens
-    parser = model.pipeline[0][1]
-    docs = [parser(spacy.tokens.doc.Doc(model.vocab, words=sequence))
-            for sequence in data]
+    docs = spacy_pipe(model, data, ["parser"], batch_size=batch_size,
+                      n_process=n_process)
+    return _from_spacy(docs)
+
 
+def _from_spacy(docs) -> (
+        List[List[Tuple[int, int]]], List[List[Tuple[int, int]]],
+        List[int], int):
+    """Extract parent relations and TIGER relation types of parsed
+        spaCy docs"""
     adjac_parent = [[(t.head.i, t.i) for t in doc] for doc in docs]
     rel_types = [[t.dep_ for t in doc] for doc in docs]
     seqlens = [len(doc) for doc in docs]
 
     # (2) Define TIGER RELATIONS as VOCAB
-    SCHEME = TIGER_RELS.copy()
+    SCHEME = Vocab(TIGER_RELS)
     SCHEME.append("[UNK]")
 
     # (3) Encode deprel tags
-    rel_types = [texttoken_to_index(seq, SCHEME) for seq in rel_types]
+    rel_types = SCHEME.encode(rel_types)
     onehot_types = [[(ri, ti) for ti, ri in enumerate(sent)]
                     for sent in rel_types]
 
@@ -161,7 +188,9 @@ def spacy_de(data: List[List[str]], model=None) -> (
 
 
 @pad_merge_adjac_maskseqs
-def stanza_de(data: List[List[str]], model=None) -> (
+def stanza_de(data: List[List[str]], model=None,
+              max_tokens: Optional[int] = None,
+              max_tokens_per_call: Optional[int] = None) -> (
         List[List[Tuple[int, int]]], List[List[Tuple[int, int]]], List[int]):
     """Dependency relations with stanza for German
 
@@ -173,6 +202,12 @@ def stanza_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.deprel.get_model
 
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
+    max_tokens_per_call : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_merge_adjac_maskseqs
 
@@ -182,6 +217,9 @@ def stanza_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_merge_adjac_maskseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_merge_adjac_maskseqs
+
     Returns:
     --------
     maskseqs : List[List[Tuple[int, int]]]
@@ -202,24 +240,31 @@ def stanza_de(data: List[List[str]], model=None) -> (
     """
     # (1) load spacy model
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize,mwt,pos,lemma,depparse',
-            tokenize_pretokenized=True)
+        model = get_model("stanza-de")
 
     # parse dependencies of a pre-tokenized sentencens
-    docs = model(data)
+    return stanza_predict(
+        model, data, max_tokens=max_tokens,
+        max_tokens_per_call=max_tokens_per_call, convert=_from_stanza)
+
 
+def _from_stanza(sentences) -> (
+        List[List[Tuple[int, int]]], List[List[Tuple[int, int]]],
+        List[int], int):
+    """Extract parent relations and UD relation types of parsed
+        stanza sentences"""
+    sentences = list(sentences)
     adjac_parent = [[(t.head, i) for i, t in enumerate(sent.words)]
-                    for sent in docs.sentences]
-    rel_types = [[t.deprel for t in sent.words] for sent in docs.sentences]
-    seqlens = [len(sent.words) for sent in docs.sentences]
+                    for sent in sentences]
+    rel_types = [[t.deprel for t in sent.words] for sent in sentences]
+    seqlens = [len(sent.words) for sent in sentences]
 
     # (2) Define UD v2 RELATIONS as VOCAB
-    SCHEME = UD2_RELS.copy()
+    SCHEME = Vocab(UD2_RELS)
     SCHEME.append("[UNK]")
 
     # (3) Encode deprel tags
-    rel_types = [texttoken_to_index(seq, SCHEME) for seq in rel_types]
+    rel_types = SCHEME.encode(rel_types)
     onehot_types = [[(ri, ti) for ti, ri in enumerate(sent)]
                     for sent in rel_types]
 
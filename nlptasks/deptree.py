@@ -2,13 +2,14 @@ from typing import List, Optional
 import treesimi as ts
 import json
 import hashlib
-from .vocab import identify_vocab_mincount, texttoken_to_index
+import numpy as np
+from .vocab import Vocab, VocabBuilder
+from . import models
+from .batching import spacy_pipe, stanza_predict, streamable
 import itertools
-import de_core_news_lg as spacy_model
-import spacy
-import stanza
 
 
+@streamable(vocab={'min_occurrences': 1, 'sort': False, 'unk': False})
 def factory(name: str):
     """Factory function to return a processing function for
         dependency parsing
@@ -18,6 +19,14 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'spacy-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk. Pass a fixed VOCAB, otherwise the VOCAB is identified in
+          a first pass over the iterable. See nlptasks.batching.streamable
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -36,7 +45,7 @@ def factory(name: str):
         raise Exception(f"Unknown dependency parser: '{name}'")
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the deprel function
         so that it only needs to be done once
 
@@ -45,6 +54,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         from nlptasks.deprel import deprel
@@ -53,18 +67,62 @@ def get_model(name: str):
         dc, dp, sl = fn(sents, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, ['parser'])
 
     elif name in ("stanza", "stanza-de"):
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize,mwt,pos,lemma,depparse',
             tokenize_pretokenized=True)
     else:
         raise Exception(f"Unknown dependency parser: '{name}'")
 
 
+# hash engine -> digest size in bytes ('sha512': hex strings)
+HASH_ENGINES = {'sha512': None, 'blake2b-64': 8, 'blake2b-128': 16}
+
+
+def _serialize(shingle: list) -> bytes:
+    """Stable byte string of a shingle, i.e. of its nested set rows
+        (lft, rgt, depth, attr) with int and str values. `repr` of lists is
+        deterministic and about 2x faster than `json.dumps`."""
+    return repr(shingle).encode('utf-8')
+
+
+def hash_shingles(shingled: List[list], hash_engine: str = 'sha512'
+                  ) -> list:
+    """Hash the shingles of each tree
+
+    Parameters:
+    -----------
+    shingled : List[list]
+        The shingles of each tree, see treesimi.shingleset
+
+    hash_engine : str = 'sha512'
+        'sha512' returns 128-char hex strings of the JSON serialized
+          shingles (default). 'blake2b-64' and 'blake2b-128' return numpy
+          arrays with 8-byte digests as int64, and 16-byte digests as
+          np.void (`tolist()` returns bytes).
+
+    Returns:
+    --------
+    list
+        For each tree, the digests of its shingles
+    """
+    if hash_engine == 'sha512':
+        return [[hashlib.sha512(json.dumps(tmp).encode('utf-8')).hexdigest()
+                 for tmp in sent] for sent in shingled]
+    if hash_engine not in HASH_ENGINES:
+        raise Exception(f"Unknown hash engine: '{hash_engine}'")
+    size = HASH_ENGINES[hash_engine]
+    dtype = '<i8' if size == 8 else f'V{size}'
+    blake2b = hashlib.blake2b
+    return [np.frombuffer(b"".join(
+        blake2b(_serialize(tmp), digest_size=size).digest() for tmp in sent),
+        dtype=dtype) for sent in shingled]
+
+
 def deptree_decorator(func):
     def wrapper(data: List[List[str]],
                 model=None,
@@ -72,12 +130,14 @@ def deptree_decorator(func):
                 use_drop_nodes: Optional[bool] = False,
                 use_replace_attr: Optional[bool] = False,
                 placeholder: Optional[str] = '\uFFFF',
-                VOCAB: Optional[List[hashlib.sha512]] = None,
+                VOCAB: Optional[list] = None,
                 min_occurrences: Optional[int] = 1,
-                return_mask: bool = False
+                return_mask: bool = False,
+                hash_engine: str = 'sha512',
+                **kwargs
                 ) -> (List[List[int]], List[str]):
-        # (1) run the NLP task
-        adjac = func(data, model)
+        # (1) run the NLP task (kwargs, e.g. batch_size, go to the parser)
+        adjac = func(data, model, **kwargs)
 
         # (2a) convert to nested set models
         nested = [ts.adjac_to_nested_with_attr(tree) for tree in adjac]
@@ -90,33 +150,97 @@ def deptree_decorator(func):
             'use_replace_attr': use_replace_attr,
             'placeholder': placeholder}
         shingled = [ts.shingleset(tree, **cfg) for tree in nested]
-        encoded = [[json.dumps(tmp).encode('utf-8') for tmp in sent]
-                   for sent in shingled]
-        hashed = [[hashlib.sha512(enc).hexdigest() for enc in sent]
-                  for sent in encoded]
+        hashed = hash_shingles(shingled, hash_engine=hash_engine)
+
+        # (3-4) Identify VOCAB and encode
+        return _encode(hashed, VOCAB=VOCAB, min_occurrences=min_occurrences,
+                       return_mask=return_mask)
+    return wrapper
 
+
+def _encode(hashed: list,
+            VOCAB: Optional[list] = None,
+            min_occurrences: Optional[int] = 1,
+            return_mask: bool = False
+            ) -> (List[List[int]], Vocab):
+    """Identify the VOCAB (if not given) and encode hashed subtrees"""
+    indices = None
+    if hashed and all(isinstance(h, np.ndarray) for h in hashed):
+        # numpy digests (see hash_shingles) are counted and looked up as
+        # arrays, i.e. only the VOCAB holds python int/bytes objects
+        try:
+            indices, VOCAB = _encode_digests(hashed, VOCAB, min_occurrences)
+        except (TypeError, ValueError):  # e.g. a VOCAB of hex strings
+            hashed = [h.tolist() for h in hashed]
+    if indices is None:
         # (3) Identify VOCAB
         if VOCAB is None:
-            VOCAB = identify_vocab_mincount(
-                data=list(itertools.chain.from_iterable(hashed)),
-                min_occurrences=min_occurrences, sort=False)
+            VOCAB = VocabBuilder(
+                min_occurrences, sort=False, unk=False).update(hashed).build()
+        if not isinstance(VOCAB, Vocab):
+            VOCAB = Vocab(VOCAB)
 
         # (4) Encode hashed trees to mask indices
-        unkid = len(VOCAB)
-        indices = [texttoken_to_index(ex, VOCAB) for ex in hashed]
+        unkid = VOCAB.unk_id
+        indices = VOCAB.encode(hashed)
         indices = [[i for i in ex if i != unkid] for ex in indices]
 
-        # choose output format
-        if return_mask:
-            masked = [[int(i in ex) for i in range(unkid)] for ex in indices]
-            return masked, VOCAB
-        else:
-            return indices, VOCAB
-    return wrapper
+    # choose output format
+    if return_mask:
+        return _to_csr(indices, n_cols=VOCAB.unk_id), VOCAB
+    else:
+        return indices, VOCAB
+
+
+def _encode_digests(hashed: List[np.ndarray],
+                    VOCAB: Optional[list] = None,
+                    min_occurrences: Optional[int] = 1
+                    ) -> (List[List[int]], Vocab):
+    """_encode for numpy digests with np.unique and np.searchsorted"""
+    flat = np.concatenate(hashed)
+    # (3) Identify VOCAB, i.e. the frequent digests by first occurrence
+    if VOCAB is None:
+        uniq, first, counts = np.unique(
+            flat, return_index=True, return_counts=True)
+        keep = counts >= (min_occurrences or 1)
+        keys = uniq[keep][np.argsort(first[keep], kind='stable')]
+        VOCAB = Vocab(keys.tolist())
+    else:
+        keys = np.array(list(VOCAB), dtype=flat.dtype)
+    if not isinstance(VOCAB, Vocab):
+        VOCAB = Vocab(VOCAB)
+
+    if len(keys) == 0:
+        return [[] for _ in hashed], VOCAB
+
+    # (4) Look up the digests in the sorted VOCAB (the first ID of a
+    # duplicate), and drop unknown digests
+    order = np.argsort(keys, kind='stable')
+    pos = np.minimum(np.searchsorted(keys[order], flat), len(keys) - 1)
+    known = keys[order][pos] == flat
+    ids = order[pos]
+    sentidx = np.repeat(np.arange(len(hashed)), [len(h) for h in hashed])
+    bounds = np.searchsorted(sentidx[known], np.arange(len(hashed) + 1))
+    ids = ids[known].tolist()
+    return [ids[bounds[i]:bounds[i + 1]] for i in range(len(hashed))], VOCAB
+
+
+def _to_csr(indices: List[List[int]], n_cols: int):
+    """Binary mask matrix (sentences x VOCAB) of the mask indices"""
+    import scipy.sparse
+    rows = [sorted(set(ex)) for ex in indices]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(ex) for ex in rows])
+    cols = np.fromiter(itertools.chain.from_iterable(rows),
+                       dtype=np.int64, count=int(indptr[-1]))
+    return scipy.sparse.csr_matrix(
+        (np.ones(len(cols), dtype=np.int32), cols, indptr),
+        shape=(len(rows), n_cols))
 
 
 @deptree_decorator
-def spacy_de(data: List[List[str]], model=None
+def spacy_de(data: List[List[str]], model=None,
+             batch_size: int = 1000, n_process: int = 1
              ) -> (List[List[str]], List[str]):
     """Dependency relations with spaCy de_core_news_lg for German
 
@@ -128,11 +252,18 @@ def spacy_de(data: List[List[str]], model=None
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.deprel.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
     return_mask: bool = False
-        Flag if mask vectors should be returned instead of indices.
+        Flag if a sparse mask matrix should be returned instead of indices.
 
-    VOCAB: Optional[List[hashlib.sha512]] = None
-        A given list of python sha512 objects that are used as ID
+    VOCAB: Optional[list] = None
+        A given list of subtree digests that are used as ID, see
+          `hash_engine`
 
     min_occurrences : int
         (Optional) The required number of occurences in a corpus.
@@ -149,14 +280,21 @@ def spacy_de(data: List[List[str]], model=None
     placeholder: Optional[str] = '\uFFFF'
         see treesimi.shingleset
 
+    hash_engine : str = 'sha512'
+        see nlptasks.deptree.hash_shingles, e.g. 'blake2b-64' is faster
+          and its VOCAB needs less memory
+
     Returns:
     --------
     indices : List[List[int]]
         For each sentences, a list of mask indices.
-        If `return_mask=True` a list of masks is returned.
+        If `return_mask=True` a scipy.sparse.csr_matrix with one binary
+          mask (row) per sentence and one column per VOCAB entry
+          is returned.
 
-    VOCAB: Optional[List[hashlib.sha512]] = None
-        A given list of python sha512 objects that are used as ID
+    VOCAB: Optional[list] = None
+        A given list of subtree digests that are used as ID, see
+          `hash_engine`
 
     Example:
     --------
@@ -168,22 +306,26 @@ def spacy_de(data: List[List[str]], model=None
     """
     # load spacy model
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
+        model = get_model("spacy-de")
 
     # parse dependencies of a pre-tokenized sentencens
-    parser = model.pipeline[0][1]
-    docs = [parser(spacy.tokens.doc.Doc(model.vocab, words=sequence))
-            for sequence in data]
-    adjac = [[(t.i + 1, 0 if t.dep_ == 'ROOT' else t.head.i + 1, t.dep_)
-             for t in doc] for doc in docs]
+    docs = spacy_pipe(model, data, ["parser"], batch_size=batch_size,
+                      n_process=n_process)
 
     # the rest is processed in @deptree_decorator
-    return adjac
+    return _from_spacy(docs)
+
+
+def _from_spacy(docs) -> List[List[tuple]]:
+    """Adjacency lists (node ID, parent ID, relation) of spaCy docs"""
+    return [[(t.i + 1, 0 if t.dep_ == 'ROOT' else t.head.i + 1, t.dep_)
+             for t in doc] for doc in docs]
 
 
 @deptree_decorator
-def stanza_de(data: List[List[str]], model=None
+def stanza_de(data: List[List[str]], model=None,
+              max_tokens: Optional[int] = None,
+              max_tokens_per_call: Optional[int] = None
               ) -> (List[List[int]], List[str]):
     """Dependency relations with stanza for German
 
@@ -195,11 +337,18 @@ def stanza_de(data: List[List[str]], model=None
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.deprel.get_model
 
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
+    max_tokens_per_call : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
     return_mask: bool = False
-        Flag if mask vectors should be returned instead of indices.
+        Flag if a sparse mask matrix should be returned instead of indices.
 
-    VOCAB: Optional[List[hashlib.sha512]] = None
-        A given list of python sha512 objects that are used as ID
+    VOCAB: Optional[list] = None
+        A given list of subtree digests that are used as ID, see
+          `hash_engine`
 
     min_occurrences : int
         (Optional) The required number of occurences in a corpus.
@@ -216,14 +365,21 @@ def stanza_de(data: List[List[str]], model=None
     placeholder: Optional[str] = '\uFFFF'
         see treesimi.shingleset
 
+    hash_engine : str = 'sha512'
+        see nlptasks.deptree.hash_shingles, e.g. 'blake2b-64' is faster
+          and its VOCAB needs less memory
+
     Returns:
     --------
     indices : List[List[int]]
         For each sentences, a list of mask indices.
-        If `return_mask=True` a list of masks is returned.
+        If `return_mask=True` a scipy.sparse.csr_matrix with one binary
+          mask (row) per sentence and one column per VOCAB entry
+          is returned.
 
-    VOCAB: Optional[List[hashlib.sha512]] = None
-        A given list of python sha512 objects that are used as ID
+    VOCAB: Optional[list] = None
+        A given list of subtree digests that are used as ID, see
+          `hash_engine`
 
     Example:
     --------
@@ -236,14 +392,17 @@ def stanza_de(data: List[List[str]], model=None
     """
     # load stanza model
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize,mwt,pos,lemma,depparse',
-            tokenize_pretokenized=True)
+        model = get_model("stanza-de")
 
-    # parse dependencies of a pre-tokenized sentencens
-    docs = model(data)
-    adjac = [[(t.id, t.head, t.deprel) for t in sent.words]
-             for sent in docs.sentences]
+    # parse dependencies of a pre-tokenized sentencens, the rest is
+    # processed in @deptree_decorator
+    return stanza_predict(
+        model, data, max_tokens=max_tokens,
+        max_tokens_per_call=max_tokens_per_call, convert=_from_stanza)
 
-    # the rest is processed in @deptree_decorator
-    return adjac
+
+def _from_stanza(sentences) -> List[List[tuple]]:
+    """Adjacency lists (node ID, parent ID, relation) of stanza
+        sentences"""
+    return [[(t.id, t.head, t.deprel) for t in sent.words]
+            for sent in sentences]
@@ -1,13 +1,12 @@
 from .padding import pad_idseqs
-from typing import List, Optional
-from .vocab import identify_vocab_mincount, texttoken_to_index
-import itertools
+from typing import List, Optional, Union
+from .vocab import Vocab, VocabBuilder
+from . import models
+from .batching import spacy_pipe, stanza_predict, streamable
 import warnings
-import spacy
-import de_core_news_lg as spacy_model
-import stanza
 
 
+@streamable(vocab={'min_occurrences': 20, 'sort': True, 'unk': True})
 def factory(name: str):
     """Factory function to return a processing function for
         lemmatization.
@@ -17,6 +16,14 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'spacy-de', 'stanza-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk. Pass a fixed VOCAB, otherwise the VOCAB is identified in
+          a first pass over the iterable. See nlptasks.batching.streamable
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -40,7 +47,7 @@ def lemma_factory(name: str):
     return factory(name)
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the SBD function
         so that it only needs to be done once
 
@@ -49,6 +56,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         from nlptasks.lemma import lemma
@@ -57,12 +69,12 @@ def get_model(name: str):
         seq, VOCAB = fn(docs, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser", "tagger"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, [])
 
     elif name in ("stanza", "stanza-de"):
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize,lemma',
             tokenize_pretokenized=True)
 
@@ -72,9 +84,11 @@ def get_model(name: str):
 
 @pad_idseqs
 def spacy_de(data: List[List[str]],
-             VOCAB: Optional[List[str]] = None,
+             VOCAB: Optional[Union[List[str], Vocab]] = None,
              min_occurrences: Optional[int] = 20,
-             model=None
+             model=None,
+             batch_size: int = 1000,
+             n_process: int = 1
              ) -> (List[List[str]], List[str]):
     """Lemmatization with spaCy de_core_news_lg for German
 
@@ -83,7 +97,7 @@ def spacy_de(data: List[List[str]],
     data : List[List[str]]
         List of token sequences
 
-    vocab : List[str]
+    VOCAB : List[str] or Vocab
         (Optional) A given list of lemmata wheras list indicies are used as ID
 
     min_occurrences : int
@@ -92,12 +106,30 @@ def spacy_de(data: List[List[str]],
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.lemma.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
+    maxlen : Optional[int] = None
+        see @nlptasks.padding.pad_idseqs
+
+    padding : Optional[str] = 'pre'
+        see @nlptasks.padding.pad_idseqs
+
+    truncating : Optional[str] = 'pre'
+        see @nlptasks.padding.pad_idseqs
+
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
         List of ID sequences wheras an ID relates to a lemma
 
-    vocab : List[str]
+    VOCAB : Vocab
         List of lemmata. Implizit ID:Lemma mappings
 
     Example:
@@ -106,33 +138,30 @@ def spacy_de(data: List[List[str]],
     """
     # (1) load spacy model
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser", "tagger"])
+        model = get_model("spacy-de")
 
     # lemmatize a pre-tokenized sentencens
-    docs = [spacy.tokens.doc.Doc(model.vocab, words=sequence)
-            for sequence in data]
-    lemmata = [[t.lemma_ for t in doc] for doc in docs]
+    docs = spacy_pipe(model, data, [], batch_size=batch_size,
+                      n_process=n_process)
+    return _from_spacy(docs, VOCAB=VOCAB, min_occurrences=min_occurrences)
 
-    # (2) Identify VOCAB
-    if VOCAB is None:
-        VOCAB = identify_vocab_mincount(
-            data=list(itertools.chain.from_iterable(lemmata)),
-            min_occurrences=min_occurrences)
-        VOCAB.append("[UNK]")
-
-    # (3) convert lemmata into IDs
-    lemmata_idx = [texttoken_to_index(seq, VOCAB) for seq in lemmata]
 
-    # done
-    return lemmata_idx, VOCAB
+def _from_spacy(docs,
+                VOCAB: Optional[Union[List[str], Vocab]] = None,
+                min_occurrences: Optional[int] = 20
+                ) -> (List[List[int]], Vocab):
+    """Encode the lemmata of spaCy docs"""
+    lemmata = [[t.lemma_ for t in doc] for doc in docs]
+    return _encode(lemmata, VOCAB=VOCAB, min_occurrences=min_occurrences)
 
 
 @pad_idseqs
 def stanza_de(data: List[List[str]],
-              VOCAB: Optional[List[str]] = None,
+              VOCAB: Optional[Union[List[str], Vocab]] = None,
               min_occurrences: Optional[int] = 20,
-              model=None
+              model=None,
+              max_tokens: Optional[int] = None,
+              max_tokens_per_call: Optional[int] = None
               ) -> (List[List[str]], List[str]):
     """Lemmatization with stanza for German
 
@@ -141,7 +170,7 @@ def stanza_de(data: List[List[str]],
     data : List[List[str]]
         List of token sequences
 
-    VOCAB : List[str]
+    VOCAB : List[str] or Vocab
         (Optional) A given list of lemmata wheras list indicies are used as ID
 
     n_min_occurence : int
@@ -150,6 +179,12 @@ def stanza_de(data: List[List[str]],
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.lemma.get_model
 
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
+    max_tokens_per_call : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_idseqs
 
@@ -159,12 +194,15 @@ def stanza_de(data: List[List[str]],
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_idseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
         List of ID sequences wheras an ID relates to a lemma
 
-    VOCAB : List[str]
+    VOCAB : Vocab
         List of lemmata. Implizit ID:Lemma mappings
 
     Example:
@@ -173,24 +211,43 @@ def stanza_de(data: List[List[str]],
     """
     # (1) load stanza model
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize,lemma',
-            tokenize_pretokenized=True)
+        model = get_model("stanza-de")
 
     # lemmatize a pre-tokenized sentencens
-    docs = model(data)
-    lemmata = [[t.lemma.split("|")[0] for t in sent.words]
-               for sent in docs.sentences]
+    lemmata = stanza_predict(
+        model, data, max_tokens=max_tokens,
+        max_tokens_per_call=max_tokens_per_call, convert=_lemmata_from_stanza)
+    return _encode(lemmata, VOCAB=VOCAB, min_occurrences=min_occurrences)
+
+
+def _from_stanza(sentences,
+                 VOCAB: Optional[Union[List[str], Vocab]] = None,
+                 min_occurrences: Optional[int] = 20
+                 ) -> (List[List[int]], Vocab):
+    """Encode the lemmata of stanza sentences"""
+    return _encode(_lemmata_from_stanza(sentences),
+                   VOCAB=VOCAB, min_occurrences=min_occurrences)
+
+
+def _lemmata_from_stanza(sentences) -> List[List[str]]:
+    """The lemmata of stanza sentences"""
+    return [[t.lemma.split("|")[0] for t in sent.words]
+            for sent in sentences]
+
 
+def _encode(lemmata: List[List[str]],
+            VOCAB: Optional[Union[List[str], Vocab]] = None,
+            min_occurrences: Optional[int] = 20
+            ) -> (List[List[int]], Vocab):
+    """Identify the VOCAB (if not given) and convert lemmata into IDs"""
     # (2) Identify VOCAB
     if VOCAB is None:
-        VOCAB = identify_vocab_mincount(
-            data=list(itertools.chain.from_iterable(lemmata)),
-            min_occurrences=min_occurrences)
-        VOCAB.append("[UNK]")
+        VOCAB = VocabBuilder(min_occurrences).update(lemmata).build()
+    if not isinstance(VOCAB, Vocab):
+        VOCAB = Vocab(VOCAB)
 
     # (3) convert lemmata into IDs
-    lemmata_idx = [texttoken_to_index(seq, VOCAB) for seq in lemmata]
+    lemmata_idx = VOCAB.encode(lemmata)
 
     # done
     return lemmata_idx, VOCAB
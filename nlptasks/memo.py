@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional
+import weakref
+
+
+class LRU(object):
+    """Least recently used cache of the results of single examples
+
+    Parameters:
+    -----------
+    maxsize : int
+        Maximum number of cached examples
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# model -> {task function: LRU}, i.e. results of another model are not used
+_MEMOS = weakref.WeakKeyDictionary()
+
+
+def get_lru(model, name: str, maxsize: int) -> LRU:
+    """The LRU cache of a task function and model instance"""
+    try:
+        memos = _MEMOS.setdefault(model, {})
+    except TypeError:
+        # model is not weak-referenceable, i.e. no reuse across calls
+        return LRU(maxsize)
+    if name not in memos or memos[name].maxsize != maxsize:
+        memos[name] = LRU(maxsize)
+    return memos[name]
+
+
+def map_unique(fn: Callable,
+               data: list,
+               key: Callable = tuple,
+               lru: Optional[LRU] = None) -> list:
+    """Run `fn` only on unique, uncached examples and scatter the results
+
+    Parameters:
+    -----------
+    fn : Callable
+        Function that processes a list of examples and returns one result
+          per example
+
+    data : list
+        Examples, e.g. token sequences or documents
+
+    key : Callable = tuple
+        Converts an example into a hashable key, e.g. `tuple` for token
+          sequences, `str` for documents
+
+    lru : Optional[LRU] = None
+        Cache of results across calls
+
+    Returns:
+    --------
+    list
+        The same as `fn(data)`. Duplicates share the same result object.
+    """
+    keys = [key(example) for example in data]
+    results = {}
+    todo = {}
+    for k, example in zip(keys, data):
+        if k in results or k in todo:
+            continue
+        if lru is not None and k in lru:
+            results[k] = lru.get(k)
+        else:
+            todo[k] = example
+    for k, out in zip(todo.keys(), fn(list(todo.values()))):
+        results[k] = out
+        if lru is not None:
+            lru.misses += 1
+            lru.put(k, out)
+    return [results[k] for k in keys]
+
+
+def memoized(fn: Callable, data: list, model, name: str, memo_size: int,
+             key: Callable = tuple) -> List:
+    """Call `fn(data)`, or deduplicate with a LRU cache if `memo_size > 0`"""
+    if not memo_size:
+        return fn(data)
+    return map_unique(fn, data, key=key,
+                      lru=get_lru(model, name, memo_size))
@@ -3,13 +3,6 @@ import os
 from datetime import datetime
 # for package related info
 import nlptasks
-import de_core_news_lg as spacy_model
-import spacy
-import stanza
-import nltk
-import somajo
-import flair
-import someweta
 
 
 def get(name: str, module: str = None) -> dict:
@@ -23,17 +16,21 @@ def get(name: str, module: str = None) -> dict:
     }
 
     # General Model information
-    if name in ("spacy-de") and module is not None:
-        if module in ("sbd"):
+    if name in ("spacy", "spacy-de") and module is not None:
+        import spacy
+        import de_core_news_lg as spacy_model
+        if module in ("sbd",):
             used_pipes = ['parser']
-        elif module in ("lemma"):
+        elif module in ("token", "lemma"):
             used_pipes = []
-        elif module in ("pos"):  # "pos2"
+        elif module in ("pos", "pos2"):
             used_pipes = ['tagger']
-        elif module in ("ner"):  # "ner2"
+        elif module in ("ner", "ner2"):
             used_pipes = ['ner']
         elif module in ("dephead", "depchild", "deptree"):
             used_pipes = ['parser']
+        else:
+            raise Exception(f"Unknown module '{module}'")
 
         info = {
             'pypi': {
@@ -52,22 +49,28 @@ def get(name: str, module: str = None) -> dict:
             'postproc': postproc
         }
 
-    elif name in ("stanza-de") and module is not None:
-        if module in ("sbd"):
+    elif name in ("stanza", "stanza-de") and module is not None:
+        import stanza
+        if module in ("sbd",):
             specs = {'processors': 'tokenize',
                      'tokenize_no_ssplit': False}
-        elif module in ("lemma"):
+        elif module in ("token",):
+            specs = {'processors': 'tokenize',
+                     'tokenize_no_ssplit': True}
+        elif module in ("lemma",):
             specs = {'processors': 'tokenize,lemma',
                      'tokenize_pretokenized': True}
         elif module in ("pos", "pos2"):
             specs = {'processors': 'tokenize,pos',
                      'tokenize_pretokenized': True}
-        elif module in ("ner"):  # "ner2"
+        elif module in ("ner", "ner2"):
             specs = {'processors': 'tokenize,ner',
                      'tokenize_pretokenized': True}
         elif module in ("dephead", "deptree"):  # "depchild"
             specs = {'processors': 'tokenize,mwt,pos,lemma,depparse',
                      'tokenize_pretokenized': True}
+        else:
+            raise Exception(f"Unknown module '{module}'")
 
         info = {
             'pypi': {
@@ -85,7 +88,8 @@ def get(name: str, module: str = None) -> dict:
             'postproc': postproc
         }
 
-    elif name in ('flair-de') and module in ('pos'):
+    elif name in ('flair-de',) and module in ('pos',):
+        import flair
         info = {
             'pypi': {
                 'name': 'flair',
@@ -102,7 +106,8 @@ def get(name: str, module: str = None) -> dict:
             'postproc': postproc
         }
 
-    elif name in ('flair-multi') and module in ('ner', 'ner2'):
+    elif name in ('flair-multi',) and module in ('ner', 'ner2'):
+        import flair
         info = {
             'pypi': {
                 'name': 'flair',
@@ -119,7 +124,9 @@ def get(name: str, module: str = None) -> dict:
             'postproc': postproc
         }
 
-    elif name in ("spacy-rule-de") and module in ("sbd"):
+    elif name in ("spacy-rule-de",) and module in ("sbd",):
+        import spacy
+        import de_core_news_lg as spacy_model
         info = {
             'pypi': {
                 'name': 'spacy',
@@ -137,7 +144,8 @@ def get(name: str, module: str = None) -> dict:
             'postproc': postproc
         }
 
-    elif name in ("nltk-punkt-de") and module in ("sbd"):
+    elif name in ("nltk-punkt-de",) and module in ("sbd",):
+        import nltk
         filepath = "nltk_data/tokenizers/punkt/PY3/german.pickle"
         filetime = os.path.getmtime(f"{str(Path.home())}/{filepath}")
         info = {
@@ -158,7 +166,8 @@ def get(name: str, module: str = None) -> dict:
             'postproc': postproc
         }
 
-    elif name in ("somajo-de") and module in ("sbd"):
+    elif name in ("somajo-de",) and module in ("sbd",):
+        import somajo
         info = {
             'pypi': {
                 'name': 'SoMaJo',
@@ -168,17 +177,19 @@ def get(name: str, module: str = None) -> dict:
             },
             'model': {
                 'language': 'de_CMC',
-                'split_camel_case': True
+                'split_camel_case': True,
+                'character_offsets': True
             },
             'postproc': postproc
         }
 
-    elif name in ("someweta-de", "someweta-web-de") and module in ("pos"):
-        if name in ("someweta-de"):
+    elif name in ("someweta-de", "someweta-web-de") and module in ("pos",):
+        import someweta
+        if name in ("someweta-de",):
             specs = {'file': ("http://corpora.linguistik.uni-erlangen.de/"
                               "someweta/german_newspaper_2020-05-28.model"),
                      'name': 'german_newspaper', 'modified': '2020-05-28'}
-        elif name in ("someweta-web-de"):
+        elif name in ("someweta-web-de",):
             specs = {
                 'file': ("http://corpora.linguistik.uni-erlangen.de/someweta/"
                          "german_web_social_media_2020-05-28.model"),
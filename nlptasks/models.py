@@ -0,0 +1,185 @@
+from collections import OrderedDict
+from typing import Callable, List, Optional
+import copy
+import gc
+import importlib
+import os
+import threading
+
+
+# loaded models, least recently used first; key -> (model, nbytes)
+_REGISTRY = OrderedDict()
+_LOCK = threading.RLock()
+_MEMORY_BUDGET = {
+    'nbytes': (int(os.environ["NLPTASKS_MODEL_MEMORY"])
+               if os.environ.get("NLPTASKS_MODEL_MEMORY") else None)
+}
+
+
+def _load_spacy(name: str = "de_core_news_lg"):
+    # Load the complete pipeline. The task functions run the pipes they
+    # need, i.e. one instance can be shared by pos, ner, dephead, etc.
+    return importlib.import_module(name).load()
+
+
+def _load_stanza(**kwargs):
+    import stanza
+    return stanza.Pipeline(**kwargs)
+
+
+def _load_flair(name: str):
+    import flair.models
+    return flair.models.SequenceTagger.load(name)
+
+
+def _load_someweta(path: str):
+    import someweta
+    model = someweta.ASPTagger()
+    model.load(path)
+    return model
+
+
+def _load_somajo(language: str = "de_CMC", **kwargs):
+    import somajo
+    return somajo.SoMaJo(language, **kwargs)
+
+
+def _load_nltk_punkt(language: str = "german"):
+    import nltk.data
+    return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+
+
+_LOADERS = {
+    'spacy': _load_spacy,
+    'stanza': _load_stanza,
+    'flair': _load_flair,
+    'someweta': _load_someweta,
+    'somajo': _load_somajo,
+    'nltk-punkt': _load_nltk_punkt,
+}
+
+
+def register(backend: str, loader: Callable):
+    """Add or replace the loader function of a backend
+
+    Parameters:
+    -----------
+    backend : str
+        Identifier of the backend, e.g. 'spacy'
+
+    loader : Callable
+        Function that is called with the keyword arguments of
+          `nlptasks.models.load` and returns the model.
+    """
+    _LOADERS[backend] = loader
+
+
+def _rss() -> Optional[int]:
+    """Resident set size of the process in bytes (Linux only)"""
+    try:
+        with open("/proc/self/statm", "r") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def _evict():
+    budget = _MEMORY_BUDGET['nbytes']
+    if budget is None:
+        return
+    # the most recently used model is always kept
+    while len(_REGISTRY) > 1 and sum(
+            nbytes for _, nbytes in _REGISTRY.values()) > budget:
+        _REGISTRY.popitem(last=False)
+        gc.collect()
+
+
+def load(backend: str, **spec):
+    """Load a model once per process and return the cached instance later
+
+    Parameters:
+    -----------
+    backend : str
+        'spacy', 'stanza', 'flair', 'someweta', 'somajo', 'nltk-punkt'
+
+    **spec
+        Arguments of the backend's loader function, e.g. the stanza
+          processors. Together with `backend` they are the cache key.
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.models
+        model = nt.models.load(
+            "stanza", lang='de', processors='tokenize,pos',
+            tokenize_pretokenized=True)
+    """
+    if backend not in _LOADERS:
+        raise Exception(f"Unknown backend: '{backend}'")
+    key = (backend, tuple(sorted(spec.items())))
+    with _LOCK:
+        if key in _REGISTRY:
+            _REGISTRY.move_to_end(key)
+            return _REGISTRY[key][0]
+        before = _rss()
+        model = _LOADERS[backend](**spec)
+        after = _rss()
+        nbytes = max(after - before, 0) if before and after else 0
+        _REGISTRY[key] = (model, nbytes)
+        _evict()
+        return model
+
+
+def spacy_view(model, pipes: List[str]):
+    """Shallow copy of a loaded spaCy model that only runs some pipes
+
+    The view shares the vocab, tokenizer and pipe components with `model`,
+      i.e. it needs no memory, and `model` is not changed (e.g. by
+      `disable_pipes`) for the other task modules and threads.
+
+    Parameters:
+    -----------
+    model
+        spaCy Language object, e.g. `nlptasks.models.load("spacy")`
+
+    pipes : List[str]
+        The pipes that `view(text)` and `view.pipe(texts)` run, e.g.
+          ['tagger']
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.models
+        model = nt.models.load("spacy", name="de_core_news_lg")
+        tagger = nt.models.spacy_view(model, ['tagger'])
+    """
+    view = copy.copy(model)
+    view.pipeline = [(name, proc) for name, proc in model.pipeline
+                     if name in pipes]
+    return view
+
+
+def set_memory_budget(nbytes: Optional[int] = None):
+    """Evict the least recently used models if the loaded models need
+        more than `nbytes` memory (Default: None, i.e. no limit). The
+        memory of a model is the increase of the process RSS while
+        loading it. The environment variable NLPTASKS_MODEL_MEMORY
+        sets the initial budget.
+    """
+    with _LOCK:
+        _MEMORY_BUDGET['nbytes'] = nbytes
+        _evict()
+
+
+def loaded() -> List[dict]:
+    """Information about the loaded models, least recently used first"""
+    with _LOCK:
+        return [{'backend': backend, 'spec': dict(spec), 'nbytes': nbytes}
+                for (backend, spec), (_, nbytes) in _REGISTRY.items()]
+
+
+def clear():
+    """Remove all models from the registry"""
+    with _LOCK:
+        _REGISTRY.clear()
+        gc.collect()
@@ -1,16 +1,15 @@
 from .padding import pad_idseqs
-from typing import List
-from .vocab import texttoken_to_index
+from typing import List, Optional
+from .vocab import Vocab
+from . import models
+from .batching import spacy_pipe, flair_predict, stanza_predict, streamable
 import warnings
-import de_core_news_lg as spacy_model
-import spacy
-import stanza
-import flair
 
 
 CONLL03_SCHEME = ['PER', 'LOC', 'ORG', 'MISC']
 
 
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         Named Entity Recognition
@@ -20,6 +19,13 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'spacy-de', 'flair-multi', 'stanza-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -45,7 +51,7 @@ def ner_factory(name: str):
     return factory(name)
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the SBD function
         so that it only needs to be done once
 
@@ -54,6 +60,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         from nlptasks.ner import ner
@@ -62,15 +73,15 @@ def get_model(name: str):
         idseqs, SCHEME = fn(docs, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["parser", "tagger"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, ['ner'])
 
     elif name == "flair-multi":
-        return flair.models.SequenceTagger.load('ner-multi')
+        return models.load("flair", name='ner-multi')
 
     elif name in ("stanza", "stanza-de"):
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize,ner',
             tokenize_pretokenized=True)
 
@@ -79,7 +90,8 @@ def get_model(name: str):
 
 
 @pad_idseqs
-def spacy_de(data: List[List[str]], model=None) -> (
+def spacy_de(data: List[List[str]], model=None,
+             batch_size: int = 1000, n_process: int = 1) -> (
         List[List[str]], List[str]):
     """NER with spaCy de_core_news_lg for German with Wikipedia NER Scheme
 
@@ -91,6 +103,24 @@ def spacy_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.ner.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
+    maxlen : Optional[int] = None
+        see @nlptasks.padding.pad_idseqs
+
+    padding : Optional[str] = 'pre'
+        see @nlptasks.padding.pad_idseqs
+
+    truncating : Optional[str] = 'pre'
+        see @nlptasks.padding.pad_idseqs
+
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
@@ -106,28 +136,33 @@ def spacy_de(data: List[List[str]], model=None) -> (
     """
     # (1) load spacy model
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["parser", "tagger"])
+        model = get_model("spacy-de")
 
     # NER recognize a pre-tokenized sentencens
-    ner = model.pipeline[0][1]
-    docs = [ner(spacy.tokens.doc.Doc(model.vocab, words=sequence))
-            for sequence in data]
+    docs = spacy_pipe(model, data, ["ner"], batch_size=batch_size,
+                      n_process=n_process)
+    return _from_spacy(docs)
+
+
+def _from_spacy(docs) -> (List[List[int]], Vocab):
+    """Encode the NE tags of spaCy docs"""
     nertags = [[t.ent_type_ for t in doc] for doc in docs]
 
     # (2) Define the WIKINER tagset as VOCAB
-    SCHEME = CONLL03_SCHEME.copy()
+    SCHEME = Vocab(CONLL03_SCHEME)
     SCHEME.append("[UNK]")
 
     # (3) convert WIKI NER tags to a sequence of IDs
-    nertags_ids = [texttoken_to_index(seq, SCHEME) for seq in nertags]
+    nertags_ids = SCHEME.encode(nertags)
 
     # done
     return nertags_ids, SCHEME
 
 
 @pad_idseqs
-def flair_multi(data: List[List[str]], model=None) -> (
+def flair_multi(data: List[List[str]], model=None,
+                mini_batch_size: int = 32,
+                max_tokens: Optional[int] = None) -> (
         List[List[str]], List[str]):
     """flair 'multi-ner', CoNLL-03 NE scheme, returns ID sequence
         for embeddings.
@@ -140,6 +175,12 @@ def flair_multi(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.ner.get_model
 
+    mini_batch_size : int = 32
+        see nlptasks.batching.flair_predict
+
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.flair_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_idseqs
 
@@ -149,6 +190,9 @@ def flair_multi(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_idseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
@@ -164,30 +208,32 @@ def flair_multi(data: List[List[str]], model=None) -> (
     """
     # (1) load flair model
     if not model:
-        model = flair.models.SequenceTagger.load('ner-multi')
+        model = get_model("flair-multi")
 
     # NER recognize a pre-tokenized sentencens
     nertags = []
-    for sequence in data:
-        seq = flair.data.Sentence(sequence)
-        model.predict(seq)
+    sentences = flair_predict(
+        model, data, mini_batch_size=mini_batch_size, max_tokens=max_tokens)
+    for seq in sentences:
         tags = [t.get_tag("ner").value.split("-") for t in seq.tokens]
         tags = [tag[1] if len(tag) == 2 else "[UNK]" for tag in tags]
         nertags.append(tags)
 
     # (2) Define the CoNLL-03 NER tagset as VOCAB
-    SCHEME = CONLL03_SCHEME.copy()
+    SCHEME = Vocab(CONLL03_SCHEME)
     SCHEME.append("[UNK]")
 
     # (3) convert CoNLL-03 NER tags to a sequence of IDs
-    nertags_ids = [texttoken_to_index(seq, SCHEME) for seq in nertags]
+    nertags_ids = SCHEME.encode(nertags)
 
     # done
     return nertags_ids, SCHEME
 
 
 @pad_idseqs
-def stanza_de(data: List[List[str]], model=None) -> (
+def stanza_de(data: List[List[str]], model=None,
+              max_tokens: Optional[int] = None,
+              max_tokens_per_call: Optional[int] = None) -> (
         List[List[str]], List[str]):
     """NER tagging with stanza NER tagger for German
 
@@ -199,6 +245,12 @@ def stanza_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.ner.get_model
 
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
+    max_tokens_per_call : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_idseqs
 
@@ -208,6 +260,9 @@ def stanza_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_idseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
@@ -223,22 +278,26 @@ def stanza_de(data: List[List[str]], model=None) -> (
     """
     # (1) load stanza model
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize,ner',
-            tokenize_pretokenized=True)
+        model = get_model("stanza-de")
 
     # NER recognize a pre-tokenized sentencens
-    docs = model(data)
+    return stanza_predict(
+        model, data, max_tokens=max_tokens,
+        max_tokens_per_call=max_tokens_per_call, convert=_from_stanza)
+
+
+def _from_stanza(sentences) -> (List[List[int]], Vocab):
+    """Encode the NE tags of stanza sentences"""
     nertags = [[t.ner.split("-") for t in sent.tokens]
-               for sent in docs.sentences]
+               for sent in sentences]
     nertags = [[t[1] if len(t) == 2 else "[UNK]" for t in s] for s in nertags]
 
     # (2) Define the WIKINER tagset as VOCAB
-    SCHEME = CONLL03_SCHEME.copy()
+    SCHEME = Vocab(CONLL03_SCHEME)
     SCHEME.append("[UNK]")
 
     # (3) convert WIKI NER tags to a sequence of IDs
-    nertags_ids = [texttoken_to_index(seq, SCHEME) for seq in nertags]
+    nertags_ids = SCHEME.encode(nertags)
 
     # done
     return nertags_ids, SCHEME
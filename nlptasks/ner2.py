@@ -1,9 +1,21 @@
 from .padding import pad_maskseqs
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import types
 import warnings
-import flair
+from .vocab import Vocab
+from . import models
+from .batching import flair_predict, streamable
 
 
+# CoNLL-03 NE scheme (4 tags) and BIONES chunks
+SCHEME_TAGS = ['PER', 'LOC', 'ORG', 'MISC', 'B', 'I', 'O', 'E', 'S']
+
+# row index of each tag (built once, read-only)
+SCHEME_INDEX = types.MappingProxyType(
+    {tag: i for i, tag in enumerate(SCHEME_TAGS)})
+
+
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         Named Entity Recognition
@@ -13,6 +25,13 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'flair-multi'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -51,13 +70,15 @@ def get_model(name: str):
         maskseqs, seqlens, SCHEME = fn(docs, model=model)
     """
     if name == "flair-multi":
-        return flair.models.SequenceTagger.load('ner-multi')
+        return models.load("flair", name='ner-multi')
     else:
         raise Exception(f"Unknown NER tagger: '{name}'")
 
 
 @pad_maskseqs
-def flair_multi(data: List[List[str]], model=None) -> (
+def flair_multi(data: List[List[str]], model=None,
+                mini_batch_size: int = 32,
+                max_tokens: Optional[int] = None) -> (
         List[List[Tuple[int, int]]], List[int], List[str]):
     """flair 'multi-ner', returns sparse mask sequences of the
         CoNLL-03 NE scheme (4 tags) and BIONES chunks
@@ -70,6 +91,12 @@ def flair_multi(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.ner2.get_model
 
+    mini_batch_size : int = 32
+        see nlptasks.batching.flair_predict
+
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.flair_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_maskseqs
 
@@ -79,6 +106,9 @@ def flair_multi(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_maskseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_maskseqs
+
     Returns:
     --------
     sequences : List[List[Tuple[int, int]]]
@@ -98,24 +128,25 @@ def flair_multi(data: List[List[str]], model=None) -> (
     """
     # (1) load flair model
     if not model:
-        model = flair.models.SequenceTagger.load('ner-multi')
+        model = get_model("flair-multi")
 
     # (2) Define the CoNLL-03 NER tagset as VOCAB
-    SCHEME = ['PER', 'LOC', 'ORG', 'MISC',
-              'B', 'I', 'O', 'E', 'S']
+    SCHEME = Vocab(SCHEME_TAGS)
 
     # (3) NER recognize a pre-tokenized sentencens
     maskseqs = []
     seqlen = []
-    for sequence in data:
-        seq = flair.data.Sentence(sequence)
-        model.predict(seq)
+    sentences = flair_predict(
+        model, data, mini_batch_size=mini_batch_size, max_tokens=max_tokens)
+    for seq in sentences:
         pairs = []
         for i, t in enumerate(seq.tokens):
             for key in t.get_tag("ner").value.split("-"):
-                pairs.append((SCHEME.index(key), i))
+                rowidx = SCHEME_INDEX.get(key)
+                if rowidx is not None:  # skip unknown tags
+                    pairs.append((rowidx, i))
         maskseqs.append(pairs)
-        seqlen.append(len(sequence))
+        seqlen.append(len(seq))
 
     # done
     return maskseqs, seqlen, SCHEME
@@ -1,36 +1,240 @@
-import tensorflow.keras as keras  # pad_sequences
 from pad_sequences import pad_sequences_adjacency
 from pad_sequences import pad_sequences_sparse
+from typing import List, Optional, Tuple
+import numpy as np
+import itertools
+
+
+def get_id_dtype(n_ids: int) -> np.dtype:
+    """Smallest signed integer dtype that can store `n_ids` IDs"""
+    if n_ids <= np.iinfo(np.int16).max:
+        return np.dtype(np.int16)
+    return np.dtype(np.int32)
+
+
+def idseqs_to_ragged(idseqs: List[List[int]],
+                     dtype: Optional[np.dtype] = np.int32
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert ID sequences into a flat values array and an offsets array
+
+    Parameters:
+    -----------
+    idseqs : List[List[int]]
+        List of ID sequences
+
+    dtype : Optional[np.dtype] = np.int32
+        Data type of the values array
+
+    Returns:
+    --------
+    values : np.ndarray
+        All IDs concatenated
+
+    offsets : np.ndarray
+        (N+1) offsets (int64), i.e. the i-th sequence is
+          `values[offsets[i]:offsets[i + 1]]`
+
+    Example:
+    --------
+        values, offsets = idseqs_to_ragged([[1, 2, 3], [4]])
+    """
+    lengths = np.fromiter(
+        (len(seq) for seq in idseqs), dtype=np.int64, count=len(idseqs))
+    offsets = np.zeros(len(idseqs) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.fromiter(
+        itertools.chain.from_iterable(idseqs), dtype=dtype,
+        count=int(offsets[-1]))
+    return values, offsets
+
+
+def maskseqs_to_coo(maskseqs: List[List[Tuple[int, int]]]) -> np.ndarray:
+    """Convert sparse mask sequences into one COO array of the batch
+
+    Parameters:
+    -----------
+    maskseqs : List[List[Tuple[int, int]]]
+        List of sparse mask matrices as (row, col) index pairs
+
+    Returns:
+    --------
+    np.ndarray
+        (3, nnz) int32 array with the sequence index (i.e. batch index),
+          the row index and the column index of each pair.
+
+    Example:
+    --------
+        coo = maskseqs_to_coo([[(1, 0), (3, 1)], [(2, 0)]])
+        # torch.sparse_coo_tensor(coo, torch.ones(coo.shape[1]))
+        # scipy.sparse.coo_matrix((np.ones(nnz), (coo[1], coo[2])))
+    """
+    lengths = np.fromiter(
+        (len(seq) for seq in maskseqs), dtype=np.int64, count=len(maskseqs))
+    nnz = int(lengths.sum())
+    coo = np.empty((3, nnz), dtype=np.int32)
+    coo[0] = np.repeat(np.arange(len(maskseqs), dtype=np.int32), lengths)
+    pairs = np.fromiter(
+        itertools.chain.from_iterable(
+            itertools.chain.from_iterable(maskseqs)),
+        dtype=np.int32, count=2 * nnz)
+    coo[1:] = pairs.reshape(nnz, 2).T
+    return coo
+
+
+def _check_sparse_output(output: str):
+    if output not in ('list', 'coo'):
+        raise Exception(f"Unknown output format: '{output}'")
+
+
+def pad_sequences(sequences: List[List[int]],
+                  maxlen: Optional[int] = None,
+                  dtype: Optional[np.dtype] = np.int32,
+                  padding: Optional[str] = 'pre',
+                  truncating: Optional[str] = 'pre',
+                  value: Optional[int] = 0) -> np.ndarray:
+    """Pad and truncate ID sequences to a numpy array of the same length
+
+    Same behavior as `tensorflow.keras.preprocessing.sequence.pad_sequences`
+      for ID sequences but without the TensorFlow dependency. All sequences
+      are copied in one vectorized assignment.
+
+    Parameters:
+    -----------
+    sequences : List[List[int]]
+        List of ID sequences
+
+    maxlen : Optional[int] = None
+        Length of the padded sequences. If None, the longest sequence
+          length is used.
+
+    dtype : Optional[np.dtype] = np.int32
+        Data type of the returned array
+
+    padding : Optional[str] = 'pre'
+        Add `value` at the beginning ('pre') or end ('post')
+
+    truncating : Optional[str] = 'pre'
+        Remove IDs at the beginning ('pre') or end ('post')
+
+    value : Optional[int] = 0
+        The padding value, e.g. the ID of "[PAD]"
+
+    Returns:
+    --------
+    np.ndarray
+        Array of shape (N, maxlen)
+
+    Example:
+    --------
+        from nlptasks.padding import pad_sequences
+        arr = pad_sequences([[1, 2, 3], [4]], maxlen=2, value=0)
+    """
+    if padding not in ('pre', 'post'):
+        raise Exception(f"Unknown padding: '{padding}'")
+    if truncating not in ('pre', 'post'):
+        raise Exception(f"Unknown truncating: '{truncating}'")
+
+    # flatten all sequences
+    values, offsets = idseqs_to_ragged(sequences, dtype=dtype)
+    lengths = np.diff(offsets)
+    if maxlen is None:
+        maxlen = int(lengths.max()) if len(lengths) else 0
+    out = np.full((len(lengths), maxlen), value, dtype=dtype)
+
+    # number of IDs that are kept per sequence
+    keep = np.minimum(lengths, maxlen)
+    # row index and position of each ID within its sequence
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    pos = np.arange(len(values)) - np.repeat(offsets[:-1], lengths)
+
+    # first kept position, and first column in the output array
+    first = (lengths - keep) if truncating == 'pre' else np.zeros_like(keep)
+    start = (maxlen - keep) if padding == 'pre' else np.zeros_like(keep)
+    shift = np.repeat(start - first, lengths)
+    mask = (pos >= np.repeat(first, lengths)) & (
+        pos < np.repeat(first + keep, lengths))
+
+    out[rows[mask], pos[mask] + shift[mask]] = values[mask]
+    return out
 
 
 def pad_idseqs(func):
+    """Decorator to pad ID sequences and to choose the output format
+
+    Parameters:
+    -----------
+    maxlen : Optional[int] = None
+        Pad or truncate all sequences to this length. "[PAD]" is added to
+          the VOCAB if missing.
+
+    padding : Optional[str] = 'pre'
+        Add "[PAD]" IDs at the beginning ('pre') or end ('post')
+
+    truncating : Optional[str] = 'pre'
+        Remove IDs at the beginning ('pre') or end ('post')
+
+    output : Optional[str] = 'list'
+        - 'list': List[List[int]] (Default)
+        - 'numpy': a padded int16/int32 numpy array (N, maxlen). If maxlen
+            is None, sequences are padded to the longest sequence.
+        - 'ragged': tuple with a flat values array and an offsets array,
+            see nlptasks.padding.idseqs_to_ragged. No padding is applied.
+    """
     def wrapper(*args, **kwargs):
         # read and remove padding settings
         maxlen = kwargs.pop('maxlen', None)
         padding = kwargs.pop('padding', 'pre')
         truncating = kwargs.pop('truncating', 'pre')
+        output = kwargs.pop('output', 'list')
+        if output not in ('list', 'numpy', 'ragged'):
+            raise Exception(f"Unknown output format: '{output}'")
 
         # run the NLP task
         idseqs, VOCAB = func(*args, **kwargs)
 
+        # flat values and offsets array, i.e. truncate but do not pad
+        if output == 'ragged':
+            if maxlen is not None:
+                # note: `seq[-maxlen:]` would keep everything for maxlen=0
+                idseqs = [seq[max(len(seq) - maxlen, 0):]
+                          if truncating == 'pre' else seq[:maxlen]
+                          for seq in idseqs]
+            return idseqs_to_ragged(idseqs, get_id_dtype(len(VOCAB))), VOCAB
+
         # padding and update vocabulary
-        if maxlen is not None:
+        if maxlen is not None or output == 'numpy':
             if "[PAD]" not in VOCAB:
                 VOCAB.append("[PAD]")
-            idseqs = keras.preprocessing.sequence.pad_sequences(
+            idseqs = pad_sequences(
                 idseqs, maxlen=maxlen, value=VOCAB.index("[PAD]"),
-                padding=padding, truncating=truncating).tolist()
+                dtype=get_id_dtype(len(VOCAB)),
+                padding=padding, truncating=truncating)
+            if output == 'list':
+                idseqs = idseqs.tolist()
 
         return idseqs, VOCAB
     return wrapper
 
 
 def pad_adjacmatrix(func):
+    """Decorator to pad adjacency matrices (see pad_sequences_adjacency)
+
+    Parameters:
+    -----------
+    maxlen, padding, truncating
+        see nlptasks.padding.pad_idseqs
+
+    output : Optional[str] = 'list'
+        - 'list': List[List[Tuple[int, int]]] (Default)
+        - 'coo': one (3, nnz) int32 array, see maskseqs_to_coo
+    """
     def wrapper(*args, **kwargs):
         # read and remove padding settings
         maxlen = kwargs.pop('maxlen', None)
         padding = kwargs.pop('padding', 'pre')
         truncating = kwargs.pop('truncating', 'pre')
+        output = kwargs.pop('output', 'list')
+        _check_sparse_output(output)
 
         # run the NLP task
         adjac_matrix, seqs_lens = func(*args, **kwargs)
@@ -41,16 +245,31 @@ def pad_adjacmatrix(func):
                 sequences=adjac_matrix, seqlen=seqs_lens,
                 maxlen=maxlen, padding=padding, truncating=truncating)
 
+        if output == 'coo':
+            adjac_matrix = maskseqs_to_coo(adjac_matrix)
         return adjac_matrix, seqs_lens
     return wrapper
 
 
 def pad_maskseqs(func):
+    """Decorator to pad sparse mask sequences (see pad_sequences_sparse)
+
+    Parameters:
+    -----------
+    maxlen, padding, truncating
+        see nlptasks.padding.pad_idseqs
+
+    output : Optional[str] = 'list'
+        - 'list': List[List[Tuple[int, int]]] (Default)
+        - 'coo': one (3, nnz) int32 array, see maskseqs_to_coo
+    """
     def wrapper(*args, **kwargs):
         # read and remove padding settings
         maxlen = kwargs.pop('maxlen', None)
         padding = kwargs.pop('padding', 'pre')
         truncating = kwargs.pop('truncating', 'pre')
+        output = kwargs.pop('output', 'list')
+        _check_sparse_output(output)
 
         # run the NLP task
         maskseqs, seqs_lens, VOCAB = func(*args, **kwargs)
@@ -61,16 +280,32 @@ def pad_maskseqs(func):
                 sequences=maskseqs, seqlen=seqs_lens,
                 maxlen=maxlen, padding=padding, truncating=truncating)
 
+        if output == 'coo':
+            maskseqs = maskseqs_to_coo(maskseqs)
         return maskseqs, seqs_lens, VOCAB
     return wrapper
 
 
 def pad_merge_adjac_maskseqs(func):
+    """Decorator to pad an adjacency matrix and sparse mask sequences, and
+        to merge both into one sparse mask sequence per example
+
+    Parameters:
+    -----------
+    maxlen, padding, truncating
+        see nlptasks.padding.pad_idseqs
+
+    output : Optional[str] = 'list'
+        - 'list': List[List[Tuple[int, int]]] (Default)
+        - 'coo': one (3, nnz) int32 array, see maskseqs_to_coo
+    """
     def wrapper(*args, **kwargs):
         # read and remove padding settings
         maxlen = kwargs.pop('maxlen', None)
         padding = kwargs.pop('padding', 'pre')
         truncating = kwargs.pop('truncating', 'pre')
+        output = kwargs.pop('output', 'list')
+        _check_sparse_output(output)
 
         # run the NLP task
         adjac, onehot, seqs_lens, n_classes = func(*args, **kwargs)
@@ -89,5 +324,7 @@ def pad_merge_adjac_maskseqs(func):
         maskseqs = [adjac[k] + onehot[k] for k in range(len(adjac))]
 
         # done
+        if output == 'coo':
+            maskseqs = maskseqs_to_coo(maskseqs)
         return maskseqs, seqs_lens
     return wrapper
@@ -0,0 +1,213 @@
+from typing import Dict, Iterable, Optional, Union
+from .batching import concat_outputs, gc_frozen, _fork_safe
+from .padding import pad_idseqs, maskseqs_to_coo
+import functools
+import importlib
+import itertools
+import multiprocessing as mp
+import os
+import warnings
+
+
+# modules that return ID sequences, i.e. padding is applied after merging
+ID_TASKS = ('pos', 'ner', 'lemma')
+
+# modules that return sparse mask sequences, i.e. COO is built after merging
+SPARSE_TASKS = ('pos2', 'ner2', 'dephead', 'depchild')
+
+# modules that identify the VOCAB from the data; default min_occurrences
+VOCAB_TASKS = {'lemma': 20, 'deptree': 1}
+
+# the task function and model of a worker process
+_WORKER = {}
+
+
+def _init_worker(module: str, name: str):
+    mod = importlib.import_module(f"nlptasks.{module}")
+    _WORKER['func'] = mod.factory(name)
+    _WORKER['model'] = mod.get_model(name)
+
+
+def _run_chunk(chunk: list, kwargs: dict, report: bool = False):
+    out = _WORKER['func'](chunk, model=_WORKER['model'], **kwargs)
+    if report:
+        return out, os.getpid(), memory_usage()
+    return out
+
+
+def memory_usage(pid: Union[int, str] = "self"
+                 ) -> Optional[Dict[str, int]]:
+    """RSS, PSS, shared and private memory of a process in bytes
+
+    PSS (proportional set size) divides each shared page by the number of
+      processes that map it, i.e. the PSS of all workers sums up to the
+      actually used memory. Returns None if /proc/<pid>/smaps_rollup is
+      not available (Linux>=4.14 only).
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as fp:
+            lines = fp.readlines()[1:]
+    except OSError:
+        return None
+    kb = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        value = value.split()
+        if len(value) == 2 and value[1] == "kB":
+            kb[key] = int(value[0]) * 1024
+    return {
+        'rss': kb.get('Rss', 0),
+        'pss': kb.get('Pss', 0),
+        'shared': kb.get('Shared_Clean', 0) + kb.get('Shared_Dirty', 0),
+        'private': kb.get('Private_Clean', 0) + kb.get('Private_Dirty', 0)}
+
+
+def _identity(data, model=None):
+    return data
+
+
+def _concat(outputs: list):
+    """Merge the outputs of all chunks"""
+    return concat_outputs(outputs)
+
+
+def run(data: Iterable,
+        module: str,
+        name: str,
+        n_jobs: Optional[int] = None,
+        chunksize: int = 1000,
+        fork_after_load: bool = False,
+        memory_report: Optional[dict] = None,
+        **kwargs):
+    """Run a task function with a pool of worker processes
+
+    Parameters:
+    -----------
+    data : Iterable
+        The input of the task function, i.e. documents or token sequences
+
+    module : str
+        Task module, e.g. 'sbd', 'token', 'pos', 'lemma', 'deptree'
+
+    name : str
+        Identifier of the task function, see `factory(name)` of the module
+
+    n_jobs : Optional[int] = None
+        Number of worker processes (Default: os.cpu_count()). Each worker
+          loads the model once with the module's `get_model(name)`.
+
+    chunksize : int = 1000
+        Number of examples that are sent to a worker at once
+
+    fork_after_load : bool = False
+        Load the model in this process, and fork the workers afterwards,
+          i.e. the workers share the model weights copy-on-write instead
+          of loading one copy each (requires the 'fork' start method,
+          e.g. Linux). Forking a process with running threads (e.g. of
+          torch or nlptasks.serving) can deadlock, i.e. the workers are
+          spawned and load the model themselves in this case.
+
+    memory_report : Optional[dict] = None
+        If a dict is passed, it is filled with the memory usage (see
+          `nlptasks.parallel.memory_usage`) of this process after loading
+          ('parent'), and the peak PSS of each worker after its chunks
+          ('workers', {pid: {...}}).
+
+    **kwargs
+        Arguments of the task function, e.g. maxlen, VOCAB
+
+    Returns:
+    --------
+    The same output as `factory(name)(data, **kwargs)` in the same order.
+      The IDs of `lemma` and `deptree` refer to one VOCAB of all data.
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.parallel
+        docs = ["Die Kuh ist bunt. Die Bäuerin mäht die Wiese."] * 10000
+        sents = nt.parallel.run(docs, 'sbd', 'somajo-de', n_jobs=4)
+        report = {}
+        idseqs, TAGSET = nt.parallel.run(
+            sequences, 'pos', 'spacy-de', n_jobs=8, fork_after_load=True,
+            memory_report=report)
+    """
+    # (1) settings that are applied to the merged outputs
+    fmt = {}
+    if module in ID_TASKS:
+        fmt = {k: kwargs.pop(k) for k in (
+            'maxlen', 'padding', 'truncating', 'output') if k in kwargs}
+    coo = module in SPARSE_TASKS and kwargs.get('output') == 'coo'
+    if coo:
+        kwargs.pop('output')
+    reencode = module in VOCAB_TASKS and kwargs.get('VOCAB') is None
+    if reencode:
+        kwargs.pop('VOCAB', None)
+        min_occurrences = kwargs.pop('min_occurrences', VOCAB_TASKS[module])
+        return_mask = kwargs.pop('return_mask', False)
+        # keep all tokens/subtrees of a chunk
+        kwargs['min_occurrences'] = 1
+
+    # (2) annotate chunks in worker processes (imap preserves the order)
+    iterator = iter(data)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunksize)), [])
+    chunks = itertools.chain([next(chunks, [])], chunks)  # at least one
+    report = memory_report is not None
+    run_chunk = functools.partial(_run_chunk, kwargs=kwargs, report=report)
+    if fork_after_load and not _fork_safe():
+        warnings.warn(
+            "Cannot fork after loading (no 'fork' start method, or other "
+            "threads are running). The workers load the model instead.",
+            RuntimeWarning, stacklevel=2)
+        fork_after_load = False
+    if fork_after_load:
+        # the workers inherit the model (see _WORKER) copy-on-write
+        _init_worker(module, name)
+        if report:
+            memory_report['parent'] = memory_usage()
+        try:
+            with gc_frozen(), mp.get_context("fork").Pool(n_jobs) as pool:
+                outputs = list(pool.imap(run_chunk, chunks))
+        finally:
+            _WORKER.clear()
+    else:
+        if report:
+            memory_report['parent'] = memory_usage()
+        # the workers of a multithreaded process are spawned, not forked
+        ctx = mp if _fork_safe() else mp.get_context("spawn")
+        with ctx.Pool(n_jobs, initializer=_init_worker,
+                      initargs=(module, name)) as pool:
+            outputs = list(pool.imap(run_chunk, chunks))
+
+    if report:
+        workers = {}
+        for _, pid, usage in outputs:
+            if usage and usage['pss'] >= workers.get(pid, {}).get('pss', 0):
+                workers[pid] = usage
+        memory_report['workers'] = workers
+        outputs = [out for out, _, _ in outputs]
+
+    # (3) merge outputs
+    if module == 'sbd' and kwargs.get('return_offsets'):
+        # document index within the chunk -> within all data
+        for k, (_, offsets) in enumerate(outputs):
+            offsets[:, 0] += k * chunksize
+    if reencode:
+        # decode the IDs of each chunk and encode them with one VOCAB
+        tokens = [[VOCAB[i] for i in seq]
+                  for idseqs, VOCAB in outputs for seq in idseqs]
+        mod = importlib.import_module(f"nlptasks.{module}")
+        if module == 'lemma':
+            result = mod._encode(tokens, min_occurrences=min_occurrences)
+        else:
+            result = mod._encode(tokens, min_occurrences=min_occurrences,
+                                 return_mask=return_mask)
+    else:
+        result = _concat(outputs)
+
+    # (4) padding and output format of ID sequences
+    if module in ID_TASKS:
+        result = pad_idseqs(_identity)(result, **fmt)
+    if coo:
+        result = (maskseqs_to_coo(result[0]),) + result[1:]
+    return result
@@ -0,0 +1,172 @@
+from typing import Dict, List, Optional
+import importlib
+import inspect
+from . import models
+from .batching import spacy_pipe, stanza_predict
+from .padding import (
+    pad_idseqs, pad_maskseqs, pad_adjacmatrix, pad_merge_adjac_maskseqs)
+from .deptree import deptree_decorator
+
+
+# task -> (decorator of the task function, spaCy pipes)
+SPACY_TASKS = {
+    'lemma': (pad_idseqs, []),
+    'pos': (pad_idseqs, ['tagger']),
+    'ner': (pad_idseqs, ['ner']),
+    'dephead': (pad_merge_adjac_maskseqs, ['parser']),
+    'depchild': (pad_adjacmatrix, ['parser']),
+    'deptree': (deptree_decorator, ['parser']),
+}
+
+
+# task -> (decorator of the task function, stanza processors)
+STANZA_TASKS = {
+    'lemma': (pad_idseqs, ['tokenize', 'lemma']),
+    'pos': (pad_idseqs, ['tokenize', 'pos']),
+    'pos2': (pad_maskseqs, ['tokenize', 'pos']),
+    'ner': (pad_idseqs, ['tokenize', 'ner']),
+    'dephead': (pad_merge_adjac_maskseqs,
+                ['tokenize', 'mwt', 'pos', 'lemma', 'depparse']),
+    'deptree': (deptree_decorator,
+                ['tokenize', 'mwt', 'pos', 'lemma', 'depparse']),
+}
+
+
+STANZA_PROCESSORS = ['tokenize', 'mwt', 'pos', 'lemma', 'depparse', 'ner']
+
+
+def _identity(data, model=None):
+    return data
+
+
+def get_model(name: str, tasks: List[str]):
+    """Load one model that can run all given tasks
+
+    Parameters:
+    -----------
+    name : str
+        Identifier, e.g. 'spacy-de', 'stanza-de'
+
+    tasks : List[str]
+        Task modules, e.g. ['pos', 'lemma', 'dephead']
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.pipeline
+        tasks = ['pos', 'ner', 'dephead']
+        model = nt.pipeline.get_model('stanza-de', tasks)
+        results = nt.pipeline.run(sequences, tasks, 'stanza-de', model)
+    """
+    if name in ("spacy", "spacy-de"):
+        return models.load("spacy", name="de_core_news_lg")
+
+    elif name in ("stanza", "stanza-de"):
+        needed = set()
+        for task in tasks:
+            needed.update(STANZA_TASKS[task][1])
+        return models.load(
+            "stanza",
+            lang='de',
+            processors=",".join(p for p in STANZA_PROCESSORS if p in needed),
+            tokenize_pretokenized=True)
+
+    else:
+        raise Exception(f"Unknown pipeline: '{name}'")
+
+
+def run(data: List[List[str]],
+        tasks: List[str],
+        name: str = "spacy-de",
+        model=None,
+        options: Optional[Dict[str, dict]] = None,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        max_tokens: Optional[int] = None) -> Dict[str, tuple]:
+    """Run several NLP tasks with one pass of a parser
+
+    Parameters:
+    -----------
+    data : List[List[str]]
+        List of token sequences
+
+    tasks : List[str]
+        Task modules, i.e. 'lemma', 'pos', 'ner', 'dephead', 'depchild',
+          'deptree' for 'spacy-de', and 'lemma', 'pos', 'pos2', 'ner',
+          'dephead', 'deptree' for 'stanza-de'.
+
+    name : str
+        Identifier, e.g. 'spacy-de', 'stanza-de'
+
+    model (Default: None)
+        Preloaded instance of the NLP model. See nlptasks.pipeline.get_model
+
+    options : Optional[Dict[str, dict]] = None
+        Keyword arguments for each task, e.g. {'pos': {'maxlen': 16},
+          'lemma': {'min_occurrences': 1}}
+
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe (only 'spacy-de')
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe (only 'spacy-de')
+
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.stanza_predict (only 'stanza-de')
+
+    Returns:
+    --------
+    Dict[str, tuple]
+        The outputs of each task in the same format as the task function,
+          e.g. results['pos'] is the same as nt.pos.factory(name)(data)
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.pipeline
+        sequences = [['Die', 'Kuh', 'ist', 'bunt', '.']]
+        results = nt.pipeline.run(sequences, ['pos', 'lemma', 'dephead'])
+        idseqs, TAGSET = results['pos']
+        idseqs, VOCAB = results['lemma']
+        maskseqs, seqlens = results['dephead']
+    """
+    options = options or {}
+    if name in ("spacy", "spacy-de"):
+        table, converter_name = SPACY_TASKS, "_from_spacy"
+    elif name in ("stanza", "stanza-de"):
+        table, converter_name = STANZA_TASKS, "_from_stanza"
+    else:
+        raise Exception(f"Unknown pipeline: '{name}'")
+    for task in tasks:
+        if task not in table:
+            raise Exception(f"Task '{task}' is not available for '{name}'")
+
+    # (1) run the parser once with all needed pipes/processors
+    if not model:
+        model = get_model(name, tasks)
+
+    if table is SPACY_TASKS:
+        needed = set()
+        for task in tasks:
+            needed.update(table[task][1])
+        annotated = spacy_pipe(model, data, list(needed),
+                               batch_size=batch_size, n_process=n_process)
+    else:
+        annotated = stanza_predict(model, data, max_tokens=max_tokens)
+
+    # (2) convert the annotations into each task's output format
+    results = {}
+    for task in tasks:
+        decorator = table[task][0]
+        module = importlib.import_module(f"nlptasks.{task}")
+        converter = getattr(module, converter_name)
+        # e.g. VOCAB for lemma belongs to the converter, maxlen etc.
+        # are processed by the decorator
+        kwargs = dict(options.get(task, {}))
+        params = inspect.signature(converter).parameters
+        convkw = {k: kwargs.pop(k) for k in list(kwargs) if k in params}
+        raw = converter(annotated, **convkw)
+        results[task] = decorator(_identity)(raw, **kwargs)
+
+    # done
+    return results
@@ -1,12 +1,11 @@
 from .padding import pad_idseqs
-from typing import List
+from typing import List, Optional
 import warnings
-from .vocab import texttoken_to_index
-import de_core_news_lg as spacy_model
-import spacy
-import stanza
-import flair
-import someweta
+from .vocab import Vocab
+from . import models
+from .memo import memoized
+from .batching import (
+    spacy_pipe, flair_predict, fork_map, stanza_predict, streamable)
 from pathlib import Path
 
 
@@ -27,6 +26,7 @@ STTS_IBK = TIGER_TAGSET + [
 ]
 
 
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         Part of Speech tagging.
@@ -37,6 +37,13 @@ def factory(name: str):
         Identifier, e.g. 'spacy-de', 'stanza-de', 'flair-de', 'someweta-de',
           'someweta-web-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -66,7 +73,7 @@ def pos_factory(name: str):
     return factory(name)
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the SBD function
         so that it only needs to be done once
 
@@ -75,6 +82,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         from nlptasks.ner import pos
@@ -83,35 +95,36 @@ def get_model(name: str):
         idseqs, TAGSET = fn(docs, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, ['tagger'])
 
     elif name in ("stanza", "stanza-de"):
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize,pos',
             tokenize_pretokenized=True)
 
     elif name == "flair-de":
-        return flair.models.SequenceTagger.load('de-pos')
+        return models.load("flair", name='de-pos')
 
     elif name in ("someweta", "someweta-de"):
-        model = someweta.ASPTagger()
-        model.load(f"{str(Path.home())}/someweta_data/german_newspaper.model")
-        return model
+        return models.load(
+            "someweta",
+            path=f"{str(Path.home())}/someweta_data/german_newspaper.model")
 
     elif name in ("someweta-web", "someweta-web-de"):
-        model = someweta.ASPTagger()
-        model.load(
-            f"{str(Path.home())}/someweta_data/german_web_social_media.model")
-        return model
+        return models.load(
+            "someweta",
+            path=(f"{str(Path.home())}/someweta_data/"
+                  "german_web_social_media.model"))
 
     else:
         raise Exception(f"Unknown PoS tagger: '{name}'")
 
 
 @pad_idseqs
-def spacy_de(data: List[List[str]], model=None) -> (
+def spacy_de(data: List[List[str]], model=None,
+             batch_size: int = 1000, n_process: int = 1) -> (
         List[List[str]], List[str]):
     """PoS-Tagging with spaCy de_core_news_lg for German
 
@@ -123,6 +136,12 @@ def spacy_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.pos.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_idseqs
 
@@ -132,6 +151,9 @@ def spacy_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_idseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
@@ -147,28 +169,33 @@ def spacy_de(data: List[List[str]], model=None) -> (
     """
     # (1) load spacy model
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser"])
+        model = get_model("spacy-de")
 
     # pos-tag a pre-tokenized sentencens
-    tagger = model.pipeline[0][1]
-    docs = [tagger(spacy.tokens.doc.Doc(model.vocab, words=sequence))
-            for sequence in data]
+    docs = spacy_pipe(model, data, ["tagger"], batch_size=batch_size,
+                      n_process=n_process)
+    return _from_spacy(docs)
+
+
+def _from_spacy(docs) -> (List[List[int]], Vocab):
+    """Encode the PoS tags of tagged spaCy docs"""
     postags = [[t.tag_ for t in doc] for doc in docs]
 
     # (2) Define the TIGER tagset as VOCAB
-    TAGSET = TIGER_TAGSET.copy()
+    TAGSET = Vocab(TIGER_TAGSET)
     TAGSET.append("[UNK]")
 
     # (3) convert lemmata into IDs
-    postags_ids = [texttoken_to_index(seq, TAGSET) for seq in postags]
+    postags_ids = TAGSET.encode(postags)
 
     # done
     return postags_ids, TAGSET
 
 
 @pad_idseqs
-def stanza_de(data: List[List[str]], model=None) -> (
+def stanza_de(data: List[List[str]], model=None,
+              max_tokens: Optional[int] = None,
+              max_tokens_per_call: Optional[int] = None) -> (
         List[List[str]], List[str]):
     """PoS-Tagging with stanza PoS tagger for German
 
@@ -180,6 +207,12 @@ def stanza_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.pos.get_model
 
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
+    max_tokens_per_call : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_idseqs
 
@@ -189,6 +222,9 @@ def stanza_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_idseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
@@ -204,27 +240,33 @@ def stanza_de(data: List[List[str]], model=None) -> (
     """
     # (1) load stanza model
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize,pos',
-            tokenize_pretokenized=True)
+        model = get_model("stanza-de")
 
     # pos-tag a pre-tokenized sentencens
-    docs = model(data)
-    postags = [[t.xpos for t in sent.words] for sent in docs.sentences]
+    return stanza_predict(
+        model, data, max_tokens=max_tokens,
+        max_tokens_per_call=max_tokens_per_call, convert=_from_stanza)
+
+
+def _from_stanza(sentences) -> (List[List[int]], Vocab):
+    """Encode the XPOS tags of tagged stanza sentences"""
+    postags = [[t.xpos for t in sent.words] for sent in sentences]
 
     # (2) Define the TIGER tagset as VOCAB
-    TAGSET = TIGER_TAGSET.copy()
+    TAGSET = Vocab(TIGER_TAGSET)
     TAGSET.append("[UNK]")
 
     # (3) convert lemmata into IDs
-    postags_ids = [texttoken_to_index(seq, TAGSET) for seq in postags]
+    postags_ids = TAGSET.encode(postags)
 
     # done
     return postags_ids, TAGSET
 
 
 @pad_idseqs
-def flair_de(data: List[List[str]], model=None) -> (
+def flair_de(data: List[List[str]], model=None,
+             mini_batch_size: int = 32,
+             max_tokens: Optional[int] = None) -> (
         List[List[str]], List[str]):
     """PoS-Tagging with flair for German
 
@@ -236,6 +278,12 @@ def flair_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.pos.get_model
 
+    mini_batch_size : int = 32
+        see nlptasks.batching.flair_predict
+
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.flair_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_idseqs
 
@@ -245,6 +293,9 @@ def flair_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_idseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_idseqs
+
     Returns:
     --------
     sequences : List[List[int]]
@@ -260,83 +311,106 @@ def flair_de(data: List[List[str]], model=None) -> (
     """
     # (1) load flair model
     if not model:
-        model = flair.models.SequenceTagger.load('de-pos')
+        model = get_model("flair-de")
 
     # PoS-tag recognize a pre-tokenized sentencens
-    postags = []
-    for sequence in data:
-        seq = flair.data.Sentence(sequence)
-        model.predict(seq)
-        tags = [t.get_tag("pos").value for t in seq.tokens]
-        postags.append(tags)
+    sentences = flair_predict(
+        model, data, mini_batch_size=mini_batch_size, max_tokens=max_tokens)
+    postags = [[t.get_tag("pos").value for t in seq.tokens]
+               for seq in sentences]
 
     # (2) Define the TIGER tagset as VOCAB
-    TAGSET = TIGER_TAGSET.copy()
+    TAGSET = Vocab(TIGER_TAGSET)
     TAGSET.append("[UNK]")
 
     # (3) convert lemmata into IDs
-    postags_ids = [texttoken_to_index(seq, TAGSET) for seq in postags]
+    postags_ids = TAGSET.encode(postags)
 
     # done
     return postags_ids, TAGSET
 
 
 @pad_idseqs
-def someweta_de(data: List[List[str]], model=None) -> (
+def someweta_de(data: List[List[str]], model=None,
+                memo_size: int = 0, n_jobs: int = 1) -> (
         List[List[str]], List[str]):
     """
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.pos.get_model
+
+    memo_size : int = 0
+        Tag duplicate sequences once, and remember the tags of up to
+          `memo_size` sequences across calls (see nlptasks.memo).
+          Disabled by default.
+
+    n_jobs : int = 1
+        Number of forked processes that tag chunks of `data`. The loaded
+          model is shared copy-on-write. See nlptasks.batching.fork_map
     """
     # (1) load model
     if not model:
-        model = someweta.ASPTagger()
-        model.load(f"{str(Path.home())}/someweta_data/german_newspaper.model")
+        model = get_model("someweta-de")
 
     # PoS-tag recognize a pre-tokenized sentencens
-    postags = []
-    for sequence in data:
-        seq = model.tag_sentence(sequence)
-        tags = [tag for _, tag in seq]
-        postags.append(tags)
+    def tag_sentences(sequences):
+        return [[tag for _, tag in model.tag_sentence(sequence)]
+                for sequence in sequences]
+
+    def tag_parallel(sequences):
+        return fork_map(tag_sentences, sequences, n_jobs=n_jobs)
+
+    postags = memoized(
+        tag_parallel, data, model, "pos.someweta_de", memo_size)
 
     # (2) Define the TIGER tagset as VOCAB
-    TAGSET = TIGER_TAGSET.copy()
+    TAGSET = Vocab(TIGER_TAGSET)
     TAGSET.append("[UNK]")
 
     # (3) convert lemmata into IDs
-    postags_ids = [texttoken_to_index(seq, TAGSET) for seq in postags]
+    postags_ids = TAGSET.encode(postags)
 
     # done
     return postags_ids, TAGSET
 
 
 @pad_idseqs
-def someweta_web_de(data: List[List[str]], model=None) -> (
+def someweta_web_de(data: List[List[str]], model=None,
+                    memo_size: int = 0, n_jobs: int = 1) -> (
         List[List[str]], List[str]):
     """
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.pos.get_model
+
+    memo_size : int = 0
+        Tag duplicate sequences once, and remember the tags of up to
+          `memo_size` sequences across calls (see nlptasks.memo).
+          Disabled by default.
+
+    n_jobs : int = 1
+        Number of forked processes that tag chunks of `data`. The loaded
+          model is shared copy-on-write. See nlptasks.batching.fork_map
     """
     # (1) load model
     if not model:
-        model = someweta.ASPTagger()
-        model.load(
-            f"{str(Path.home())}/someweta_data/german_web_social_media.model")
+        model = get_model("someweta-web-de")
 
     # PoS-tag recognize a pre-tokenized sentencens
-    postags = []
-    for sequence in data:
-        seq = model.tag_sentence(sequence)
-        tags = [tag for _, tag in seq]
-        postags.append(tags)
+    def tag_sentences(sequences):
+        return [[tag for _, tag in model.tag_sentence(sequence)]
+                for sequence in sequences]
+
+    def tag_parallel(sequences):
+        return fork_map(tag_sentences, sequences, n_jobs=n_jobs)
+
+    postags = memoized(
+        tag_parallel, data, model, "pos.someweta_web_de", memo_size)
 
     # (2) Define the TIGER tagset as VOCAB
-    TAGSET = STTS_IBK.copy()
+    TAGSET = Vocab(STTS_IBK)
     TAGSET.append("[UNK]")
 
     # (3) convert lemmata into IDs
-    postags_ids = [texttoken_to_index(seq, TAGSET) for seq in postags]
+    postags_ids = TAGSET.encode(postags)
 
     # done
     return postags_ids, TAGSET
@@ -1,7 +1,11 @@
 from .padding import pad_maskseqs
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import functools
+import types
 import warnings
-import stanza
+from .vocab import Vocab
+from . import models
+from .batching import stanza_predict, streamable
 
 
 # UPOS v2, https://universaldependencies.org/u/pos/
@@ -57,6 +61,32 @@ UD2_FEATS = [
 ]
 
 
+# row index of each UPOS tag and UD feature (built once, read-only)
+SCHEME_INDEX = types.MappingProxyType(
+    {tag: i for i, tag in enumerate(UPOS_TAGSET + UD2_FEATS)})
+
+
+@functools.lru_cache(maxsize=65536)
+def feats_to_rowidx(feats: str) -> Tuple[int, ...]:
+    """Row indices of a UD feature string, e.g. 'Case=Nom|Number=Sing'
+
+    Multiple values (e.g. 'Gender=Fem,Masc') are split. Unknown features
+      are skipped.
+    """
+    rowidx = []
+    for tag in feats.split("|"):
+        if tag in SCHEME_INDEX:
+            rowidx.append(SCHEME_INDEX[tag])
+        else:
+            key, _, values = tag.partition("=")
+            for value in values.split(","):
+                i = SCHEME_INDEX.get(f"{key}={value}")
+                if i is not None:
+                    rowidx.append(i)
+    return tuple(rowidx)
+
+
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         Part of Speech tagging.
@@ -66,6 +96,13 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'spacy-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -104,7 +141,8 @@ def get_model(name: str):
         maskseq, seqlen, SCHEME = fn(docs, model=model)
     """
     if name == "stanza-de":
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize,pos',
             tokenize_pretokenized=True)
 
@@ -113,7 +151,9 @@ def get_model(name: str):
 
 
 @pad_maskseqs
-def stanza_de(data: List[List[str]], model=None) -> (
+def stanza_de(data: List[List[str]], model=None,
+              max_tokens: Optional[int] = None,
+              max_tokens_per_call: Optional[int] = None) -> (
         List[List[Tuple[int, int]]], List[int], List[str]):
     """PoS-tagging with stanza for German, returns sparse matrix
         sequences of the UPOS scheme and UD features (UD v2).
@@ -126,6 +166,12 @@ def stanza_de(data: List[List[str]], model=None) -> (
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.pos2.get_model
 
+    max_tokens : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
+    max_tokens_per_call : Optional[int] = None
+        see nlptasks.batching.stanza_predict
+
     maxlen : Optional[int] = None
         see @nlptasks.padding.pad_maskseqs
 
@@ -135,6 +181,9 @@ def stanza_de(data: List[List[str]], model=None) -> (
     truncating : Optional[str] = 'pre'
         see @nlptasks.padding.pad_maskseqs
 
+    output : Optional[str] = 'list'
+        see @nlptasks.padding.pad_maskseqs
+
     Returns:
     --------
     sequences : List[List[Tuple[int, int]]]
@@ -154,30 +203,34 @@ def stanza_de(data: List[List[str]], model=None) -> (
     """
     # (1) load stanza model
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize,pos',
-            tokenize_pretokenized=True)
+        model = get_model("stanza-de")
 
     # tag all sequences
-    docs = model(data)
+    return stanza_predict(
+        model, data, max_tokens=max_tokens,
+        max_tokens_per_call=max_tokens_per_call, convert=_from_stanza)
+
 
+def _from_stanza(sentences) -> (
+        List[List[Tuple[int, int]]], List[int], Vocab):
+    """Encode UPOS tags and UD features of tagged stanza sentences"""
     # (2) Define the VOCAB/SCHEME
-    SCHEME = UPOS_TAGSET.copy() + UD2_FEATS.copy()
+    SCHEME = Vocab(UPOS_TAGSET + UD2_FEATS)
 
-    # (3) Lookup all UPOS and UD feats
+    # (3) Lookup all UPOS and UD feats (unknown tags are skipped)
     maskseqs = []
     seqlen = []
-    for sent in docs.sentences:
+    for sent in sentences:
         pairs = []
         for colidx, t in enumerate(sent.words):
             # lookup UPOS
-            rowidx = SCHEME.index(t.upos)
-            pairs.append((rowidx, colidx))
-            # loop over all features
+            rowidx = SCHEME_INDEX.get(t.upos)
+            if rowidx is not None:
+                pairs.append((rowidx, colidx))
+            # lookup all features
             if t.feats:
-                for tag in t.feats.split("|"):
-                    rowidx = SCHEME.index(tag)
-                    pairs.append((rowidx, colidx))
+                pairs.extend(
+                    (rowidx, colidx) for rowidx in feats_to_rowidx(t.feats))
         maskseqs.append(pairs)
         seqlen.append(len(sent.words))
 
@@ -1,12 +1,12 @@
-from typing import List
+from typing import List, Tuple
+import numpy as np
 import warnings
-import de_core_news_lg as spacy_model
-import spacy
-import stanza
-import nltk
-import somajo
+from . import models
+from .memo import memoized
+from .batching import spacy_pipe, streamable
 
 
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         Sentence Boundary Disambiguation
@@ -17,6 +17,13 @@ def factory(name: str):
         Identifier, e.g. 'spacy-de', 'spacy-rule-de', 'stanza-de',
           'nltk-punkt-de', 'somajo-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -46,7 +53,7 @@ def sbd_factory(name: str):
     return factory(name)
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the SBD function
         so that it only needs to be done once
 
@@ -55,6 +62,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         from nlptasks.sbd import sbd
@@ -64,32 +76,39 @@ def get_model(name: str):
         sentences = sbd_fn(docs, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, ['parser'])
 
     elif name in ("spacy_rule", "spacy-rule-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser", "tagger"])
-        model.add_pipe(model.create_pipe('sentencizer'))
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        if shared:
+            return model
+        view = models.spacy_view(model, [])
+        view.pipeline.append(
+            ("sentencizer", view.create_pipe("sentencizer")))
+        return view
 
     elif name in ("stanza", "stanza-de"):
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize',
             tokenize_no_ssplit=False)
 
     elif name in ("nltk_punkt", "nltk-punkt-de"):
-        return None
+        return models.load("nltk-punkt", language="german")
 
     elif name in ("somajo", "somajo-de"):
-        return somajo.SoMaJo("de_CMC", split_camel_case=True)
+        return models.load(
+            "somajo", language="de_CMC", split_camel_case=True,
+            character_offsets=True)
 
     else:
         raise Exception(f"Unknown SBD function: '{name}'")
 
 
-def spacy_de(data: List[str], model=None) -> List[str]:
+def spacy_de(data: List[str], model=None,
+             batch_size: int = 1000, n_process: int = 1,
+             return_offsets: bool = False) -> List[str]:
     """SBD with spaCy de_core_news_lg based on DependencyParser
 
     Parameters:
@@ -101,12 +120,26 @@ def spacy_de(data: List[str], model=None) -> List[str]:
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.sbd.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
+    return_offsets : bool = False
+        Return also the offsets of the sentences in `data`, e.g. the
+          sentence `data[d][start:end]` for the row `(d, start, end)`
+
     Returns:
     --------
     List[str]
         list of M sentences as strings. Pls note that the information
           about the relationship to the document is lost.
 
+    offsets : np.ndarray
+        (M, 3) array with the document index, start and end character of
+          each sentence (only if `return_offsets=True`)
+
     Example:
     --------
         import nlptasks as nt
@@ -116,17 +149,19 @@ def spacy_de(data: List[str], model=None) -> List[str]:
     """
     # load spacy
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "tagger"])
-    # SBD
-    sentences = []
-    for rawstr in data:
-        sentences.extend([s.text for s in model(rawstr).sents])
+        model = get_model("spacy-de")
+    # SBD with the dependency parser
+    docs = spacy_pipe(model, data, ["parser"], batch_size=batch_size,
+                      n_process=n_process, pretokenized=False)
+    spans = [(s.text, d, s.start_char, s.end_char)
+             for d, doc in enumerate(docs) for s in doc.sents]
     # done
-    return sentences
+    return _output(spans, return_offsets)
 
 
-def spacy_rule_de(data: List[str], model=None) -> List[str]:
+def spacy_rule_de(data: List[str], model=None,
+                  batch_size: int = 1000, n_process: int = 1,
+                  return_offsets: bool = False) -> List[str]:
     """Rule-based SBD with spaCy Sentencizer
 
     Parameters:
@@ -138,12 +173,26 @@ def spacy_rule_de(data: List[str], model=None) -> List[str]:
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.sbd.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
+    return_offsets : bool = False
+        Return also the offsets of the sentences in `data`, e.g. the
+          sentence `data[d][start:end]` for the row `(d, start, end)`
+
     Returns:
     --------
     List[str]
         list of M sentences as strings. Pls note that the information
           about the relationship to the document is lost.
 
+    offsets : np.ndarray
+        (M, 3) array with the document index, start and end character of
+          each sentence (only if `return_offsets=True`)
+
     Example:
     --------
         import nlptasks as nt
@@ -153,18 +202,24 @@ def spacy_rule_de(data: List[str], model=None) -> List[str]:
     """
     # load spacy
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser", "tagger"])
-        model.add_pipe(model.create_pipe('sentencizer'))
-    # SBD
-    sentences = []
-    for rawstr in data:
-        sentences.extend([s.text for s in model(rawstr).sents])
+        model = get_model("spacy-rule-de")
+    # SBD with the rule-based sentencizer
+    if "sentencizer" in model.pipe_names:
+        sentencizer = model.get_pipe("sentencizer")
+    else:
+        sentencizer = model.create_pipe("sentencizer")
+    docs = spacy_pipe(model, data, [], batch_size=batch_size,
+                      n_process=n_process, pretokenized=False)
+    spans = [(s.text, d, s.start_char, s.end_char)
+             for d, doc in enumerate(
+                 sentencizer.pipe(docs, batch_size=batch_size))
+             for s in doc.sents]
     # done
-    return sentences
+    return _output(spans, return_offsets)
 
 
-def stanza_de(data: List[str], model=None) -> List[str]:
+def stanza_de(data: List[str], model=None,
+              return_offsets: bool = False) -> List[str]:
     """Sentence Segmentation (SBD) with stanza for German
 
     Parameters:
@@ -176,12 +231,20 @@ def stanza_de(data: List[str], model=None) -> List[str]:
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.sbd.get_model
 
+    return_offsets : bool = False
+        Return also the offsets of the sentences in `data`, e.g. the
+          sentence `data[d][start:end]` for the row `(d, start, end)`
+
     Returns:
     --------
     List[str]
         list of M sentences as strings. Pls note that the information
           about the relationship to the document is lost.
 
+    offsets : np.ndarray
+        (M, 3) array with the document index, start and end character of
+          each sentence (only if `return_offsets=True`)
+
     Example:
     --------
         import nlptasks as nt
@@ -191,18 +254,17 @@ def stanza_de(data: List[str], model=None) -> List[str]:
     """
     # load stanza
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize',
-            tokenize_no_ssplit=False)
+        model = get_model("stanza-de")
     # SBD
-    sentences = []
-    for rawstr in data:
-        sentences.extend([s.text for s in model(rawstr).sentences])
+    spans = [(s.text, d, s.tokens[0].start_char, s.tokens[-1].end_char)
+             for d, rawstr in enumerate(data)
+             for s in model(rawstr).sentences]
     # done
-    return sentences
+    return _output(spans, return_offsets)
 
 
-def nltk_punkt_de(data: List[str], model=None) -> List[str]:
+def nltk_punkt_de(data: List[str], model=None,
+                  return_offsets: bool = False) -> List[str]:
     """Sentence Segmentation (SBD) with NLTK's Punct Tokenizer
 
     Parameters:
@@ -214,12 +276,20 @@ def nltk_punkt_de(data: List[str], model=None) -> List[str]:
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.sbd.get_model
 
+    return_offsets : bool = False
+        Return also the offsets of the sentences in `data`, e.g. the
+          sentence `data[d][start:end]` for the row `(d, start, end)`
+
     Returns:
     --------
     List[str]
         list of M sentences as strings. Pls note that the information
           about the relationship to the document is lost.
 
+    offsets : np.ndarray
+        (M, 3) array with the document index, start and end character of
+          each sentence (only if `return_offsets=True`)
+
     Example:
     --------
         import nlptasks as nt
@@ -231,16 +301,21 @@ def nltk_punkt_de(data: List[str], model=None) -> List[str]:
     -----
     - https://www.nltk.org/api/nltk.tokenize.html#module-nltk.tokenize.punkt
     """
-    # SBD
-    sentences = []
-    for rawstr in data:
-        sents = nltk.tokenize.sent_tokenize(rawstr, language="german")
-        sentences.extend(sents)
+    # load the PunktSentenceTokenizer
+    if not model:
+        model = get_model("nltk-punkt-de")
+    # SBD (the same as nltk.tokenize.sent_tokenize but with offsets)
+    spans = [(rawstr[start:end], d, start, end)
+             for d, rawstr in enumerate(data)
+             for start, end in model.span_tokenize(rawstr)]
     # done
-    return sentences
+    return _output(spans, return_offsets)
 
 
-def somajo_de(data: List[str], model=None) -> List[str]:
+def somajo_de(data: List[str], model=None,
+              memo_size: int = 0,
+              return_offsets: bool = False,
+              slicing: bool = False) -> List[str]:
     """Sentence Segmentation (SBD) with SoMaJo, German
 
     Parameters:
@@ -252,12 +327,29 @@ def somajo_de(data: List[str], model=None) -> List[str]:
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.sbd.get_model
 
+    memo_size : int = 0
+        Segment duplicate documents once, and remember the sentences of up
+          to `memo_size` documents across calls (see nlptasks.memo).
+          Disabled by default.
+
+    return_offsets : bool = False
+        Return also the offsets of the sentences in `data`, e.g. the
+          sentence `data[d][start:end]` for the row `(d, start, end)`
+
+    slicing : bool = False
+        Slice the sentences out of the documents (i.e. keep the original
+          whitespace) instead of joining the tokens.
+
     Returns:
     --------
     List[str]
         list of M sentences as strings. Pls note that the information
           about the relationship to the document is lost.
 
+    offsets : np.ndarray
+        (M, 3) array with the document index, start and end character of
+          each sentence (only if `return_offsets=True`)
+
     Example:
     --------
         import nlptasks as nt
@@ -267,15 +359,58 @@ def somajo_de(data: List[str], model=None) -> List[str]:
     """
     # instantiate
     if not model:
-        model = somajo.SoMaJo("de_CMC", split_camel_case=True)
-    # segment all docs (returns a generator)
-    sentsgen = model.tokenize_text(data)
-    # loop over all sentences to reconstruct the sentence
+        model = get_model("somajo-de")
+    # segment each document (duplicates once if memo_size > 0)
+    sentences = memoized(
+        lambda docs: [_somajo_sentences(model, doc, slicing) for doc in docs],
+        data, model, f"sbd.somajo_de:{slicing}", memo_size, key=str)
+    spans = [(s, d, start, end)
+             for d, sents in enumerate(sentences)
+             for s, start, end in sents]
+    # done
+    return _output(spans, return_offsets)
+
+
+def _somajo_sentences(model, doc: str, slicing: bool = False
+                      ) -> List[Tuple[str, int, int]]:
+    """Segment one document and find the sentences' character offsets"""
     sentences = []
-    for sent in sentsgen:
-        s = "".join([
-            ("" if token.token_class == "symbol" else " ") + token.text
-            for token in sent]).strip()
-        sentences.append(s)
+    cursor = 0
+    for sent in model.tokenize_text([doc]):
+        first, last = sent[0], sent[-1]
+        if getattr(first, "character_offset", None) is not None:
+            # SoMaJo(..., character_offsets=True), see get_model
+            start, end = first.character_offset[0], last.character_offset[1]
+        else:
+            # e.g. a preloaded model without character offsets: advance
+            # the cursor token by token
+            start = None
+            for token in sent:
+                text = token.original_spelling or token.text
+                pos = doc.find(text, cursor)
+                if pos < 0:
+                    continue
+                start = pos if start is None else start
+                cursor = pos + len(text)
+            start = cursor if start is None else start
+            end = cursor
+        if slicing:
+            s = doc[start:end]
+        else:
+            # reconstruct the sentence
+            s = "".join([
+                ("" if token.token_class == "symbol" else " ") + token.text
+                for token in sent]).strip()
+        sentences.append((s, start, end))
+        cursor = end
     # done
     return sentences
+
+
+def _output(spans: List[Tuple[str, int, int, int]], return_offsets: bool):
+    """Split (sentence, doc index, start, end) tuples into the outputs"""
+    sentences = [s for s, _, _, _ in spans]
+    if not return_offsets:
+        return sentences
+    offsets = np.array([span[1:] for span in spans], dtype=np.int64)
+    return sentences, offsets.reshape(-1, 3)
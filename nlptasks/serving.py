@@ -0,0 +1,235 @@
+from typing import Callable, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .parallel import _init_worker, _run_chunk
+from .vocab import Vocab
+import asyncio
+import functools
+import importlib
+
+
+# modules that identify the VOCAB from the data, i.e. a fixed VOCAB is
+# required to return the same IDs in all micro-batches
+VOCAB_TASKS = ('lemma', 'deptree')
+
+# queue item that stops the batcher, see Annotator.close
+_STOP = object()
+
+
+class Annotator(object):
+    """Annotate concurrent requests in micro-batches (asyncio)
+
+    Parameters:
+    -----------
+    module : str
+        Task module, e.g. 'sbd', 'token', 'pos', 'ner', 'dephead'
+
+    name : str
+        Identifier of the task function, see `factory(name)`
+
+    model (Default: None)
+        Preloaded instance of the NLP model. By default, the module's
+          `get_model(name)` is called once.
+
+    max_batch_size : int = 32
+        Maximum number of requests per call of the task function
+
+    max_wait : float = 0.005
+        Seconds to wait for more requests after the first request of a
+          micro-batch arrived
+
+    processes : bool = False
+        Run the task function in a worker process (that loads the model)
+          instead of a worker thread of this process
+
+    func : Optional[Callable] = None
+        Task function (Default: `factory(name)` of the module). Requires
+          `processes=False`.
+
+    **kwargs
+        Arguments of the task function, e.g. maxlen. `lemma` and
+          `deptree` require a fixed VOCAB.
+
+    Example:
+    --------
+        import asyncio
+        import nlptasks as nt
+        import nlptasks.serving
+
+        async def main(sequences):
+            async with nt.serving.Annotator('pos', 'flair-de') as annotator:
+                return await asyncio.gather(
+                    *[annotator.submit(tokens) for tokens in sequences])
+
+        loop = asyncio.get_event_loop()
+        results = loop.run_until_complete(main(sequences))
+        idseq, TAGSET = results[0]
+    """
+    def __init__(self,
+                 module: str,
+                 name: str,
+                 model=None,
+                 max_batch_size: int = 32,
+                 max_wait: float = 0.005,
+                 processes: bool = False,
+                 func: Optional[Callable] = None,
+                 **kwargs):
+        if module in VOCAB_TASKS and kwargs.get('VOCAB') is None:
+            raise Exception(f"Module '{module}' requires a fixed VOCAB")
+        if kwargs.get('output') in ('ragged', 'coo'):
+            raise Exception(f"Unsupported output: '{kwargs['output']}'")
+        if kwargs.get('output') == 'numpy' and kwargs.get('maxlen') is None:
+            # the padding width would depend on the micro-batch
+            raise Exception("`output='numpy'` requires a fixed maxlen")
+        self.module = module
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.kwargs = dict(kwargs)
+        if module == 'sbd':
+            # the sentences of each document
+            self.kwargs['return_offsets'] = True
+        self.n_batches = 0
+        self.n_requests = 0
+        self._queue = None
+        self._batcher = None
+        self._batch = []
+        self._closed = False
+
+        # (1) load the model in the worker process, or in this process
+        if processes:
+            if func is not None or model is not None:
+                raise Exception("`processes=True` loads the task function "
+                                "and model in the worker process")
+            self.func = None
+            self.executor = ProcessPoolExecutor(1)
+            # the first task of the only worker loads the model (the
+            # `initializer` argument requires Python>=3.7)
+            self._loaded = self.executor.submit(_init_worker, module, name)
+        else:
+            if func is None:
+                mod = importlib.import_module(f"nlptasks.{module}")
+                func = mod.factory(name)
+                model = model or mod.get_model(name)
+            self.func = func
+            self.model = model
+            self._loaded = None
+            self.executor = ThreadPoolExecutor(1)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def submit(self, example):
+        """Annotate one example, e.g. a token sequence or a document
+
+        Returns:
+        --------
+        The output of the task function for this example, e.g.
+          `(idseq, TAGSET)` for 'pos', or a list of sentences for 'sbd'
+        """
+        if self._closed:
+            raise Exception("Annotator is closed")
+        loop = asyncio.get_event_loop()
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = loop.create_task(self._run_batches())
+        future = loop.create_future()
+        await self._queue.put((example, future))
+        return await future
+
+    async def close(self):
+        """Stop accepting requests, annotate the pending requests, and
+            shut down the worker"""
+        self._closed = True
+        if self._batcher is not None:
+            # the batcher stops at this marker, i.e. after all requests
+            # that were submitted before
+            await self._queue.put(_STOP)
+            try:
+                await self._batcher
+            finally:
+                self._batcher = None
+        self.executor.shutdown(wait=True)
+
+    async def _collect(self) -> bool:
+        """Wait for a request, and collect more into `self._batch` for up
+            to `max_wait`. Returns True if the stop marker was reached."""
+        loop = asyncio.get_event_loop()
+        item = await self._queue.get()
+        deadline = loop.time() + self.max_wait
+        while item is not _STOP:
+            self._batch.append(item)
+            if len(self._batch) >= self.max_batch_size:
+                break
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+        return item is _STOP
+
+    async def _run_batches(self):
+        self._batch = []
+        try:
+            stop = False
+            while not stop:
+                stop = await self._collect()
+                # skip requests whose client is gone
+                batch = [(x, fut) for x, fut in self._batch
+                         if not fut.cancelled()]
+                if batch:
+                    await self._run_batch(batch)
+                self._batch = []
+        except asyncio.CancelledError:
+            # e.g. the event loop shuts down: no request waits forever
+            pending = self._batch + [
+                self._queue.get_nowait() for _ in range(self._queue.qsize())]
+            for item in pending:
+                if item is not _STOP and not item[1].done():
+                    item[1].set_exception(Exception("Annotator is closed"))
+            raise
+
+    async def _run_batch(self, batch: list):
+        loop = asyncio.get_event_loop()
+        examples = [x for x, _ in batch]
+        if self.func is None:
+            call = functools.partial(_run_chunk, examples, self.kwargs)
+        else:
+            call = functools.partial(
+                self.func, examples, model=self.model, **self.kwargs)
+        try:
+            if self._loaded is not None:
+                # e.g. the worker process failed to load the model
+                await asyncio.wrap_future(self._loaded)
+            out = await loop.run_in_executor(self.executor, call)
+            results = _split(self.module, out, len(examples))
+        except Exception as err:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        self.n_batches += 1
+        self.n_requests += len(examples)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _split(module: str, out, n: int) -> list:
+    """Split the output of a task function into one output per example"""
+    if module == 'sbd':
+        sentences, offsets = out
+        results = [[] for _ in range(n)]
+        for sentence, d in zip(sentences, offsets[:, 0]):
+            results[d].append(sentence)
+        return results
+    if not isinstance(out, tuple):
+        return list(out)
+    return [tuple(part if isinstance(part, (Vocab, int)) else part[i]
+                  for part in out) for i in range(n)]
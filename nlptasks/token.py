@@ -1,9 +1,10 @@
 from typing import List
 import warnings
-import de_core_news_lg as spacy_model
-import stanza
+from . import models
+from .batching import spacy_pipe, streamable
 
 
+@streamable()
 def factory(name: str):
     """Factory function to return a processing function for
         tokenization
@@ -13,6 +14,13 @@ def factory(name: str):
     name : str
         Identifier, e.g. 'spacy-de', 'stanza-de'
 
+    stream : bool = False
+        Return a generator function that processes an iterable chunk by
+          chunk, see nlptasks.batching.stream_chunks
+
+    chunksize : int = 1000
+        Number of examples per chunk if `stream=True`
+
     Example:
     --------
         import nlptasks as nt
@@ -36,7 +44,7 @@ def token_factory(name: str):
     return factory(name)
 
 
-def get_model(name: str):
+def get_model(name: str, shared: bool = False):
     """Instantiate the pretrained model outside the SBD function
         so that it only needs to be done once
 
@@ -45,6 +53,11 @@ def get_model(name: str):
     name : str
         Identfier of the model
 
+    shared : bool = False
+        Return the shared spaCy model with all pipes (see
+          nlptasks.models.load) instead of a view that only runs the
+          pipes of this task (see nlptasks.models.spacy_view)
+
     Example:
     --------
         from nlptasks.ner import token
@@ -53,19 +66,21 @@ def get_model(name: str):
         tokens = fn(docs, model=model)
     """
     if name in ("spacy", "spacy-de"):
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser", "tagger"])
-        return model
+        model = models.load("spacy", name="de_core_news_lg")
+        return model if shared else models.spacy_view(model, [])
 
     elif name in ("stanza", "stanza-de"):
-        return stanza.Pipeline(
+        return models.load(
+            "stanza",
             lang='de', processors='tokenize', tokenize_no_ssplit=True)
 
     else:
         raise Exception(f"Unknown Tokenizer function: '{name}'")
 
 
-def spacy_de(data: List[str], model=None) -> List[List[str]]:
+def spacy_de(data: List[str], model=None,
+             batch_size: int = 1000, n_process: int = 1
+             ) -> List[List[str]]:
     """Word Tokenization with spaCy de_core_news_lg for German
 
     Parameters:
@@ -76,6 +91,12 @@ def spacy_de(data: List[str], model=None) -> List[List[str]]:
     model (Default: None)
         Preloaded instance of the NLP model. See nlptasks.token.get_model
 
+    batch_size : int = 1000
+        see nlptasks.batching.spacy_pipe
+
+    n_process : int = 1
+        see nlptasks.batching.spacy_pipe
+
     Returns:
     --------
     List[List[str]]
@@ -88,10 +109,11 @@ def spacy_de(data: List[str], model=None) -> List[List[str]]:
     """
     # load spacy
     if not model:
-        model = spacy_model.load()
-        model.disable_pipes(["ner", "parser", "tagger"])
-    # tokenize
-    tokens = [[t.text for t in model(s)] for s in data]
+        model = get_model("spacy-de")
+    # tokenize (without running any pipes)
+    docs = spacy_pipe(model, data, [], batch_size=batch_size,
+                      n_process=n_process, pretokenized=False)
+    tokens = [[t.text for t in doc] for doc in docs]
     # done
     return tokens
 
@@ -119,8 +141,7 @@ def stanza_de(data: List[str], model=None) -> List[List[str]]:
     """
     # load stanza
     if not model:
-        model = stanza.Pipeline(
-            lang='de', processors='tokenize', tokenize_no_ssplit=True)
+        model = get_model("stanza-de")
     # tokenize
     tokens = []
     for s in data:
@@ -1,5 +1,7 @@
-from typing import List, Optional
+from typing import List, Optional, Iterable, Union
 from collections import Counter
+import functools
+import pickle
 
 
 def identify_vocab_mincount(data: List[str],
@@ -37,6 +39,210 @@ def identify_vocab_mincount(data: List[str],
     return VOCAB
 
 
+class Vocab(list):
+    """Vocabulary with O(1) token-to-ID lookups
+
+    A `Vocab` is a `List[str]` vocabulary as used throughout nlptasks
+      (e.g. `len`, `in`, `VOCAB[i]`, `VOCAB.index(token)`,
+      `VOCAB.append("[PAD]")`, `json.dumps(VOCAB)`), that keeps a
+      token-to-ID dict in sync with the list.
+
+    Parameters:
+    -----------
+    tokens : Iterable[str]
+        The tokens of the vocabulary. The list position is the ID.
+
+    Example:
+    --------
+        from nlptasks.vocab import Vocab
+        VOCAB = Vocab(["abc", "def", "[UNK]"])
+        idseqs = VOCAB.encode([["abc", "xyz"], ["def"]])
+    """
+    def __init__(self, tokens: Optional[Iterable[str]] = None):
+        super().__init__()
+        self._token2id = {}
+        self.extend(tokens or [])
+
+    def _reindex(self):
+        self._token2id = {}
+        for idx, token in enumerate(self):
+            self._token2id.setdefault(token, idx)
+
+    @property
+    def unk_id(self) -> int:
+        """ID of "[UNK]" or, if missing, `len(VOCAB)`"""
+        return self._token2id.get("[UNK]", len(self))
+
+    @property
+    def pad_id(self) -> Optional[int]:
+        """ID of "[PAD]" or None if missing"""
+        return self._token2id.get("[PAD]")
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._token2id
+
+    def __repr__(self) -> str:
+        return f"Vocab({list(self)!r})"
+
+    def __reduce__(self):
+        return (Vocab, (list(self),))
+
+    def append(self, token: str):
+        """Add a token at the end. Like `list.index`, a duplicate token
+            is looked up by its first ID."""
+        self._token2id.setdefault(token, len(self))
+        super().append(token)
+
+    def extend(self, tokens: Iterable[str]):
+        for token in tokens:
+            self.append(token)
+
+    def __iadd__(self, tokens: Iterable[str]):
+        self.extend(tokens)
+        return self
+
+    # (1) other list methods change the IDs, i.e. rebuild the dict
+    def _reindexed(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._reindex()
+        return wrapper
+
+    __setitem__ = _reindexed(list.__setitem__)
+    __delitem__ = _reindexed(list.__delitem__)
+    __imul__ = _reindexed(list.__imul__)
+    insert = _reindexed(list.insert)
+    remove = _reindexed(list.remove)
+    pop = _reindexed(list.pop)
+    clear = _reindexed(list.clear)
+    sort = _reindexed(list.sort)
+    reverse = _reindexed(list.reverse)
+    del _reindexed
+
+    def copy(self):
+        return Vocab(self)
+
+    def index(self, token: str) -> int:
+        """Same as `list.index`, i.e. raises ValueError if not found"""
+        try:
+            return self._token2id[token]
+        except KeyError:
+            raise ValueError(f"'{token}' is not in Vocab")
+
+    def get(self, token: str, default: Optional[int] = None
+            ) -> Optional[int]:
+        return self._token2id.get(token, default)
+
+    def tolist(self) -> List[str]:
+        return list(self)
+
+    def lookup(self, sequence: List[str]) -> List[int]:
+        """Convert one sequence of strings into a sequence of IDs"""
+        unkid = self.unk_id
+        get = self._token2id.get
+        return [get(token, unkid) for token in sequence]
+
+    def encode(self, sequences: List[List[str]]) -> List[List[int]]:
+        """Convert a batch of string sequences into ID sequences
+
+        Example:
+        --------
+            idseqs = VOCAB.encode([["abc", "xyz"], ["def"]])
+        """
+        unkid = self.unk_id
+        get = self._token2id.get
+        return [[get(token, unkid) for token in seq] for seq in sequences]
+
+
+class VocabBuilder(object):
+    """Count tokens over batches, shards or workers and build a VOCAB
+
+    Parameters:
+    -----------
+    min_occurrences : int = 1
+        The required number of occurences in all counted data.
+
+    max_size : Optional[int] = None
+        Keep only the `max_size` most frequent tokens (without "[UNK]")
+
+    sort : bool = True
+        Flag to sort the VOCAB alphabetically. Otherwise, the tokens are
+          in the order of their first occurrence (see identify_vocab_mincount)
+
+    unk : bool = True
+        Flag to append "[UNK]"
+
+    Example:
+    --------
+        import nlptasks as nt
+        import nlptasks.lemma
+        from nlptasks.vocab import VocabBuilder
+        builder = VocabBuilder(min_occurrences=20)
+        for chunk in corpus_chunks:
+            builder.update(chunk)
+        builder.save('counts.pkl')
+        VOCAB = builder.build()
+        idseqs, VOCAB = nt.lemma.spacy_de(chunk, VOCAB=VOCAB)
+    """
+    def __init__(self,
+                 min_occurrences: int = 1,
+                 max_size: Optional[int] = None,
+                 sort: bool = True,
+                 unk: bool = True):
+        self.min_occurrences = min_occurrences
+        self.max_size = max_size
+        self.sort = sort
+        self.unk = unk
+        self.counts = Counter()
+
+    def update(self, sequences: Iterable[Iterable[str]]):
+        """Count the tokens of a batch of sequences"""
+        for seq in sequences:
+            self.counts.update(seq)
+        return self
+
+    def merge(self, *others):
+        """Add the counts of other builders, e.g. of other workers"""
+        for other in others:
+            self.counts.update(other.counts)
+        return self
+
+    def build(self) -> Vocab:
+        """Prune rare tokens, and return the VOCAB"""
+        counts = self.counts
+        if self.unk:
+            counts = Counter(
+                {k: v for k, v in counts.items() if k != "[UNK]"})
+        tokens = [k for k, v in counts.items() if v >= self.min_occurrences]
+        if self.max_size is not None and len(tokens) > self.max_size:
+            # stable, i.e. ties keep the order of the first occurrence
+            tokens = sorted(tokens, key=lambda k: -counts[k])
+            tokens = set(tokens[:self.max_size])
+            tokens = [k for k in counts if k in tokens]
+        if self.sort:
+            tokens = sorted(tokens)
+        if self.unk:
+            tokens.append("[UNK]")
+        return Vocab(tokens)
+
+    def save(self, path: str):
+        """Store the settings and counts in a pickle file"""
+        with open(path, 'wb') as fp:
+            pickle.dump(self.__dict__, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str):
+        """Restore a builder from `VocabBuilder.save`"""
+        with open(path, 'rb') as fp:
+            state = pickle.load(fp)
+        builder = cls()
+        builder.__dict__.update(state)
+        return builder
+
+
 def texttoken_to_index(sequence: List[str], VOCAB: List[str]) -> List[int]:
     """Convert a sequence of strings to a sequence of IDs (int) based
         on a given vocabulary
@@ -46,8 +252,9 @@ def texttoken_to_index(sequence: List[str], VOCAB: List[str]) -> List[int]:
     sequence : List[str]
         List of ID sequences
 
-    VOCAB : List[str]
-        Vocabulary list, alphabetically sorted
+    VOCAB : List[str] or Vocab
+        Vocabulary list, alphabetically sorted. Pass a `Vocab` object
+          to avoid O(|VOCAB|) lookups of `list.index`.
 
     Returns:
     --------
@@ -58,6 +265,8 @@ def texttoken_to_index(sequence: List[str], VOCAB: List[str]) -> List[int]:
     --------
         seqs_of_ids = [texttoken_to_index(seq, VOCAB) for seq in sequences]
     """
+    if isinstance(VOCAB, Vocab):
+        return VOCAB.lookup(sequence)
     # find ID for [UNK], i.e. unknown
     try:
         UNKIDX = VOCAB.index("[UNK]")
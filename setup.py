@@ -31,7 +31,6 @@ setup(name='nlptasks',
       install_requires=[
           'setuptools>=40.0.0',
           'torch>=1.1.0,<2',
-          'tensorflow>=2.4.0,<3',
           'numpy>=1.18.0,<2',
           'scipy>=1.5.0,<2',
           'pandas>=1.1.0,<2',
@@ -45,6 +44,9 @@ setup(name='nlptasks',
           'pad-sequences>=0.5.*',
           'treesimi>=0.1.1'
       ],
+      extras_require={
+          'tf': ['tensorflow>=2.4.0,<3']
+      },
       scripts=[
           'scripts/nlptasks_downloader.py'
       ],
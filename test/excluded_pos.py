@@ -57,3 +57,14 @@ def test_43():   # STTS_IBK
     # convert to targets to IDs
     target_ids = [[TAGSET.index(pos) for pos in seq] for seq in targets]
     assert seqs_pos == target_ids
+
+
+def test_33():  # forked workers
+    seqs_token = [["Neben", "den", "Mitteln", "des", "Theaters", "benutzte",
+                   "Moran", "die", "Toncollage", "."],
+                  ["Die", "Kuh", "ist", "bunt", "."]] * 5
+    fn = pos_factory("someweta-de")
+    seqs_pos, TAGSET = fn(seqs_token)
+    seqs_pos2, TAGSET2 = fn(seqs_token, n_jobs=2)
+    assert seqs_pos2 == seqs_pos
+    assert TAGSET2 == TAGSET
@@ -0,0 +1,158 @@
+import nlptasks as nt
+import nlptasks.batching
+import nlptasks.lemma
+from nlptasks.padding import pad_idseqs
+from nlptasks.vocab import Vocab
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import os
+import pytest
+
+
+@pad_idseqs
+def dummy_lemma(data, VOCAB=None, min_occurrences=20, model=None):
+    """lemmatizer that returns the lowercase tokens"""
+    lemmata = [[t.lower() for t in seq] for seq in data]
+    return nt.lemma._encode(lemmata, VOCAB, min_occurrences)
+
+
+@nt.batching.streamable(
+    vocab={'min_occurrences': 20, 'sort': True, 'unk': True})
+def dummy_factory(name):
+    if name == "dummy":
+        return dummy_lemma
+    raise Exception(f"Unknown lemmatizer: '{name}'")
+
+
+CORPUS = [["Die", "Kuh", "ist", "bunt", "."],
+          ["die", "Wiese", "ist", "grün", "."],
+          ["Kuh", "und", "Wiese", "."]] * 3
+
+
+def test_01():  # chunks
+    chunks = list(nt.batching.stream_chunks(
+        lambda x, k: [len(s) + k for s in x], iter(CORPUS), chunksize=4, k=1))
+    assert [len(c) for c in chunks] == [4, 4, 1]
+    assert sum(chunks, []) == [len(s) + 1 for s in CORPUS]
+
+
+def test_02():  # two-pass VOCAB equals the VOCAB of the whole corpus
+    target, VOCAB1 = dummy_lemma(CORPUS, min_occurrences=3)
+    VOCAB2 = nt.batching.build_vocab(
+        dummy_lemma, iter(CORPUS), chunksize=2, min_occurrences=3)
+    assert VOCAB2 == VOCAB1
+    fn = dummy_factory("dummy", stream=True, chunksize=2)
+    idseqs = []
+    for ids, VOCAB in fn(CORPUS, min_occurrences=3, maxlen=6):
+        assert VOCAB[:-1] == VOCAB1
+        idseqs.extend(ids)
+    assert idseqs == dummy_lemma(CORPUS, min_occurrences=3, maxlen=6)[0]
+
+
+def test_03():  # fixed VOCAB, single pass
+    fn = dummy_factory("dummy", stream=True, chunksize=2)
+    VOCAB = ["die", "kuh", "[UNK]"]
+    out = list(fn(iter(CORPUS), VOCAB=VOCAB))
+    assert len(out) == 5
+    assert out[0][0][0] == [0, 1, 2, 2, 2]
+    with pytest.raises(Exception):
+        list(fn(iter(CORPUS)))
+    assert dummy_factory("dummy") is dummy_lemma
+
+
+def test_04():  # forked workers share the closure, order is preserved
+    offset = {'value': 100}  # e.g. a loaded model
+
+    def add(chunk):
+        return [x + offset['value'] for x in chunk]
+
+    data = list(range(37))
+    assert nt.batching.fork_map(add, data, n_jobs=3) == add(data)
+    assert nt.batching.fork_map(add, data, n_jobs=2, chunksize=5) == add(data)
+    assert nt.batching.fork_map(add, [], n_jobs=4) == []
+
+
+def test_05():  # token budget of padded, length-sorted batches
+    lengths = [3, 150, 4, 3, 5, 1]
+    batches = nt.batching.length_batches(lengths, max_tokens=12)
+    assert batches == [[1], [4, 2], [0, 3, 5]]
+    assert sorted(sum(batches, [])) == list(range(len(lengths)))
+    batches = nt.batching.length_batches(
+        lengths, max_tokens=1000, max_batch_size=4)
+    assert batches == [[1, 4, 2, 0], [3, 5]]
+
+
+def test_06():  # outputs in the order of the data
+    data = [["a"] * n for n in (3, 10, 1, 4, 4, 2)]
+    calls = []
+
+    def fn(batch):
+        calls.append(len(batch))
+        return [len(seq) for seq in batch]
+
+    assert nt.batching.bucketed(fn, data, max_tokens=8) == [
+        3, 10, 1, 4, 4, 2]
+    assert sum(calls) == len(data)
+
+
+class DummyPipeline(object):
+    """Stand-in for a pretokenized stanza Pipeline"""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, sequences):
+        self.calls.append(sum(len(seq) for seq in sequences))
+        return SimpleNamespace(sentences=[
+            SimpleNamespace(words=seq) for seq in sequences])
+
+
+def test_07():  # bounded stanza calls, converted chunk by chunk
+    data = [["a"] * n for n in (3, 10, 1, 4, 4, 2)]
+    model = DummyPipeline()
+
+    def convert(sentences):
+        return [len(s.words) for s in sentences], TAGSET
+
+    TAGSET = Vocab(["A", "B"])
+    lens, vocab = nt.batching.stanza_predict(
+        model, data, max_tokens_per_call=8, convert=convert)
+    assert lens == [3, 10, 1, 4, 4, 2]
+    assert vocab is TAGSET
+    assert model.calls == [3, 10, 5, 6]
+    sents = nt.batching.stanza_predict(
+        model, data, max_tokens=8, max_tokens_per_call=8)
+    assert [len(s.words) for s in sents] == [3, 10, 1, 4, 4, 2]
+    assert nt.batching.stanza_predict(
+        model, [], max_tokens_per_call=8, convert=convert) == ([], TAGSET)
+
+
+class DummyLanguage(object):
+    """spaCy Language object that tokenizes in `pipe` (n_process>1)"""
+    def __init__(self):
+        self.vocab = None
+        self.tokenizer = str.split
+        self.pipe_names = ["tagger", "parser"]
+
+    def pipe(self, texts, batch_size=1000, n_process=1, disable=[]):
+        return [(type(self.tokenizer), disable) for _ in texts]
+
+
+def test_08():  # multiprocessing does not touch the shared model
+    model = DummyLanguage()
+    docs = nt.batching.spacy_pipe(
+        model, [["Die", "Kuh"]], ["tagger"], n_process=2)
+    assert docs == [(nt.batching.PretokenizedTokenizer, ["parser"])]
+    assert model.tokenizer is str.split
+
+
+def test_09():  # no fork in a multithreaded process
+    def pids(chunk):
+        return [os.getpid() for _ in chunk]
+
+    assert set(nt.batching.fork_map(pids, [1] * 8, n_jobs=2)) != {
+        os.getpid()}
+    with ThreadPoolExecutor(1) as executor:
+        out = executor.submit(
+            nt.batching.fork_map, pids, [1] * 8, n_jobs=2).result()
+    assert set(out) == {os.getpid()}
+    assert nt.batching._FORKED == {}
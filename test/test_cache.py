@@ -0,0 +1,97 @@
+import nlptasks as nt
+import nlptasks.cache
+import nlptasks.lemma
+from nlptasks.vocab import Vocab
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+CALLS = []
+
+
+def dummy_pos(data, model=None):
+    """tags the first character of each token"""
+    CALLS.append(len(data))
+    TAGSET = Vocab(["D", "K", "[UNK]"])
+    return TAGSET.encode([[t[0] for t in seq] for seq in data]), TAGSET
+
+
+def dummy_lemma(data, VOCAB=None, min_occurrences=20, model=None):
+    CALLS.append(len(data))
+    lemmata = [[t.lower() for t in seq] for seq in data]
+    return nt.lemma._encode(lemmata, VOCAB, min_occurrences)
+
+
+def test_01():  # only misses are annotated
+    cache = nt.cache.Cache(":memory:")
+    CALLS.clear()
+    data = [["Die", "Kuh"], ["Kuh", "x"]]
+    target = dummy_pos(data)
+    out = cache._run(dummy_pos, 'pos', 'dummy', {}, data, {})
+    assert out == target
+    data2 = data + [["Die", "Die"], ["Kuh", "x"]]
+    out = cache._run(dummy_pos, 'pos', 'dummy', {}, data2, {'maxlen': 3})
+    assert CALLS == [2, 2, 1]
+    assert out[0] == [[3, 0, 1], [3, 1, 2], [3, 0, 0], [3, 1, 2]]
+    assert cache.stats()['hits'] == 3
+    assert cache.stats()['misses'] == 3
+
+
+def test_02():  # VOCAB of all examples, cached or not
+    cache = nt.cache.Cache(":memory:")
+    data = [["Die", "Kuh"], ["die", "Wiese"], ["Kuh", "Die"]]
+    cache._run(dummy_lemma, 'lemma', 'dummy', {}, data[:2], {})
+    out = cache._run(
+        dummy_lemma, 'lemma', 'dummy', {}, data, {'min_occurrences': 2})
+    assert out == dummy_lemma(data, min_occurrences=2)
+
+
+def test_03():  # size-based eviction
+    cache = nt.cache.Cache(":memory:", max_bytes=1000)
+    cache.put_many({str(i): "x" * 100 for i in range(20)})
+    assert cache.nbytes() <= 1000
+    assert cache.get_many(["19"]) == {"19": "x" * 100}
+    assert cache.get_many(["0"]) == {}
+
+
+def test_04():  # wrap a task function without meta information
+    cache = nt.cache.Cache(":memory:")
+    CALLS.clear()
+    fn = cache.wrap('pos', 'dummy', func=dummy_pos)
+    data = [["Die", "Kuh"], ["Kuh", "x"]]
+    assert fn(data) == dummy_pos(data)
+    assert fn(data + [["Die"]], maxlen=2)[0] == [[0, 1], [1, 2], [3, 0]]
+    assert CALLS == [2, 2, 1]
+    # the default identity does not require the backend
+    for module, name in [('token', 'spacy-de'), ('token', 'stanza-de'),
+                         ('pos2', 'stanza-de'), ('ner2', 'flair-multi'),
+                         ('depchild', 'spacy-de')]:
+        assert callable(cache.wrap(module, name))
+
+
+def dummy_sbd(data, model=None, return_offsets=False, batch_size=1000):
+    CALLS.append(len(data))
+    spans = [(s, d) for d, doc in enumerate(data) for s in doc.split(". ")]
+    offsets = np.zeros((len(spans), 3), dtype=np.int64)
+    offsets[:, 0] = [d for _, d in spans]
+    return [s for s, _ in spans], offsets
+
+
+def test_05():  # one call for the SBD misses, execution args are no keys
+    cache = nt.cache.Cache(":memory:")
+    CALLS.clear()
+    fn = cache.wrap('sbd', 'dummy', func=dummy_sbd)
+    docs = ["A. B", "C", "D. E. F"]
+    assert fn(docs[:1], batch_size=2) == ["A", "B"]
+    sents, offsets = fn(docs, return_offsets=True, batch_size=8)
+    assert sents == ["A", "B", "C", "D", "E", "F"]
+    assert offsets[:, 0].tolist() == [0, 0, 1, 2, 2, 2]
+    assert CALLS == [1, 2]
+
+
+def test_06():  # shared with a thread pool
+    cache = nt.cache.Cache(":memory:")
+    fn = cache.wrap('pos', 'dummy', func=dummy_pos)
+    with ThreadPoolExecutor(4) as executor:
+        outs = list(executor.map(fn, [[["Die", "Kuh"]]] * 8))
+    assert outs == [dummy_pos([["Die", "Kuh"]])] * 8
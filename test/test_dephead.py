@@ -50,6 +50,17 @@ def test_03():  # preload model
         assert pair in target
 
 
+def test_04():  # COO output
+    seqs_token = [[
+        "Der", "Helmut", "Kohl", "speist", "Schweinshaxe", "mit", "Kohl", "."]]
+    maskseqs, _ = nt.dephead.factory("spacy-de")(seqs_token)
+    coo, seqlens = nt.dephead.factory("spacy-de")(seqs_token, output='coo')
+    assert seqlens == [8]
+    assert coo.shape == (3, len(maskseqs[0]))
+    assert sorted(zip(coo[1].tolist(), coo[2].tolist())) == sorted(
+        maskseqs[0])
+
+
 def test_11():
     seqs_token = [[
         "Der", "Helmut", "Kohl", "speist", "Schweinshaxe", "mit", "Kohl", "."]]
@@ -1,5 +1,6 @@
 import nlptasks as nt
 import nlptasks.deptree
+import numpy as np
 
 
 def test1():
@@ -13,6 +14,50 @@ def test1():
 def test2():
     sequences = [['Die', 'Kuh', 'ist', 'bunt', '.']]
     masks, VOCAB = nt.deptree.spacy_de(sequences, return_mask=True)
-    assert masks == [[1, 1, 1, 1, 1]]
+    assert masks.toarray().tolist() == [[1, 1, 1, 1, 1]]
     masks, VOCAB = nt.deptree.stanza_de(sequences, return_mask=True)
-    assert masks == [[1, 1, 1, 1, 1]]
+    assert masks.toarray().tolist() == [[1, 1, 1, 1, 1]]
+
+
+def test3():
+    sequences = [['Die', 'Kuh', 'ist', 'bunt', '.']]
+    for engine in ('blake2b-64', 'blake2b-128'):
+        indices, VOCAB = nt.deptree.spacy_de(sequences, hash_engine=engine)
+        assert indices == [[0, 1, 2, 3, 4]]
+        indices2, _ = nt.deptree.spacy_de(
+            sequences, hash_engine=engine, VOCAB=VOCAB)
+        assert indices2 == indices
+
+
+def test4():  # digests are stable and equal shingles collide
+    shingled = [[[[1, 2, 0, 'root']], [[1, 4, 0, 'root'], [2, 3, 1, 'nk']]],
+                [[[1, 2, 0, 'root']]]]
+    for engine in ('sha512', 'blake2b-64', 'blake2b-128'):
+        a = nt.deptree.hash_shingles(shingled, hash_engine=engine)
+        b = nt.deptree.hash_shingles(shingled, hash_engine=engine)
+        assert [list(x) for x in a] == [list(x) for x in b]
+        assert a[0][0] == a[1][0]
+        assert a[0][0] != a[0][1]
+
+
+def test5():  # sparse masks
+    hashed = [['a', 'b', 'c', 'b'], [], ['c', 'd']]
+    masks, VOCAB = nt.deptree._encode(hashed, return_mask=True)
+    assert VOCAB == ['a', 'b', 'c', 'd']
+    assert masks.shape == (3, 4)
+    assert masks.nnz == 5
+    assert masks.toarray().tolist() == [
+        [1, 1, 1, 0], [0, 0, 0, 0], [0, 0, 1, 1]]
+
+
+def test6():  # numpy digests are encoded like python lists
+    hashed = [np.array(x, dtype='<i8') for x in (
+        [7, 3, 7, 9], [], [3, 5, 5], [9, 1])]
+    aslists = [h.tolist() for h in hashed]
+    for m in (1, 2):
+        assert nt.deptree._encode(hashed, min_occurrences=m) == \
+            nt.deptree._encode(aslists, min_occurrences=m)
+    VOCAB = [5, 9, 5, 3]  # duplicates keep the first ID
+    indices, VOCAB2 = nt.deptree._encode(hashed, VOCAB=VOCAB)
+    assert indices == [[3, 1], [], [3, 0, 0], [1]]
+    assert VOCAB2 == VOCAB
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+import pytest
+
+
+MODULES = ["sbd", "token", "lemma", "pos", "pos2", "ner", "ner2",
+           "dephead", "depchild", "deptree", "meta", "models", "pipeline",
+           "batching", "parallel", "cache",
+           "memo", "serving"]
+
+BACKENDS = ["spacy", "de_core_news_lg", "stanza", "flair", "torch",
+            "someweta", "somajo", "nltk", "tensorflow"]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_lazy_backends(module):
+    """Importing a task module must not import any NLP backend"""
+    stmt = (f"import sys, nlptasks.{module}; "
+            f"print(','.join(m for m in {BACKENDS} if m in sys.modules))")
+    out = subprocess.run(
+        [sys.executable, "-c", stmt], check=True,
+        stdout=subprocess.PIPE, universal_newlines=True).stdout
+    assert out.strip() == ""
@@ -107,3 +107,14 @@ def test13():
 
     assert len(VOCAB_LEMMA) == 7
     assert len(seqs_token) == len(seqs_lemma)
+
+
+def test14():  # bounded stanza calls, one VOCAB
+    seqs_token = [["Die", "Kuh", "ist", "bunt", "."],
+                  ["Die", "Kühe", "sind", "bunt", "."]] * 3
+    model = nt.lemma.get_model("stanza-de")
+    fn = nt.lemma.factory("stanza-de")
+    target = fn(seqs_token, min_occurrences=2, model=model)
+    result = fn(seqs_token, min_occurrences=2, model=model,
+                max_tokens_per_call=7)
+    assert result == target
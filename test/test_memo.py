@@ -0,0 +1,43 @@
+import nlptasks as nt
+import nlptasks.memo
+
+
+class Model(object):
+    pass
+
+
+def test_01():  # deduplicate within a call
+    calls = []
+
+    def fn(seqs):
+        calls.append(len(seqs))
+        return [[t.upper() for t in seq] for seq in seqs]
+
+    data = [["a", "b"], ["c"], ["a", "b"], ["a", "b"]]
+    assert nt.memo.map_unique(fn, data) == fn(data)
+    assert calls == [2, 4]
+
+
+def test_02():  # LRU across calls
+    calls = []
+
+    def fn(docs):
+        calls.append(len(docs))
+        return [doc.split() for doc in docs]
+
+    model = Model()
+    data = ["a b", "c", "a b"]
+    out = nt.memo.memoized(fn, data, model, "dummy", 2, key=str)
+    assert out == [["a", "b"], ["c"], ["a", "b"]]
+    out = nt.memo.memoized(fn, ["c", "d e"], model, "dummy", 2, key=str)
+    assert out == [["c"], ["d", "e"]]
+    assert calls == [2, 1]
+    lru = nt.memo.get_lru(model, "dummy", 2)
+    assert lru.hits == 1 and len(lru) == 2
+    assert "a b" not in lru
+    # another model instance does not share the results
+    nt.memo.memoized(fn, ["c"], Model(), "dummy", 2, key=str)
+    assert calls == [2, 1, 1]
+    # disabled
+    nt.memo.memoized(fn, ["c", "c"], model, "dummy", 0, key=str)
+    assert calls == [2, 1, 1, 2]
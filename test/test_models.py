@@ -0,0 +1,50 @@
+import nlptasks as nt
+import nlptasks.models
+from types import SimpleNamespace
+import pytest
+
+
+class Dummy(object):
+    def __init__(self, size: int = 0):
+        self.payload = b"x" * size
+
+
+def test_01():
+    nt.models.register("dummy", Dummy)
+    m1 = nt.models.load("dummy", size=1)
+    m2 = nt.models.load("dummy", size=1)
+    m3 = nt.models.load("dummy", size=2)
+    assert m1 is m2
+    assert m1 is not m3
+    specs = [info['spec'] for info in nt.models.loaded()]
+    assert specs == [{'size': 1}, {'size': 2}]
+    nt.models.clear()
+    assert nt.models.loaded() == []
+
+
+def test_02():
+    if nt.models._rss() is None:
+        pytest.skip("RSS is not available")
+    nt.models.register("dummy", Dummy)
+    nt.models.set_memory_budget(150 * 2**20)
+    try:
+        nt.models.load("dummy", size=100 * 2**20)
+        nt.models.load("dummy", size=100 * 2**20 + 1)
+        # the least recently used model has been evicted
+        specs = [info['spec'] for info in nt.models.loaded()]
+        assert specs == [{'size': 100 * 2**20 + 1}]
+    finally:
+        nt.models.set_memory_budget(None)
+        nt.models.clear()
+
+
+def test_03():
+    with pytest.raises(Exception):
+        nt.models.load("unknown-backend")
+
+
+def test_04():  # task view of a shared spaCy model
+    model = SimpleNamespace(pipeline=[("tagger", 1), ("parser", 2)])
+    view = nt.models.spacy_view(model, ["parser"])
+    assert view.pipeline == [("parser", 2)]
+    assert model.pipeline == [("tagger", 1), ("parser", 2)]
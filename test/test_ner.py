@@ -97,6 +97,20 @@ def test_13():
     assert seqs_ner == target_ids
 
 
+def test_14():  # mini-batches of different sentence lengths
+    seqs_token = [
+        ["Der", "Helmut", "Kohl", "speist", "Schweinshaxe", "mit",
+         "Blumenkohl", "in", "Berlin", "."],
+        ["Berlin", "ist", "schön", "."],
+        ["Helmut", "Kohl", "."]]
+    fn = nt.ner.factory("flair-multi")
+    target = [fn([seq])[0][0] for seq in seqs_token]
+    seqs_ner, _ = fn(seqs_token, mini_batch_size=2)
+    assert seqs_ner == target
+    seqs_ner, _ = fn(seqs_token, max_tokens=12)
+    assert seqs_ner == target
+
+
 def test_21():
     """ OhOh this fails
     seqs_token = [[
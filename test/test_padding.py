@@ -0,0 +1,71 @@
+from nlptasks.padding import (
+    pad_sequences, idseqs_to_ragged, pad_idseqs, pad_maskseqs,
+    maskseqs_to_coo)
+from nlptasks.vocab import Vocab
+import numpy as np
+
+
+def test_01():
+    seqs = [[1, 2, 3], [4], []]
+    arr = pad_sequences(seqs, maxlen=2, value=9)
+    assert arr.tolist() == [[2, 3], [9, 4], [9, 9]]
+    arr = pad_sequences(seqs, maxlen=2, padding='post', truncating='post')
+    assert arr.tolist() == [[1, 2], [4, 0], [0, 0]]
+    arr = pad_sequences(seqs, maxlen=2, padding='pre', truncating='post')
+    assert arr.tolist() == [[1, 2], [0, 4], [0, 0]]
+    arr = pad_sequences(seqs, maxlen=2, padding='post', truncating='pre')
+    assert arr.tolist() == [[2, 3], [4, 0], [0, 0]]
+
+
+def test_02():
+    seqs = [[1, 2, 3], [4]]
+    arr = pad_sequences(seqs, dtype=np.int16)
+    assert arr.dtype == np.int16
+    assert arr.tolist() == [[1, 2, 3], [0, 0, 4]]
+    assert pad_sequences([], maxlen=3).shape == (0, 3)
+
+
+def test_03():
+    values, offsets = idseqs_to_ragged([[1, 2, 3], [], [4]])
+    assert values.tolist() == [1, 2, 3, 4]
+    assert offsets.tolist() == [0, 3, 3, 4]
+
+
+def test_04():
+    @pad_idseqs
+    def dummy(data):
+        VOCAB = Vocab(["a", "b", "[UNK]"])
+        return VOCAB.encode(data), VOCAB
+
+    idseqs, VOCAB = dummy([["a", "b", "c"], ["b"]], maxlen=2)
+    assert idseqs == [[1, 2], [3, 1]]
+    assert VOCAB.pad_id == 3
+    arr, _ = dummy([["a", "b", "c"], ["b"]], output='numpy')
+    assert arr.tolist() == [[0, 1, 2], [3, 3, 1]]
+    (values, offsets), _ = dummy(
+        [["a", "b", "c"], ["b"]], maxlen=2, output='ragged')
+    assert values.tolist() == [1, 2, 1]
+    assert offsets.tolist() == [0, 2, 3]
+    (values, offsets), _ = dummy(
+        [["a", "b", "c"], ["b"]], maxlen=0, output='ragged')
+    assert values.tolist() == []
+    assert offsets.tolist() == [0, 0, 0]
+    (values, offsets), _ = dummy(
+        [["a", "b", "c"], ["b"]], maxlen=4, output='ragged')
+    assert values.tolist() == [0, 1, 2, 1]
+
+
+def test_05():
+    coo = maskseqs_to_coo([[(1, 0), (3, 1)], [], [(2, 0)]])
+    assert coo.dtype == np.int32
+    assert coo.tolist() == [[0, 0, 2], [1, 3, 2], [0, 1, 0]]
+    assert maskseqs_to_coo([]).shape == (3, 0)
+
+    @pad_maskseqs
+    def dummy(data):
+        return [[(0, i) for i in range(len(s))] for s in data], \
+            [len(s) for s in data], Vocab(["a"])
+
+    coo, seqlens, _ = dummy([["x", "y"], ["z"]], output='coo')
+    assert coo.tolist() == [[0, 0, 1], [0, 0, 0], [0, 1, 0]]
+    assert seqlens == [2, 1]
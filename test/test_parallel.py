@@ -0,0 +1,87 @@
+import nlptasks as nt
+import nlptasks.parallel
+import nlptasks.batching
+import nlptasks.lemma
+import nlptasks.pos
+from nlptasks.vocab import Vocab
+import numpy as np
+import pytest
+import threading
+
+
+def test_01():  # merge outputs of chunks
+    TAGSET = Vocab(["A", "B"])
+    outputs = [([[0, 1]], TAGSET), ([[1], [1, 0]], TAGSET)]
+    idseqs, VOCAB = nt.parallel._concat(outputs)
+    assert idseqs == [[0, 1], [1], [1, 0]]
+    assert VOCAB is TAGSET
+    assert nt.parallel._concat([["a", "b"], ["c"]]) == ["a", "b", "c"]
+
+
+def test_11():
+    seqs_token = [["Die", "Kuh", "ist", "bunt", "."],
+                  ["Die", "Bäuerin", "mäht", "die", "Wiese", "."]] * 3
+    target = nt.pos.factory("spacy-de")(seqs_token, maxlen=5)
+    result = nt.parallel.run(
+        seqs_token, 'pos', 'spacy-de', n_jobs=2, chunksize=2, maxlen=5)
+    assert result == target
+
+
+def test_12():  # one VOCAB for all chunks
+    seqs_token = [["Die", "Kuh", "ist", "bunt", "."],
+                  ["Die", "Bäuerin", "mäht", "die", "Wiese", "."]] * 3
+    target = nt.lemma.factory("spacy-de")(seqs_token, min_occurrences=2)
+    result = nt.parallel.run(
+        seqs_token, 'lemma', 'spacy-de', n_jobs=2, chunksize=2,
+        min_occurrences=2)
+    assert result == target
+
+
+def test_02():
+    usage = nt.parallel.memory_usage()
+    if usage is not None:  # Linux only
+        assert usage['pss'] > 0
+        assert usage['rss'] >= usage['pss']
+        assert usage['rss'] == usage['shared'] + usage['private']
+
+
+def test_13():  # fork after load, memory report
+    seqs_token = [["Die", "Kuh", "ist", "bunt", "."],
+                  ["Die", "Bäuerin", "mäht", "die", "Wiese", "."]] * 3
+    target = nt.pos.factory("spacy-de")(seqs_token, maxlen=5)
+    report = {}
+    result = nt.parallel.run(
+        seqs_token, 'pos', 'spacy-de', n_jobs=2, chunksize=2, maxlen=5,
+        fork_after_load=True, memory_report=report)
+    assert result == target
+    assert report['parent']['pss'] > 0
+    assert 1 <= len(report['workers']) <= 2
+
+
+def test_03():  # no fork while other threads are running
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        assert not nt.batching._fork_safe()
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_14():  # fork after load falls back to spawned workers
+    seqs_token = [["Die", "Kuh", "ist", "bunt", "."],
+                  ["Die", "Bäuerin", "mäht", "die", "Wiese", "."]] * 3
+    target = nt.pos.factory("spacy-de")(seqs_token, maxlen=5)
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        with pytest.warns(RuntimeWarning):
+            result = nt.parallel.run(
+                seqs_token, 'pos', 'spacy-de', n_jobs=2, chunksize=2,
+                maxlen=5, fork_after_load=True)
+    finally:
+        stop.set()
+        thread.join()
+    assert result == target
@@ -0,0 +1,33 @@
+import nlptasks as nt
+import nlptasks.pipeline
+import nlptasks.pos
+import nlptasks.lemma
+import nlptasks.dephead
+
+
+def test_01():
+    seqs_token = [[
+        "Der", "Helmut", "Kohl", "speist", "Schweinshaxe", "mit", "Kohl", "."]]
+    results = nt.pipeline.run(
+        seqs_token, ['pos', 'lemma', 'dephead'], 'spacy-de',
+        options={'lemma': {'min_occurrences': 1}})
+
+    assert results['pos'] == nt.pos.spacy_de(seqs_token)
+    assert results['lemma'] == nt.lemma.spacy_de(
+        seqs_token, min_occurrences=1)
+    assert results['dephead'] == nt.dephead.spacy_de(seqs_token)
+
+
+def test_02():  # decorator arguments
+    seqs_token = [[
+        "Der", "Helmut", "Kohl", "speist", "Schweinshaxe", "mit", "Kohl", "."]]
+    results = nt.pipeline.run(
+        seqs_token, ['pos', 'dephead'], 'spacy-de',
+        options={'pos': {'maxlen': 6, 'padding': 'post'},
+                 'dephead': {'maxlen': 6}})
+
+    idseqs, _ = results['pos']
+    assert len(idseqs[0]) == 6
+    maskseqs, _ = results['dephead']
+    for pair in maskseqs[0]:
+        assert pair[1] < 6
@@ -42,6 +42,33 @@ def test_03():
     assert seqs_pos == target_ids
 
 
+def test_04():  # check output formats
+    targets = [[
+        "APPR", "ART", "NN", "ART", "NN", "VVFIN", "NE", "ART", "NN", "$."]]
+    seqs_token = [["Neben", "den", "Mitteln", "des", "Theaters", "benutzte",
+                   "Moran", "die", "Toncollage", "."]]
+    fn = nt.pos.factory("spacy")
+    arr, TAGSET = fn(seqs_token, maxlen=11, output="numpy")
+    target_ids = [[TAGSET.index(pos) for pos in seq] for seq in targets]
+    assert arr.shape == (1, 11)
+    assert arr[0, 0] == TAGSET.index("[PAD]")
+    assert arr[0, 1:].tolist() == target_ids[0]
+    (values, offsets), TAGSET = fn(seqs_token, output="ragged")
+    assert offsets.tolist() == [0, 10]
+    assert values.tolist() == target_ids[0]
+
+
+def test_05():  # batched inference
+    seqs_token = [["Neben", "den", "Mitteln", "des", "Theaters", "benutzte",
+                   "Moran", "die", "Toncollage", "."]] * 5
+    fn = nt.pos.factory("spacy")
+    target, _ = fn(seqs_token)
+    seqs_pos, _ = fn(seqs_token, batch_size=2)
+    assert seqs_pos == target
+    seqs_pos, _ = fn(seqs_token, batch_size=2, n_process=2)
+    assert seqs_pos == target
+
+
 def test_11():
     targets = [[
         "APPR", "ART", "NN", "ART", "NN", "VVFIN", "NE", "ART", "NN", "$."]]
@@ -82,6 +109,28 @@ def test_13():
     assert seqs_pos == target_ids
 
 
+def test_14():  # length-bucketed batches with a token budget
+    seqs_token = [["Die", "Kuh", "ist", "bunt", "."],
+                  ["Neben", "den", "Mitteln", "des", "Theaters", "benutzte",
+                   "Moran", "die", "Toncollage", "."],
+                  ["Ja", "."]] * 3
+    model = nt.pos.get_model("stanza-de")
+    target = nt.pos.stanza_de(seqs_token, model=model)
+    result = nt.pos.stanza_de(seqs_token, model=model, max_tokens=20)
+    assert result == target
+
+
+def test_15():  # bounded stanza calls
+    seqs_token = [["Die", "Kuh", "ist", "bunt", "."],
+                  ["Neben", "den", "Mitteln", "des", "Theaters", "benutzte",
+                   "Moran", "die", "Toncollage", "."]] * 3
+    model = nt.pos.get_model("stanza-de")
+    target = nt.pos.stanza_de(seqs_token, model=model)
+    result = nt.pos.stanza_de(seqs_token, model=model,
+                              max_tokens_per_call=12)
+    assert result == target
+
+
 def test_21():
     targets = [[
         "APPR", "ART", "NN", "ART", "NN", "VVFIN", "NE", "ART", "NN", "$."]]
@@ -57,3 +57,15 @@ def test_13():
     assert maskseqs == targets
     assert seqlen == [10]
     assert SCHEME == nt.pos2.UPOS_TAGSET + nt.pos2.UD2_FEATS
+
+
+def test_21():  # multiple feature values and unknown features
+    from types import SimpleNamespace as NS
+    sent = NS(words=[
+        NS(upos="DET", feats="Gender=Fem,Neut|Foo=Bar"),
+        NS(upos="XYZ", feats=None)])
+    maskseqs, seqlen, SCHEME = nt.pos2._from_stanza([sent])
+    idx = nt.pos2.SCHEME_INDEX
+    assert maskseqs == [[(idx["DET"], 0), (idx["Gender=Fem"], 0),
+                         (idx["Gender=Neut"], 0)]]
+    assert seqlen == [2]
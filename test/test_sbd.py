@@ -1,5 +1,6 @@
 import nlptasks as nt
 import nlptasks.sbd
+from types import SimpleNamespace
 
 
 def test_01():
@@ -28,6 +29,15 @@ def test_03():
     assert sentences == target
 
 
+def test_04():  # offsets
+    documents = ["Die Kuh ist bunt. Die Bäuerin mäht die Wiese.",
+                 "Heute  regnet es."]
+    sentences, offsets = nt.sbd.spacy_de(documents, return_offsets=True)
+    assert offsets.tolist() == [[0, 0, 17], [0, 18, 45], [1, 0, 17]]
+    for s, (d, start, end) in zip(sentences, offsets):
+        assert documents[d][start:end] == s
+
+
 def test_11():
     target = ["Die Kuh ist bunt.", "Die Bäuerin mäht die Wiese."]
     documents = ["Die Kuh ist bunt. Die Bäuerin mäht die Wiese."]
@@ -80,6 +90,18 @@ def test_23():
     assert sentences == target
 
 
+def test_24():  # preloaded tokenizer and offsets
+    target = ["Die Kuh ist bunt.", "Die Bäuerin mäht die Wiese."]
+    documents = ["Die Kuh ist bunt. Die Bäuerin mäht die Wiese."]
+    identifier = "nltk-punkt-de"
+    model = nt.sbd.get_model(identifier)
+    assert model is nt.sbd.get_model(identifier)
+    fn = nt.sbd.factory(identifier)
+    sentences, offsets = fn(documents, model=model, return_offsets=True)
+    assert sentences == target
+    assert offsets.tolist() == [[0, 0, 17], [0, 18, 45]]
+
+
 def test_31():
     target = ["Die Kuh ist bunt.", "Die Bäuerin mäht die Wiese."]
     documents = ["Die Kuh ist bunt. Die Bäuerin mäht die Wiese."]
@@ -106,6 +128,49 @@ def test_33():
     assert sentences == target
 
 
+def test_34():  # offsets
+    documents = ["Die Kuh ist bunt. Die Bäuerin mäht die Wiese.",
+                 "Heute regnet es."]
+    sentences, offsets = nt.sbd.somajo_de(documents, return_offsets=True)
+    assert offsets.tolist() == [[0, 0, 17], [0, 18, 45], [1, 0, 16]]
+
+
+def test_35():  # slice sentences with original whitespace
+    documents = ["Die Kuh ist  bunt. Die Bäuerin mäht die Wiese."]
+    target = ["Die Kuh ist  bunt.", "Die Bäuerin mäht die Wiese."]
+    sentences = nt.sbd.somajo_de(documents, slicing=True)
+    assert sentences == target
+
+
+def test_36():  # the last token occurs earlier in the sentence
+    documents = ["Der Preis ist 3.5 Euro. Ok."]
+    sentences, offsets = nt.sbd.somajo_de(
+        documents, return_offsets=True, slicing=True)
+    assert sentences == ["Der Preis ist 3.5 Euro.", "Ok."]
+    assert offsets.tolist() == [[0, 0, 23], [0, 24, 27]]
+
+
+class DummySoMaJo(object):
+    """SoMaJo without character offsets that returns fixed sentences"""
+    def __init__(self, sentences):
+        self.sentences = sentences
+
+    def tokenize_text(self, docs):
+        return [[SimpleNamespace(text=t, original_spelling=None,
+                                 token_class="word") for t in sent]
+                for sent in self.sentences]
+
+
+def test_37():  # cursor over every token without character offsets
+    documents = ["Der Preis ist 3.5 Euro. Ok."]
+    model = DummySoMaJo(
+        [["Der", "Preis", "ist", "3.5", "Euro", "."], ["Ok", "."]])
+    sentences, offsets = nt.sbd.somajo_de(
+        documents, model=model, return_offsets=True, slicing=True)
+    assert sentences == ["Der Preis ist 3.5 Euro.", "Ok."]
+    assert offsets.tolist() == [[0, 0, 23], [0, 24, 27]]
+
+
 def test_41():
     target = ["Die Kuh ist bunt.", "Die Bäuerin mäht die Wiese."]
     documents = ["Die Kuh ist bunt. Die Bäuerin mäht die Wiese."]
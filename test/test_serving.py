@@ -0,0 +1,112 @@
+import nlptasks as nt
+import nlptasks.serving
+from nlptasks.vocab import Vocab
+import asyncio
+import time
+import numpy as np
+import pytest
+
+
+BATCHES = []
+
+
+def dummy_pos(data, model=None, maxlen=None):
+    """tags the first character of each token"""
+    BATCHES.append(len(data))
+    TAGSET = Vocab(["D", "K", "[UNK]"])
+    idseqs = TAGSET.encode([[t[0] for t in seq] for seq in data])
+    if maxlen:
+        idseqs = [seq[:maxlen] for seq in idseqs]
+    return idseqs, TAGSET
+
+
+def dummy_sbd(data, model=None, return_offsets=False):
+    sents = [s for doc in data for s in doc.split(". ")]
+    docidx = [d for d, doc in enumerate(data) for _ in doc.split(". ")]
+    offsets = np.zeros((len(sents), 3), dtype=np.int64)
+    offsets[:, 0] = docidx
+    return sents, offsets
+
+
+def run(coro):
+    """asyncio.run for Python 3.6"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def gather(annotator, data):
+    async with annotator:
+        return await asyncio.gather(*[annotator.submit(x) for x in data])
+
+
+def test_01():  # concurrent requests are annotated in micro-batches
+    BATCHES.clear()
+    data = [["Die", "Kuh"], ["Kuh"], ["x", "Die", "Kuh"]] * 10
+    annotator = nt.serving.Annotator(
+        'pos', 'dummy', func=dummy_pos, max_batch_size=8, maxlen=2)
+    results = run(gather(annotator, data))
+    idseqs, TAGSET = dummy_pos(data, maxlen=2)
+    assert results == [(seq, TAGSET) for seq in idseqs]
+    assert BATCHES[:-1] == [8, 8, 8, 6]
+    assert annotator.n_batches == 4
+    assert annotator.n_requests == 30
+
+
+def test_02():  # sentences of each document
+    docs = ["Die Kuh. Die Wiese", "Ja", "A. B. C"]
+    annotator = nt.serving.Annotator('sbd', 'dummy', func=dummy_sbd)
+    results = run(gather(annotator, docs))
+    assert results == [["Die Kuh", "Die Wiese"], ["Ja"], ["A", "B", "C"]]
+
+
+def test_03():  # errors are raised for each request of the batch
+    def failing(data, model=None):
+        raise ValueError("boom")
+
+    annotator = nt.serving.Annotator('pos', 'dummy', func=failing)
+    with pytest.raises(ValueError):
+        run(gather(annotator, [["a"], ["b"]]))
+    with pytest.raises(Exception):
+        nt.serving.Annotator('lemma', 'dummy', func=dummy_pos)
+    with pytest.raises(Exception):  # padding width of the micro-batch
+        nt.serving.Annotator('pos', 'dummy', func=dummy_pos, output='numpy')
+
+
+def test_04():  # close while a batch is running
+    def slow_pos(data, model=None):
+        time.sleep(0.2)
+        return dummy_pos(data)
+
+    async def main():
+        annotator = nt.serving.Annotator(
+            'pos', 'dummy', func=slow_pos, max_batch_size=2, max_wait=0)
+        tasks = [asyncio.ensure_future(annotator.submit(["Die"]))
+                 for _ in range(5)]
+        await asyncio.sleep(0.05)  # the first batch is running
+        await asyncio.wait_for(annotator.close(), 5)
+        with pytest.raises(Exception):
+            await annotator.submit(["Kuh"])
+        return await asyncio.wait_for(asyncio.gather(*tasks), 5)
+
+    results = run(main())
+    assert [idseq for idseq, _ in results] == [[0]] * 5
+
+
+def test_05():  # cancelled batcher fails the requests of its batch
+    def slow_pos(data, model=None):
+        time.sleep(0.2)
+        return dummy_pos(data)
+
+    async def main():
+        annotator = nt.serving.Annotator('pos', 'dummy', func=slow_pos)
+        task = asyncio.ensure_future(annotator.submit(["Die"]))
+        await asyncio.sleep(0.05)
+        annotator._batcher.cancel()
+        with pytest.raises(Exception):
+            await asyncio.wait_for(task, 5)
+        annotator.executor.shutdown(wait=True)
+
+    run(main())
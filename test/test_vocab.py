@@ -1,5 +1,8 @@
+import json
+import pickle
+import pytest
 from nlptasks.vocab import (
-    identify_vocab_mincount, texttoken_to_index)
+    identify_vocab_mincount, texttoken_to_index, Vocab, VocabBuilder)
 
 
 def test1():
@@ -24,3 +27,78 @@ def test3():
     VOCAB = ["abc", "def", "[UNK]"]
     indicies = texttoken_to_index(sequence, VOCAB)
     assert indicies == [0, 0, 0, 1, 1, 2]
+
+
+def test4():
+    VOCAB = Vocab(["abc", "def", "[UNK]"])
+    assert VOCAB == ["abc", "def", "[UNK]"]
+    assert len(VOCAB) == 3
+    assert VOCAB[1] == "def"
+    assert VOCAB.index("def") == 1
+    assert VOCAB.unk_id == 2
+    assert VOCAB.pad_id is None
+    assert "abc" in VOCAB
+    assert "ghi" not in VOCAB
+
+
+def test5():
+    sequences = [["abc", "abc", "ghi"], ["def"]]
+    VOCAB = Vocab(["abc", "def"])
+    assert VOCAB.encode(sequences) == [[0, 0, 2], [1]]
+    assert texttoken_to_index(sequences[0], VOCAB) == [0, 0, 2]
+    VOCAB.append("[PAD]")
+    assert VOCAB.pad_id == 2
+    assert len(VOCAB) == 3
+
+
+def test6():
+    builder = VocabBuilder(min_occurrences=2)
+    builder.update([["def", "abc"], ["abc", "[UNK]"]])
+    builder.update([["ghi", "def"]])
+    assert builder.build() == ["abc", "def", "[UNK]"]
+    other = VocabBuilder().update([["ghi"]])
+    builder.merge(other)
+    assert builder.build() == ["abc", "def", "ghi", "[UNK]"]
+
+
+def test7():  # top-k, no sorting/unk (e.g. deptree)
+    builder = VocabBuilder(max_size=2, sort=False, unk=False)
+    builder.update([["c", "b", "a", "b", "a", "d"]])
+    assert builder.build() == ["b", "a"]
+
+
+def test8(tmp_path):
+    builder = VocabBuilder(min_occurrences=2).update([["a", "a", "b"]])
+    builder.save(str(tmp_path / "counts.pkl"))
+    restored = VocabBuilder.load(str(tmp_path / "counts.pkl"))
+    assert restored.min_occurrences == 2
+    assert restored.counts == builder.counts
+    assert restored.build() == builder.build()
+
+
+def test9():  # list compatible
+    VOCAB = Vocab(["abc", "def"])
+    assert isinstance(VOCAB, list)
+    assert json.loads(json.dumps(VOCAB)) == ["abc", "def"]
+    assert VOCAB + ["[UNK]"] == ["abc", "def", "[UNK]"]
+    assert pickle.loads(pickle.dumps(VOCAB)).index("def") == 1
+    VOCAB += ["ghi"]
+    assert VOCAB == ["abc", "def", "ghi"]
+    VOCAB.insert(0, "[PAD]")
+    assert VOCAB.index("abc") == 1 and VOCAB.pad_id == 0
+    del VOCAB[0]
+    assert VOCAB.index("abc") == 0 and VOCAB.pad_id is None
+    with pytest.raises(TypeError):
+        hash(VOCAB)
+
+
+def test10():  # duplicates keep the list positions
+    tokens = ["a", "a", "b", "[UNK]"]
+    VOCAB = Vocab(tokens)
+    assert VOCAB == tokens
+    assert VOCAB.encode([["b", "z", "a"]]) == [[2, 3, 0]]
+    assert VOCAB.lookup(["b", "z"]) == texttoken_to_index(["b", "z"], tokens)
+    VOCAB.append("b")
+    VOCAB += ["c"]
+    assert VOCAB == tokens + ["b", "c"]
+    assert VOCAB.index("b") == 2 and VOCAB.index("c") == 5